@@ -0,0 +1,645 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from main import (
+    MODO_BITSET,
+    MODO_PARALELO,
+    SIMBOLO_EPSILON,
+    AutomatoFinitoDeterministico,
+    AutomatoFinitoNaoDeterministico,
+    Estatisticas,
+    FuncaoTransicaoDFA,
+    FuncaoTransicaoNFA,
+    SimuladorAFN,
+    analisar_expressao_regular,
+    carregar_automato,
+    construir_afn_glushkov,
+    equivalentes,
+    processar_automato_completo,
+)
+
+VERSAO_RESULTADOS = 1
+LIMITE_REGRESSAO_PADRAO = 1.25
+
+
+def afn_explosao(n, simbolos="ab"):
+    # (a|b)*a(a|b)^n: o AFD mínimo tem 2^(n+1) estados. Os símbolos além de 'a'
+    # se comportam todos como 'b' (uma única classe de símbolos).
+    estados = [f"q{i}" for i in range(n + 2)]
+    transicoes = FuncaoTransicaoNFA()
+    for simbolo in simbolos:
+        transicoes.adicionar("q0", simbolo, "q0")
+    transicoes.adicionar("q0", "a", "q1")
+    for i in range(1, n + 1):
+        for simbolo in simbolos:
+            transicoes.adicionar(f"q{i}", simbolo, f"q{i + 1}")
+    return AutomatoFinitoNaoDeterministico(estados, set(simbolos), transicoes, "q0", {f"q{n + 1}"})
+
+
+def afn_aleatorio(n, simbolos="ab", densidade=1.5, probabilidade_epsilon=0.0, semente=0):
+    # Cada par (estado, símbolo) recebe em média `densidade` destinos; cada estado
+    # ganha uma transição ε com probabilidade `probabilidade_epsilon`. Os dois
+    # destinos de q0 no primeiro símbolo garantem que carregar_automato o leia como
+    # AFN mesmo com densidade baixa.
+    gerador = random.Random(semente)
+    estados = [f"q{i}" for i in range(n)]
+    transicoes = FuncaoTransicaoNFA()
+    transicoes.adicionar("q0", simbolos[0], estados[1])
+    transicoes.adicionar("q0", simbolos[0], estados[-1])
+    for origem in estados:
+        for simbolo in simbolos:
+            for _ in range(int(densidade) + (gerador.random() < densidade % 1)):
+                transicoes.adicionar(origem, simbolo, gerador.choice(estados))
+        if gerador.random() < probabilidade_epsilon:
+            transicoes.adicionar(origem, SIMBOLO_EPSILON, gerador.choice(estados))
+    finais = {estado for estado in estados if gerador.random() < 0.1} or {estados[-1]}
+    return AutomatoFinitoNaoDeterministico(estados, set(simbolos), transicoes, "q0", finais)
+
+
+def afne_cadeia_epsilon(n, ciclo=False):
+    # q0 -ε-> q1 -ε-> ... -ε-> q(n-1), com 'a' voltando a q0 e 'b' laço em cada
+    # estado; com ciclo=True, q(n-1) -ε-> q0 fecha um único ciclo ε com todos.
+    estados = [f"q{i}" for i in range(n)]
+    transicoes = FuncaoTransicaoNFA()
+    for i, origem in enumerate(estados):
+        if i + 1 < n:
+            transicoes.adicionar(origem, SIMBOLO_EPSILON, estados[i + 1])
+        transicoes.adicionar(origem, "a", "q0")
+        transicoes.adicionar(origem, "b", origem)
+    if ciclo:
+        transicoes.adicionar(estados[-1], SIMBOLO_EPSILON, "q0")
+    return AutomatoFinitoNaoDeterministico(estados, {"a", "b"}, transicoes, "q0", {estados[-1]})
+
+
+def afne_thompson(expressao, alfabeto=None):
+    # Construção de Thompson sobre a mesma árvore de construir_afn_glushkov: a rota
+    # com ε que os scripts de expansão de expressões costumam gerar.
+    arvore, universo = analisar_expressao_regular(expressao, alfabeto)
+    transicoes = FuncaoTransicaoNFA()
+    estados = []
+
+    def novo_estado():
+        estados.append(f"t{len(estados)}")
+        return estados[-1]
+
+    def ligar(origem, destino):
+        transicoes.adicionar(origem, SIMBOLO_EPSILON, destino)
+
+    def construir(no):
+        tipo = no[0]
+        inicio, fim = novo_estado(), novo_estado()
+        if tipo == "simbolos":
+            _, simbolos, negado = no
+            for simbolo in (universo - simbolos if negado else simbolos):
+                transicoes.adicionar(inicio, simbolo, fim)
+        elif tipo == "vazia":
+            ligar(inicio, fim)
+        elif tipo == "uniao":
+            for filho in no[1]:
+                inicio_filho, fim_filho = construir(filho)
+                ligar(inicio, inicio_filho)
+                ligar(fim_filho, fim)
+        elif tipo == "concatenacao":
+            anterior = inicio
+            for filho in no[1]:
+                inicio_filho, fim_filho = construir(filho)
+                ligar(anterior, inicio_filho)
+                anterior = fim_filho
+            ligar(anterior, fim)
+        elif tipo in ("estrela", "mais", "opcional"):
+            inicio_filho, fim_filho = construir(no[1])
+            ligar(inicio, inicio_filho)
+            ligar(fim_filho, fim)
+            if tipo != "mais":
+                ligar(inicio, fim)
+            if tipo != "opcional":
+                ligar(fim_filho, inicio_filho)
+        else:
+            _, filho, minimo, maximo = no
+            anterior = inicio
+            for indice in range(minimo if maximo is None else maximo):
+                inicio_filho, fim_filho = construir(filho)
+                ligar(anterior, inicio_filho)
+                if indice >= minimo:
+                    ligar(anterior, fim)
+                anterior = fim_filho
+            if maximo is None:
+                inicio_filho, fim_filho = construir(filho)
+                ligar(anterior, inicio_filho)
+                ligar(fim_filho, inicio_filho)
+                ligar(fim_filho, fim)
+            ligar(anterior, fim)
+        return inicio, fim
+
+    inicio, fim = construir(arvore)
+    return AutomatoFinitoNaoDeterministico(estados, universo, transicoes, inicio, {fim})
+
+
+def afd_minimo_grande(n):
+    # Contador de 'a' módulo n ('b' não muda o estado): já é mínimo, com n estados.
+    estados = [f"c{i}" for i in range(n)]
+    transicoes = FuncaoTransicaoDFA()
+    for i, origem in enumerate(estados):
+        transicoes.adicionar(origem, "a", estados[(i + 1) % n])
+        transicoes.adicionar(origem, "b", origem)
+    return AutomatoFinitoDeterministico(estados, {"a", "b"}, transicoes, "c0", {"c0"})
+
+
+def afd_redundante(n, copias, semente=0):
+    # `copias` cópias do contador módulo n, com cada transição indo para uma cópia
+    # sorteada do destino: n * copias estados, mas o AFD mínimo tem só n.
+    gerador = random.Random(semente)
+    transicoes = FuncaoTransicaoDFA()
+    estados = []
+    for copia in range(copias):
+        for i in range(n):
+            origem = f"c{i}_{copia}"
+            estados.append(origem)
+            transicoes.adicionar(origem, "a", f"c{(i + 1) % n}_{gerador.randrange(copias)}")
+            transicoes.adicionar(origem, "b", f"c{i}_{gerador.randrange(copias)}")
+    finais = {f"c0_{copia}" for copia in range(copias)}
+    return AutomatoFinitoDeterministico(estados, {"a", "b"}, transicoes, "c0_0", finais)
+
+
+def escrever_automato(automato, caminho_arquivo):
+    # Grava no formato de texto lido por carregar_automato.
+    deterministico = isinstance(automato, AutomatoFinitoDeterministico)
+    linhas = ["[ESTADOS]", *sorted(automato.Q), "[ALFABETO]", *sorted(automato.Alfabeto)]
+    linhas += ["[INICIAL]", automato.q0, "[FINAIS]", *sorted(automato.F), "[TRANSICOES]"]
+    for origem, transicoes_origem in automato.Transicoes.mapa.items():
+        for simbolo, destinos in transicoes_origem.items():
+            for destino in ([destinos] if deterministico else sorted(destinos)):
+                linhas.append(f"{origem} {simbolo} {destino}")
+    with open(caminho_arquivo, "w", encoding="utf-8") as arquivo:
+        arquivo.write("\n".join(linhas) + "\n")
+
+
+def cadeia_aleatoria(tamanho, gerador, simbolos="ab"):
+    return "".join(gerador.choice(simbolos) for _ in range(tamanho))
+
+
+def cadeia_sem_aba(tamanho, gerador):
+    # Passeio aleatório que nunca forma "aba", para que o AFD percorra a entrada inteira.
+    simbolos = []
+    for _ in range(tamanho):
+        simbolo = gerador.choice("ab")
+        if simbolo == "a" and simbolos[-2:] == ["a", "b"]:
+            simbolo = "b"
+        simbolos.append(simbolo)
+    return "".join(simbolos)
+
+
+def casos_padrao(rapido=False):
+    escala = 1 if rapido else 4
+    return [
+        # AFNs aleatórios explodem na determinização quando a densidade passa de
+        # perto de 1; 0,6 fica abaixo dessa faixa e 1,2 com poucos estados fica nela.
+        ("afn_aleatorio_esparso", lambda: afn_aleatorio(200 * escala, densidade=0.6, semente=1)),
+        ("afn_aleatorio_critico", lambda: afn_aleatorio(16 + escala, densidade=1.2, semente=1)),
+        ("afn_aleatorio_denso", lambda: afn_aleatorio(10 * escala, densidade=3.0, semente=2)),
+        ("afne_aleatorio", lambda: afn_aleatorio(200 * escala, densidade=0.6, probabilidade_epsilon=0.1, semente=3)),
+        ("afne_cadeia_epsilon", lambda: afne_cadeia_epsilon(100 * escala)),
+        ("afne_ciclo_epsilon", lambda: afne_cadeia_epsilon(100 * escala, ciclo=True)),
+        ("afn_explosao", lambda: afn_explosao(8 + 2 * (escala > 1))),
+        ("afn_alfabeto_grande", lambda: afn_explosao(8 + 2 * (escala > 1), string.ascii_letters + string.digits)),
+        ("afd_minimo_grande", lambda: afd_minimo_grande(5_000 * escala)),
+        ("afd_redundante", lambda: afd_redundante(50 * escala, 100)),
+    ]
+
+
+def verificar_lote(afd, cadeias, esperadas):
+    # processar_lote tem de concordar com processar_cadeia, inclusive num lote só
+    # de cadeias vazias (sem nenhuma coluna de símbolos).
+    if list(afd.processar_lote(cadeias).aceitas) != list(esperadas):
+        raise AssertionError("processar_lote divergiu de processar_cadeia")
+    vazias = afd.processar_lote(["", ""])
+    if list(vazias.aceitas) != [afd.processar_cadeia("")] * 2 or list(vazias.posicoes_invalidas) != [-1, -1]:
+        raise AssertionError("processar_lote errou num lote só de cadeias vazias")
+
+
+def executar_etapas(caminho_arquivo, cadeias, medidas, contagens=None):
+    # Roda o pipeline etapa por etapa sobre um autômato recém-carregado, chamando
+    # medidas(etapa, funcao) para cada uma; cada repetição parte do arquivo de novo
+    # para que nenhum cache por instância sobreviva entre elas.
+    automato = medidas("carregar_automato", lambda: carregar_automato(caminho_arquivo))
+    classes = medidas("classes_de_simbolos", automato.classes_de_simbolos)
+    numero_classes = len(set(classes.values()))
+    comprimido = automato
+    if numero_classes < len(classes):
+        comprimido = medidas("comprimir_alfabeto", lambda: automato.comprimir_alfabeto(classes))
+    afd = comprimido
+    if isinstance(comprimido, AutomatoFinitoNaoDeterministico):
+        afn = medidas("remover_estados_inuteis", comprimido.remover_estados_inuteis)
+        if afn.possui_transicoes_epsilon():
+            afn = medidas("converter_para_afn_sem_epsilon", afn.converter_para_afn_sem_epsilon)
+        afd = medidas("converter_afn_para_afd", afn.converter_afn_para_afd)
+        if contagens is not None:
+            contagens["afn"] = len(afn.Q)
+    minimo = medidas("minimizar", afd.minimizar)
+    if comprimido is not automato:
+        minimo = minimo.comprimir_alfabeto(classes)
+    aceitas = medidas("processar_cadeia", lambda: [minimo.processar_cadeia(cadeia) for cadeia in cadeias])
+    verificar_lote(minimo, cadeias, aceitas)
+    if isinstance(comprimido, AutomatoFinitoNaoDeterministico):
+        # O mesmo reconhecimento sem determinizar, pelo simulador de máscaras.
+        simulador = SimuladorAFN(afn, classes)
+        medidas("simular_afn", lambda: simulador.processar_lote(cadeias))
+
+    if contagens is not None:
+        contagens["classes"] = numero_classes
+        contagens["entrada"] = len(automato.Q)
+        contagens["afd"] = len(afd.Q)
+        contagens["minimo"] = len(minimo.Q)
+
+
+def medir_caso(automato, repeticoes=3, cadeias=None):
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_arquivo = os.path.join(diretorio, "automato.txt")
+        escrever_automato(automato, caminho_arquivo)
+        if cadeias is None:
+            gerador = random.Random(0)
+            simbolos = "".join(sorted(automato.Alfabeto))
+            cadeias = [cadeia_aleatoria(1_000, gerador, simbolos) for _ in range(100)]
+
+        tempos = {}
+
+        def cronometrar(etapa, funcao):
+            inicio = time.perf_counter()
+            resultado = funcao()
+            decorrido = time.perf_counter() - inicio
+            tempos[etapa] = min(tempos.get(etapa, decorrido), decorrido)
+            return resultado
+
+        for _ in range(repeticoes):
+            executar_etapas(caminho_arquivo, cadeias, cronometrar)
+
+        # Memória medida numa passada à parte: o tracemalloc deixa tudo mais lento.
+        picos = {}
+
+        def medir_memoria(etapa, funcao):
+            tracemalloc.reset_peak()
+            inicio, _ = tracemalloc.get_traced_memory()
+            resultado = funcao()
+            _, pico = tracemalloc.get_traced_memory()
+            picos[etapa] = pico - inicio
+            return resultado
+
+        contagens = {}
+        tracemalloc.start()
+        try:
+            executar_etapas(caminho_arquivo, cadeias, medir_memoria, contagens)
+        finally:
+            tracemalloc.stop()
+
+    etapas = {etapa: {"tempo_s": tempos[etapa], "pico_memoria_bytes": picos[etapa]} for etapa in tempos}
+    return {"etapas": etapas, "estados": contagens}
+
+
+def revisao_git():
+    try:
+        saida = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        )
+        return saida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar_suite(casos, repeticoes=3, filtro=None):
+    resultados = {
+        "versao": VERSAO_RESULTADOS,
+        "revisao": revisao_git(),
+        "python": platform.python_version(),
+        "casos": {},
+    }
+    for nome, gerar in casos:
+        if filtro and filtro not in nome:
+            continue
+        resultado = medir_caso(gerar(), repeticoes)
+        resultados["casos"][nome] = resultado
+        estados = resultado["estados"]
+        print(f"{nome:<24} estados: {estados.get('entrada')} -> afd {estados.get('afd')} -> mínimo {estados.get('minimo')}")
+        for etapa, medida in resultado["etapas"].items():
+            print(f"    {etapa:<32} {medida['tempo_s'] * 1000:10.2f} ms   pico {medida['pico_memoria_bytes'] / 1024:10.1f} KiB")
+    return resultados
+
+
+def comparar_resultados(anteriores, atuais, limite=LIMITE_REGRESSAO_PADRAO):
+    # Devolve as regressões: etapas cujo tempo ou pico de memória cresceu mais que
+    # `limite` vezes, ou casos cujo número de estados mudou.
+    regressoes = []
+    for nome, atual in atuais["casos"].items():
+        anterior = anteriores["casos"].get(nome)
+        if anterior is None:
+            continue
+        if anterior["estados"] != atual["estados"]:
+            regressoes.append(f"{nome}: estados {anterior['estados']} -> {atual['estados']}")
+        for etapa, medida in atual["etapas"].items():
+            medida_anterior = anterior["etapas"].get(etapa)
+            if medida_anterior is None:
+                continue
+            for campo in ("tempo_s", "pico_memoria_bytes"):
+                antes, depois = medida_anterior[campo], medida[campo]
+                razao = depois / antes if antes else 1.0
+                print(f"{nome:<24} {etapa:<32} {campo:<20} x{razao:6.2f}")
+                if razao > limite:
+                    regressoes.append(f"{nome}/{etapa}: {campo} {antes:.6g} -> {depois:.6g} (x{razao:.2f})")
+    return regressoes
+
+
+def medir(funcao, cadeia, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(cadeia)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def comparar(nome, afd, cadeias):
+    aceita = afd.compilar()
+    for descricao, cadeia in cadeias:
+        tempo_interpretado, esperado = medir(afd.processar_cadeia, cadeia)
+        tempo_compilado, obtido = medir(aceita, cadeia)
+        if esperado != obtido:
+            raise AssertionError(f"{nome}/{descricao}: compilado={obtido} interpretado={esperado}")
+        print(
+            f"{nome:<22} {descricao:<24} interpretado {tempo_interpretado * 1000:9.2f} ms"
+            f"   compilado {tempo_compilado * 1000:9.2f} ms   x{tempo_interpretado / tempo_compilado:7.1f}"
+        )
+
+
+def benchmark_compilador():
+    gerador = random.Random(0)
+
+    contem_aba = processar_automato_completo(carregar_automato("entrada.txt"))
+    explosao = processar_automato_completo(afn_explosao(6))
+
+    cadeias = []
+    for tamanho in (1_000, 100_000, 1_000_000):
+        cadeias.append((f"sem 'aba', n={tamanho}", cadeia_sem_aba(tamanho, gerador)))
+        cadeias.append((f"aleatória, n={tamanho}", cadeia_aleatoria(tamanho, gerador)))
+
+    comparar("contém 'aba'", contem_aba, cadeias)
+    comparar(f"explosão n=6 ({len(explosao.Q)} est.)", explosao, cadeias)
+
+
+EXPRESSOES_BENCHMARK = [
+    ("explosao", "(a|b)*a(a|b){10}", None),
+    ("palavras_chave", "if|else|elif|while|for|return|break|continue|def|class|import|from|yield|lambda", None),
+    ("identificador", "[A-Za-z_][A-Za-z0-9_]*", None),
+    ("numero", "[+\\-]?([0-9]+(\\.[0-9]*)?|\\.[0-9]+)([eE][+\\-]?[0-9]+)?", None),
+    ("repeticao_limitada", "((ab|ba)*c){2,12}(a|b)?", None),
+    ("curinga_largo", ".*a.{6}", string.ascii_letters + string.digits),
+]
+
+
+def benchmark_expressoes(repeticoes=3):
+    # Expressão -> AFD mínimo pelas duas rotas: Glushkov (sem ε) e Thompson (AFNe,
+    # que paga a remoção de ε). O tempo inclui a construção do AFN.
+    for nome, expressao, alfabeto in EXPRESSOES_BENCHMARK:
+        medidas = {}
+        for rota, construir in (("glushkov", construir_afn_glushkov), ("thompson", afne_thompson)):
+            melhor = float("inf")
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                afn = construir(expressao, alfabeto)
+                minimo = processar_automato_completo(afn)
+                melhor = min(melhor, time.perf_counter() - inicio)
+            medidas[rota] = (melhor, len(afn.Q), minimo)
+
+        iguais, contraexemplo = equivalentes(medidas["glushkov"][2], medidas["thompson"][2])
+        if not iguais:
+            raise AssertionError(f"{nome}: as duas rotas produziram linguagens diferentes (contraexemplo: '{contraexemplo}')")
+        tempo_glushkov, estados_glushkov, minimo = medidas["glushkov"]
+        tempo_thompson, estados_thompson, _ = medidas["thompson"]
+        print(
+            f"{nome:<20} AFD mínimo {len(minimo.Q):6d} est."
+            f"   glushkov {estados_glushkov:5d} est. {tempo_glushkov * 1000:9.2f} ms"
+            f"   thompson {estados_thompson:5d} est. {tempo_thompson * 1000:9.2f} ms"
+            f"   x{tempo_thompson / tempo_glushkov:5.1f}"
+        )
+
+
+def afd_regras(palavras=1500, semente=0):
+    # AFD mínimo de um conjunto de regras ancoradas (palavras sorteadas mais alguns
+    # padrões com laço), com estado de erro: o tipo de AFD editado aos poucos.
+    gerador = random.Random(semente)
+    sorteadas = set()
+    while len(sorteadas) < palavras:
+        sorteadas.add(cadeia_aleatoria(gerador.randint(3, 9), gerador, "abcdefghij"))
+    expressao = "|".join(sorted(sorteadas)) + "|x[a-j]+y|[0-9]+(k[0-9]+)?"
+    return processar_automato_completo(construir_afn_glushkov(expressao))
+
+
+def benchmark_incremental(edicoes=300, semente=0):
+    # Latência de cada edição no MinimizadorIncremental contra minimizar() do zero.
+    gerador = random.Random(semente)
+    afd = afd_regras(semente=semente)
+    estatisticas = Estatisticas()
+
+    inicio = time.perf_counter()
+    minimizador = afd.minimizador_incremental(estatisticas)
+    tempo_construcao = time.perf_counter() - inicio
+
+    estados = sorted(estado for estado in minimizador.delta if estado != minimizador.estado_erro)
+    tempos = []
+    for _ in range(edicoes):
+        sorteio = gerador.random()
+        inicio = time.perf_counter()
+        if sorteio < 0.4:
+            minimizador.alternar_final(gerador.choice(estados))
+        elif sorteio < 0.8:
+            minimizador.definir_transicao(gerador.choice(estados), gerador.choice(minimizador.simbolos), gerador.choice(estados))
+        else:
+            minimizador.remover_transicao(gerador.choice(estados), gerador.choice(minimizador.simbolos))
+        tempos.append(time.perf_counter() - inicio)
+
+    editado = minimizador.automato()
+    inicio = time.perf_counter()
+    completo = editado.minimizar()
+    tempo_completo = time.perf_counter() - inicio
+    incremental = minimizador.minimo()
+    if len(incremental.Q) != len(completo.Q) or not equivalentes(incremental, completo)[0]:
+        raise AssertionError("minimizador incremental divergiu de minimizar()")
+
+    tempos.sort()
+    print(f"AFD de regras: {len(afd.Q)} estados, {len(minimizador.simbolos)} símbolos; {edicoes} edições")
+    print(f"  construção do minimizador     {tempo_construcao * 1000:9.2f} ms")
+    print(f"  minimizar() do zero           {tempo_completo * 1000:9.2f} ms")
+    print(
+        f"  edição incremental            mediana {tempos[len(tempos) // 2] * 1000:.3f} ms"
+        f"   p90 {tempos[len(tempos) * 9 // 10] * 1000:.3f} ms   máx {tempos[-1] * 1000:.2f} ms"
+    )
+    print(f"  contadores                    {estatisticas.contadores}")
+
+
+def afn_dicionario(palavras=1500, simbolos="abcd", semente=0):
+    # Busca de qualquer uma de muitas palavras, (a|b|c|d)*(w1|w2|...): o AFN de
+    # Glushkov tem uma posição por letra, e cada nível da BFS tem milhares de
+    # superestados largos a expandir.
+    gerador = random.Random(semente)
+    alternativas = "|".join(
+        "".join(gerador.choice(simbolos) for _ in range(gerador.randint(6, 10))) for _ in range(palavras)
+    )
+    return construir_afn_glushkov(f"({'|'.join(simbolos)})*({alternativas})")
+
+
+def benchmark_paralelo(trabalhadores=None, repeticoes=1):
+    # Construção de subconjuntos sequencial contra a paralela por níveis da BFS,
+    # conferindo que as duas geram exatamente o mesmo AFD.
+    casos = [("explosao_16", afn_explosao(16)), ("dicionario_1500", afn_dicionario())]
+    trabalhadores = trabalhadores or os.cpu_count()
+    print(f"{trabalhadores} trabalhadores ({os.cpu_count()} CPUs)")
+    for nome, afn in casos:
+        tempos = {}
+        afds = {}
+        for modo in (MODO_BITSET, MODO_PARALELO):
+            melhor = None
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                afds[modo] = afn.converter_afn_para_afd(modo=modo, trabalhadores=trabalhadores)
+                decorrido = time.perf_counter() - inicio
+                melhor = decorrido if melhor is None else min(melhor, decorrido)
+            tempos[modo] = melhor
+
+        sequencial, paralelo = afds[MODO_BITSET], afds[MODO_PARALELO]
+        if (sequencial.Q, sequencial.F, sequencial.Transicoes.mapa) != (paralelo.Q, paralelo.F, paralelo.Transicoes.mapa):
+            raise AssertionError(f"{nome}: o modo paralelo gerou um AFD diferente do sequencial")
+        print(
+            f"{nome:<18} AFN {len(afn.Q):6d}  AFD {len(sequencial.Q):7d}   sequencial {tempos[MODO_BITSET] * 1000:9.1f} ms"
+            f"   paralelo {tempos[MODO_PARALELO] * 1000:9.1f} ms   ({tempos[MODO_BITSET] / tempos[MODO_PARALELO]:.2f}x)"
+        )
+
+
+def benchmark_disco(orcamento=8192):
+    # Tempo e pico de memória (medido numa segunda execução, com tracemalloc) da
+    # determinização toda em memória contra a que transborda o índice de
+    # superestados para disco acima de `orcamento`.
+    afn = afn_explosao(15)
+    resultados = {}
+    for nome, converter in (
+        ("memoria", lambda: afn.converter_afn_para_afd()),
+        ("disco", lambda: afn.converter_afn_para_afd_em_disco(orcamento_estados=orcamento)),
+    ):
+        inicio = time.perf_counter()
+        resultados[nome] = converter()
+        decorrido = time.perf_counter() - inicio
+
+        tracemalloc.start()
+        converter()
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{nome:<8} {decorrido * 1000:9.1f} ms   pico {pico / 1e6:8.1f} MB")
+
+    memoria, disco = resultados["memoria"], resultados["disco"].para_afd()
+    if (memoria.Q, memoria.F, memoria.Transicoes.mapa) != (set(disco.Q), set(disco.F), disco.Transicoes.mapa):
+        raise AssertionError("a determinização em disco gerou um AFD diferente")
+
+
+def benchmark_contagem(comprimento_forca_bruta=14, comprimento=2000, amostras=1000):
+    # Contagem por programação dinâmica / potência de matriz contra testar cada
+    # uma das |Σ|^n cadeias com processar_cadeia, mais a vazão da enumeração e da
+    # amostragem.
+    afd = processar_automato_completo(afn_explosao(6))
+    simbolos = sorted(afd.Alfabeto)
+
+    inicio = time.perf_counter()
+    forca_bruta = sum(
+        afd.processar_cadeia("".join(cadeia)) for cadeia in itertools.product(simbolos, repeat=comprimento_forca_bruta)
+    )
+    tempo_forca_bruta = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    contagem = afd.contar_aceitas(comprimento_forca_bruta)
+    tempo_contagem = time.perf_counter() - inicio
+    if contagem != forca_bruta:
+        raise AssertionError("contar_aceitas divergiu da força bruta")
+
+    print(f"AFD mínimo de {len(afd.Q)} estados, |Σ| = {len(simbolos)}")
+    print(f"  n = {comprimento_forca_bruta}: força bruta {tempo_forca_bruta * 1000:9.1f} ms   contar_aceitas {tempo_contagem * 1000:7.2f} ms   ({contagem} cadeias)")
+
+    inicio = time.perf_counter()
+    grande = afd.contar_aceitas(comprimento)
+    print(f"  n = {comprimento}: contar_aceitas {(time.perf_counter() - inicio) * 1000:9.1f} ms   ({grande.bit_length()} bits)")
+
+    inicio = time.perf_counter()
+    enumeradas = sum(1 for _ in itertools.islice(afd.enumerar_aceitas(64), amostras * 10))
+    tempo_enumeracao = time.perf_counter() - inicio
+    print(f"  enumerar_aceitas(64): {enumeradas} cadeias em {tempo_enumeracao * 1000:.1f} ms")
+
+    inicio = time.perf_counter()
+    afd.amostrar_aceitas(64, amostras, random.Random(0))
+    print(f"  amostrar_aceitas(64): {amostras} cadeias em {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do pipeline AFNe -> AFN -> AFD -> AFD mínimo.")
+    parser.add_argument("--saida", help="grava os resultados em JSON neste arquivo")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument("--limite", type=float, default=LIMITE_REGRESSAO_PADRAO, help="razão acima da qual uma etapa conta como regressão")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--filtro", help="roda só os casos cujo nome contém este texto")
+    parser.add_argument("--rapido", action="store_true", help="usa autômatos menores")
+    parser.add_argument("--compilador", action="store_true", help="roda o benchmark do compilador de AFDs")
+    parser.add_argument("--expressoes", action="store_true", help="compara as rotas Glushkov e Thompson de expressão regular a AFD mínimo")
+    parser.add_argument("--incremental", action="store_true", help="mede a latência de edições no minimizador incremental")
+    parser.add_argument("--paralelo", action="store_true", help="compara a determinização sequencial com a paralela")
+    parser.add_argument("--contagem", action="store_true", help="mede a contagem, a enumeração e a amostragem de cadeias aceitas")
+    parser.add_argument("--disco", action="store_true", help="compara a determinização em memória com a que transborda para disco")
+    parser.add_argument("--trabalhadores", type=int, help="processos do benchmark --paralelo (padrão: número de CPUs)")
+    opcoes = parser.parse_args(argumentos)
+
+    if opcoes.compilador:
+        benchmark_compilador()
+        return 0
+
+    if opcoes.expressoes:
+        benchmark_expressoes(opcoes.repeticoes)
+        return 0
+
+    if opcoes.incremental:
+        benchmark_incremental()
+        return 0
+
+    if opcoes.contagem:
+        benchmark_contagem()
+        return 0
+
+    if opcoes.disco:
+        benchmark_disco()
+        return 0
+
+    if opcoes.paralelo:
+        benchmark_paralelo(opcoes.trabalhadores, opcoes.repeticoes)
+        return 0
+
+    resultados = executar_suite(casos_padrao(opcoes.rapido), opcoes.repeticoes, opcoes.filtro)
+
+    if opcoes.saida:
+        with open(opcoes.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultados, arquivo, indent=2, ensure_ascii=False)
+
+    if opcoes.comparar:
+        with open(opcoes.comparar, "r", encoding="utf-8") as arquivo:
+            anteriores = json.load(arquivo)
+        regressoes = comparar_resultados(anteriores, resultados, opcoes.limite)
+        for regressao in regressoes:
+            print(f"REGRESSÃO: {regressao}")
+        if regressoes:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
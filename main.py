@@ -1,7 +1,313 @@
+import argparse
+import contextlib
+import glob
+import hashlib
+import json
+import logging
+import mmap
+import os
 import pprint
+import random
+import re
+import signal
+import sqlite3
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
 
 SIMBOLO_EPSILON = "&" 
 
+MOTOR_HOPCROFT = "hopcroft"
+MOTOR_TABELA = "tabela"
+MOTOR_BRZOZOWSKI = "brzozowski"
+MOTORES_MINIMIZACAO = (MOTOR_HOPCROFT, MOTOR_TABELA, MOTOR_BRZOZOWSKI)
+
+ESTRATEGIA_SUBCONJUNTOS = "subconjuntos"
+ESTRATEGIA_BRZOZOWSKI = "brzozowski"
+ESTRATEGIA_AUTOMATICA = "auto"
+ESTRATEGIAS = (ESTRATEGIA_SUBCONJUNTOS, ESTRATEGIA_BRZOZOWSKI, ESTRATEGIA_AUTOMATICA)
+
+MODO_BITSET = "bitset"
+MODO_CONJUNTOS = "conjuntos"
+MODO_PARALELO = "paralelo"
+MODOS_DETERMINIZACAO = (MODO_BITSET, MODO_CONJUNTOS, MODO_PARALELO)
+# Níveis da BFS menores que isso são expandidos no próprio processo: não compensa
+# o custo de mandar os superestados para os trabalhadores e trazer os sucessores.
+MINIMO_NIVEL_PARALELO = 512
+
+ORCAMENTO_PADRAO_AFD_PREGUICOSO = 16 * 1024 * 1024
+
+ORCAMENTO_PADRAO_SUPERESTADOS = 1 << 20
+INTERVALO_CHECKPOINT = 10000
+TAMANHO_LOTE_DISCO = 4096
+VERSAO_CHECKPOINT = 1
+
+TAMANHO_BLOCO_LOTE = 1 << 16
+
+TAMANHO_BLOCO_FLUXO = 1 << 20
+
+TAMANHO_TRECHO_COMPILADO = 1024
+
+MAGICO_BINARIO = b"AFDB"
+VERSAO_BINARIO = 2
+FORMATO_CABECALHO_BINARIO = "<4sHIIIQQ"
+
+TAMANHO_LOTE_LEITURA = 1 << 14
+
+VERSAO_CACHE = 4
+TAMANHO_PADRAO_CACHE = 256 * 1024 * 1024
+# Temporários do cache mais velhos que isso são de um processo que morreu entre
+# criar o arquivo e publicá-lo; os mais novos podem ser de uma gravação em curso.
+IDADE_TEMPORARIO_ORFAO = 600
+# A poda desce o cache até essa fração de tamanho_maximo, para que a próxima
+# varredura do diretório só aconteça depois de muitas gravações.
+FRACAO_APOS_PODA = 0.9
+# Gravações entre duas varreduras mesmo sem passar do limite, para enxergar o que
+# outros processos gravaram e os temporários órfãos.
+GRAVACOES_ENTRE_VARREDURAS = 1024
+
+EXTENSOES_ENTRADA = (".txt", ".afdb")
+FORMATO_TEXTO = "texto"
+FORMATO_BINARIO = "binario"
+FORMATOS_SAIDA = (FORMATO_TEXTO, FORMATO_BINARIO)
+
+STATUS_OK = "ok"
+STATUS_SIMULACAO = "simulacao"
+STATUS_ERRO = "erro"
+STATUS_TEMPO_ESGOTADO = "tempo_esgotado"
+STATUS_MEMORIA_EXCEDIDA = "memoria_excedida"
+
+# Mensagens vão para o logger "automatos", mudo por padrão: quem quiser vê-las
+# configura o logging (o script no fim do arquivo liga o nível DEBUG).
+registro = logging.getLogger("automatos")
+registro.addHandler(logging.NullHandler())
+
+def _indices_bits(mascara):
+    # Varre a representação binária em C (str.find) em vez de testar bit a bit.
+    binario = bin(mascara)[:1:-1]
+    indices = []
+    indice = binario.find("1")
+    while indice >= 0:
+        indices.append(indice)
+        indice = binario.find("1", indice + 1)
+    return indices
+
+def _mascara_para_bytes(mascara):
+    # Forma canônica (sem zeros à direita), para comparar máscaras como bytes.
+    return mascara.to_bytes((mascara.bit_length() + 7) // 8, "little")
+
+def _classes_por_assinatura(assinaturas):
+    # Símbolos com a mesma assinatura (o mesmo comportamento em todos os estados)
+    # formam uma classe, representada pelo menor deles.
+    representante_da_assinatura = {}
+    classes = {}
+    for simbolo in sorted(assinaturas):
+        classes[simbolo] = representante_da_assinatura.setdefault(tuple(assinaturas[simbolo]), simbolo)
+    return classes
+
+# [pico recuperado, zera o pico global?] de cada Estatisticas.etapa aberta que mede
+# memória, da mais externa para a mais interna. Uma etapa interna zera o pico do
+# tracemalloc; o que a envolvente já tinha alcançado fica guardado aqui.
+_etapas_medindo_memoria = []
+
+class Estatisticas:
+    # Métricas de uma execução do pipeline: tempo de parede e pico de memória por
+    # etapa, e contadores como superestados criados, fechos ε calculados e divisões
+    # de blocos no refinamento. O pico de memória usa tracemalloc, que deixa tudo
+    # bem mais lento, então só é medido com medir_memoria=True.
+    def __init__(self, medir_memoria=False):
+        self.medir_memoria = medir_memoria
+        self.etapas = {}
+        self.contadores = {}
+
+    def contar(self, nome, quantidade=1):
+        self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    @contextlib.contextmanager
+    def etapa(self, nome):
+        iniciou_rastreio = False
+        if self.medir_memoria:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                iniciou_rastreio = True
+            memoria_inicial, pico_ate_aqui = tracemalloc.get_traced_memory()
+            if _etapas_medindo_memoria:
+                # O pico até aqui é da etapa que envolve esta; ela o recupera na saída.
+                envolvente = _etapas_medindo_memoria[-1]
+                envolvente[0] = max(envolvente[0], pico_ate_aqui)
+                zerar_pico = envolvente[1]
+            else:
+                # Se outro código já rastreava a memória, o pico global é dele e não
+                # é zerado; a etapa mede contra ele, o que só superestima.
+                zerar_pico = iniciou_rastreio
+            if zerar_pico:
+                tracemalloc.reset_peak()
+            _etapas_medindo_memoria.append([0, zerar_pico])
+
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            medida = self.etapas.setdefault(nome, {"tempo_s": 0.0})
+            medida["tempo_s"] += time.perf_counter() - inicio
+            if self.medir_memoria:
+                _, pico = tracemalloc.get_traced_memory()
+                pico = max(pico, _etapas_medindo_memoria.pop()[0])
+                if _etapas_medindo_memoria:
+                    envolvente = _etapas_medindo_memoria[-1]
+                    envolvente[0] = max(envolvente[0], pico)
+                medida["pico_memoria_bytes"] = max(medida.get("pico_memoria_bytes", 0), pico - memoria_inicial)
+                if iniciou_rastreio:
+                    tracemalloc.stop()
+            registro.info("Etapa '%s' concluída em %.3f ms.", nome, medida["tempo_s"] * 1000)
+
+    def para_dicionario(self):
+        return {"etapas": {nome: dict(medida) for nome, medida in self.etapas.items()}, "contadores": dict(self.contadores)}
+
+    def __str__(self):
+        return pprint.pformat(self.para_dicionario())
+
+def _contar(estatisticas, nome, quantidade=1):
+    if estatisticas is not None:
+        estatisticas.contar(nome, quantidade)
+
+# Tabelas de sucessores de cada processo da determinização paralela: chegam uma
+# vez, pelo inicializador, e cada tarefa traz só os superestados a expandir.
+_expansao_trabalhador = None
+
+def _iniciar_expansao(tabelas, mascara_vivos):
+    global _expansao_trabalhador
+    _expansao_trabalhador = (tabelas, mascara_vivos)
+
+def _expandir_superestados(superestados, tabelas, mascara_vivos):
+    # Para cada superestado, a posição de cada sucessor (na ordem dos símbolos)
+    # numa lista sem repetições, para não devolver a mesma máscara várias vezes.
+    # Sucessores mortos viram 0, que o coordenador trata como o estado de erro.
+    distintos = {}
+    linhas = []
+    for superestado in superestados:
+        estados_nfa = _indices_bits(superestado)
+        linha = []
+        for tabela in tabelas:
+            proximo_super_estado = 0
+            for indice in estados_nfa:
+                proximo_super_estado |= tabela[indice]
+            if not proximo_super_estado & mascara_vivos:
+                proximo_super_estado = 0
+            linha.append(distintos.setdefault(proximo_super_estado, len(distintos)))
+        linhas.append(linha)
+    return list(distintos), linhas
+
+def _expandir_fatia(superestados):
+    tabelas, mascara_vivos = _expansao_trabalhador
+    return _expandir_superestados(superestados, tabelas, mascara_vivos)
+
+class LimiteEstadosExcedido(ValueError):
+    # A construção de subconjuntos passou do orçamento de superestados.
+    def __init__(self, limite):
+        super().__init__(f"Construção de subconjuntos excedeu o limite de {limite} superestados.")
+        self.limite = limite
+
+class _IndiceSuperestados:
+    # O passo comum às construções de subconjuntos por máscara: dado o sucessor de
+    # um superestado, devolve o número dele. Sucessores mortos (sem estado que
+    # alcance F) vão para o estado de erro; os novos recebem o próximo número, na
+    # ordem da BFS, respeitando `limite_estados`. Onde o índice máscara -> número
+    # fica é das subclasses (_buscar e _inserir).
+    def __init__(self, mascara_vivos, mascara_finais, limite_estados=None):
+        self.mascara_vivos = mascara_vivos
+        self.mascara_finais = mascara_finais
+        self.limite_estados = limite_estados
+        self.total = 0
+        self.precisa_estado_erro = False
+        # -1 até o fim, quando o estado de erro ganha número; com Q0 morto, o
+        # próprio Q0 é o estado de erro.
+        self.erro = -1
+
+    def registrar_inicial(self, mascara):
+        if not mascara & self.mascara_vivos:
+            self.erro = 0
+        self.total = 1
+        self._inserir(mascara, 0, bool(mascara & self.mascara_finais))
+
+    def sucessor(self, mascara):
+        if not mascara & self.mascara_vivos:
+            self.precisa_estado_erro = True
+            return self.erro
+        numero = self._buscar(mascara)
+        if numero is None:
+            if self.limite_estados is not None and self.total >= self.limite_estados:
+                raise LimiteEstadosExcedido(self.limite_estados)
+            numero = self.total
+            self.total += 1
+            self._inserir(mascara, numero, bool(mascara & self.mascara_finais))
+        return numero
+
+class _IndiceSuperestadosMemoria(_IndiceSuperestados):
+    # Índice num dicionário, com os nomes Q0, Q1, ... e a fila da BFS.
+    def __init__(self, mascara_vivos, mascara_finais, limite_estados=None):
+        super().__init__(mascara_vivos, mascara_finais, limite_estados)
+        self.mapa = {}
+        self.nomes = []
+        # Nome de cada máscara já resolvida, inclusive as mortas (estado de erro).
+        self.nome_por_mascara = {}
+        self.finais = set()
+        self.fila = deque()
+
+    def _buscar(self, mascara):
+        return self.mapa.get(mascara)
+
+    def _inserir(self, mascara, numero, final):
+        nome = f"Q{numero}"
+        self.mapa[mascara] = numero
+        self.nomes.append(nome)
+        self.nome_por_mascara[mascara] = nome
+        if final:
+            self.finais.add(nome)
+        self.fila.append(mascara)
+
+    def nome(self, mascara):
+        # Os laços quentes consultam nome_por_mascara direto e só chamam aqui
+        # quando a máscara ainda não foi vista.
+        nome = self.nome_por_mascara.get(mascara)
+        if nome is None:
+            numero = self.sucessor(mascara)
+            nome = self.nomes[numero] if numero >= 0 else "Q_ERRO"
+            self.nome_por_mascara[mascara] = nome
+        return nome
+
+    def automato(self, alfabeto, simbolos, transicoes, estatisticas=None):
+        _contar(estatisticas, "superestados_criados", self.total)
+        estados = set(self.nomes)
+        if self.precisa_estado_erro:
+            nome_estado_erro = self.nomes[self.erro] if self.erro >= 0 else "Q_ERRO"
+            estados.add(nome_estado_erro)
+            for simbolo in simbolos:
+                transicoes.adicionar(nome_estado_erro, simbolo, nome_estado_erro)
+
+        return AutomatoFinitoDeterministico(
+            Q=estados,
+            Alfabeto=alfabeto,
+            Transicoes=transicoes,
+            q0=self.nomes[0],
+            F=self.finais
+        )
+
 class FuncaoTransicaoNFA:
     def __init__(self):
         self.mapa = {}
@@ -27,21 +333,41 @@ class FuncaoTransicaoNFA:
         return "\n".join(linhas)
 
 class AutomatoFinitoNaoDeterministico:
-    def __init__(self, Q, Alfabeto, Transicoes, q0, F, simbolo_epsilon=SIMBOLO_EPSILON):
+    # `iniciais` permite vários estados iniciais (como no reverso de um autômato);
+    # sem ele, o único inicial é q0.
+    # As tabelas derivadas (índice dos estados, máscaras de sucessores, fechos-ε,
+    # estados vivos, simulador) são montadas na primeira vez que alguém precisa
+    # delas e supõem o autômato congelado daí em diante: quem editar Q, F, q0 ou
+    # Transicoes depois disso deve chamar invalidar_cache().
+    def __init__(self, Q, Alfabeto, Transicoes, q0, F, simbolo_epsilon=SIMBOLO_EPSILON, validar=True, iniciais=None):
         self.Q = set(Q)
         self.Alfabeto = set(Alfabeto)
         self.Transicoes = Transicoes
         self.q0 = q0
+        self.iniciais = {q0} if iniciais is None else set(iniciais)
         self.F = set(F)
         self.simbolo_epsilon = simbolo_epsilon
-        self._validar()
+        self.invalidar_cache()
+        if validar:
+            self._validar()
+
+    def invalidar_cache(self):
+        self._estados_indexados = None
+        self._indice_estado = None
+        self._sucessores = None
+        self._fechos_epsilon = None
+        self._vivos = None
+        self._simulador = None
 
     def _validar(self):
         if not self.Q:
             raise ValueError("Q (conjunto de estados) não pode ser vazio.")
             
-        if self.q0 not in self.Q:
+        if self.iniciais == {self.q0} and self.q0 not in self.Q:
             raise ValueError(f"q0 (estado inicial '{self.q0}') não pertence a Q.")
+
+        if not self.iniciais.issubset(self.Q):
+            raise ValueError(f"Estados iniciais {self.iniciais} não são um subconjunto de Q.")
         
         if not self.F.issubset(self.Q):
             raise ValueError(f"F (estados finais {self.F}) não é um subconjunto de Q.")
@@ -58,26 +384,115 @@ class AutomatoFinitoNaoDeterministico:
                     if destino not in self.Q:
                          raise ValueError(f"Estado de destino '{destino}' em Transicoes não pertence a Q.")
 
+    def _tabela_fecho_epsilon(self, estatisticas=None):
+        # Fechos calculados uma única vez: os ciclos ε são colapsados pelo algoritmo
+        # de Tarjan, que entrega as componentes em ordem topológica reversa, de modo
+        # que o fecho de cada componente é a união dos fechos já prontos dos sucessores.
+        if self._fechos_epsilon is not None:
+            return self._fechos_epsilon
+
+        estados, indice_estado = self._indexar_estados()
+        n = len(estados)
+        adjacencias = [
+            [indice_estado[destino] for destino in self.Transicoes.obter(estado, self.simbolo_epsilon)]
+            for estado in estados
+        ]
+
+        ordem_visita = [-1] * n
+        menor_alcancavel = [0] * n
+        na_pilha = [False] * n
+        componente = [-1] * n
+        pilha_componente = []
+        fechos_componentes = []
+        contador_visita = 0
+
+        for raiz in range(n):
+            if ordem_visita[raiz] != -1:
+                continue
+
+            ordem_visita[raiz] = menor_alcancavel[raiz] = contador_visita
+            contador_visita += 1
+            pilha_componente.append(raiz)
+            na_pilha[raiz] = True
+            chamadas = [(raiz, 0)]
+
+            while chamadas:
+                vertice, proximo_vizinho = chamadas[-1]
+                vizinhos = adjacencias[vertice]
+
+                if proximo_vizinho < len(vizinhos):
+                    chamadas[-1] = (vertice, proximo_vizinho + 1)
+                    vizinho = vizinhos[proximo_vizinho]
+                    if ordem_visita[vizinho] == -1:
+                        ordem_visita[vizinho] = menor_alcancavel[vizinho] = contador_visita
+                        contador_visita += 1
+                        pilha_componente.append(vizinho)
+                        na_pilha[vizinho] = True
+                        chamadas.append((vizinho, 0))
+                    elif na_pilha[vizinho]:
+                        menor_alcancavel[vertice] = min(menor_alcancavel[vertice], ordem_visita[vizinho])
+                    continue
+
+                chamadas.pop()
+                if chamadas:
+                    chamador = chamadas[-1][0]
+                    menor_alcancavel[chamador] = min(menor_alcancavel[chamador], menor_alcancavel[vertice])
+
+                if menor_alcancavel[vertice] != ordem_visita[vertice]:
+                    continue
+
+                indice_componente = len(fechos_componentes)
+                membros = []
+                while True:
+                    membro = pilha_componente.pop()
+                    na_pilha[membro] = False
+                    componente[membro] = indice_componente
+                    membros.append(membro)
+                    if membro == vertice:
+                        break
+
+                fecho = 0
+                for membro in membros:
+                    fecho |= 1 << membro
+                for membro in membros:
+                    for vizinho in adjacencias[membro]:
+                        if componente[vizinho] != indice_componente:
+                            fecho |= fechos_componentes[componente[vizinho]]
+                fechos_componentes.append(fecho)
+
+        self._fechos_epsilon = [fechos_componentes[componente[indice]] for indice in range(n)]
+        _contar(estatisticas, "fechos_epsilon_calculados", n)
+        _contar(estatisticas, "componentes_epsilon", len(fechos_componentes))
+        return self._fechos_epsilon
+
+    def _fecho_epsilon_mascara(self, mascara):
+        fechos = self._tabela_fecho_epsilon()
+        fecho_total = 0
+        for indice in _indices_bits(mascara):
+            fecho_total |= fechos[indice]
+        return fecho_total
+
+    def _estados_da_mascara(self, mascara):
+        estados, _ = self._indexar_estados()
+        return {estados[indice] for indice in _indices_bits(mascara)}
+
     def _fecho_epsilon_estado(self, estado):
-        fecho = {estado}
-        pilha_visitar = [estado]
-        
-        while pilha_visitar:
-            estado_atual = pilha_visitar.pop()
-            destinos_epsilon = self.Transicoes.obter(estado_atual, self.simbolo_epsilon)
-            
-            for destino in destinos_epsilon:
-                if destino not in fecho:
-                    fecho.add(destino)
-                    pilha_visitar.append(destino)
-                    
-        return fecho
+        _, indice_estado = self._indexar_estados()
+        return self._estados_da_mascara(self._tabela_fecho_epsilon()[indice_estado[estado]])
 
     def fecho_epsilon_conjunto(self, conjunto_estados):
-        fecho_total = set()
-        for estado in conjunto_estados:
-            fecho_total.update(self._fecho_epsilon_estado(estado))
-        return fecho_total
+        return self._estados_da_mascara(self._fecho_epsilon_mascara(self._mascara(conjunto_estados)))
+
+    def simular(self):
+        if self._simulador is None:
+            self._simulador = SimuladorAFN(self)
+        return self._simulador
+
+    def processar_cadeia(self, cadeia):
+        return self.simular().processar_cadeia(cadeia)
+
+    def processar_lote(self, cadeias):
+        return self.simular().processar_lote(cadeias)
 
     def __str__(self):
         return (
@@ -85,7 +500,8 @@ class AutomatoFinitoNaoDeterministico:
             f"Q = {self.Q}\n"
             f"Σ = {self.Alfabeto}\n"
             f"q0 = {self.q0}\n"
-            f"F = {self.F}\n"
+            + (f"Iniciais = {self.iniciais}\n" if self.iniciais != {self.q0} else "")
+            + f"F = {self.F}\n"
             f"ε = '{self.simbolo_epsilon}'\n"
             f"δ = \n{self.Transicoes}"
         )
@@ -100,46 +516,53 @@ class AutomatoFinitoNaoDeterministico:
         
         return mapa_estados[conjunto_fs]
 
-    def converter_para_afn_sem_epsilon(self):
-        print("Iniciando conversão de AFNe para AFN (sem épsilon)...")
+    def converter_para_afn_sem_epsilon(self, estatisticas=None):
+        registro.info("Iniciando conversão de AFNe para AFN (sem épsilon)...")
         
         novos_q = self.Q
         novo_alfabeto = self.Alfabeto
         novo_q0 = self.q0
         
+        estados, indice_estado = self._indexar_estados()
+        fechos = self._tabela_fecho_epsilon(estatisticas)
+        sucessores = self._mascaras_sucessores()
+        mascara_finais = self._mascara(self.F)
+
         novos_f = set()
         for estado in self.Q:
-            fecho_do_estado = self._fecho_epsilon_estado(estado)
-            if not fecho_do_estado.isdisjoint(self.F):
+            if fechos[indice_estado[estado]] & mascara_finais:
                 novos_f.add(estado)
                 
         novas_transicoes = FuncaoTransicaoNFA()
         
         for estado_origem in self.Q:
-            fecho_origem = self._fecho_epsilon_estado(estado_origem)
+            fecho_origem = _indices_bits(fechos[indice_estado[estado_origem]])
             
             for simbolo in self.Alfabeto:
+                tabela = sucessores[simbolo]
                 
-                conjunto_movimento = set()
+                conjunto_movimento = 0
                 for estado_intermediario in fecho_origem:
-                    destinos = self.Transicoes.obter(estado_intermediario, simbolo)
-                    conjunto_movimento.update(destinos)
+                    conjunto_movimento |= tabela[estado_intermediario]
                 
-                novos_destinos = self.fecho_epsilon_conjunto(conjunto_movimento)
+                novos_destinos = self._fecho_epsilon_mascara(conjunto_movimento)
                 
-                if novos_destinos:
-                    for destino_final in novos_destinos:
-                        novas_transicoes.adicionar(estado_origem, simbolo, destino_final)
+                for destino_final in _indices_bits(novos_destinos):
+                    novas_transicoes.adicionar(estado_origem, simbolo, estados[destino_final])
 
-        print("Conversão para AFN (sem épsilon) concluída.")
+        registro.info("Conversão para AFN (sem épsilon) concluída.")
 
-        return AutomatoFinitoNaoDeterministico(
+        afn = AutomatoFinitoNaoDeterministico(
             Q=novos_q,
             Alfabeto=novo_alfabeto,
             Transicoes=novas_transicoes,
             q0=novo_q0,
-            F=novos_f
+            F=novos_f,
+            iniciais=self.iniciais
         )
+        # Remover ε não muda quais estados alcançam F.
+        afn._vivos = self._vivos
+        return afn
 
     def possui_transicoes_epsilon(self):
         for origem, transicoes in self.Transicoes.mapa.items():
@@ -148,8 +571,354 @@ class AutomatoFinitoNaoDeterministico:
         
         return False
 
-    def converter_afn_para_afd(self):
-        print("Iniciando conversão de AFN para AFD...")
+    def classes_de_simbolos(self):
+        # Dois símbolos ficam na mesma classe quando levam cada estado exatamente
+        # aos mesmos destinos. Devolve {símbolo: representante da classe}.
+        estados, _ = self._indexar_estados()
+        assinaturas = {simbolo: [] for simbolo in self.Alfabeto - {self.simbolo_epsilon}}
+        for indice, estado in enumerate(estados):
+            for simbolo, destinos in self.Transicoes.mapa.get(estado, {}).items():
+                if destinos and simbolo in assinaturas:
+                    assinaturas[simbolo].append((indice, frozenset(destinos)))
+        return _classes_por_assinatura(assinaturas)
+
+    def comprimir_alfabeto(self, classes):
+        # Mesmo AFN sobre o alfabeto dos representantes; quem usa o resultado
+        # guarda `classes` para traduzir os símbolos na hora do reconhecimento.
+        representantes = {classes.get(simbolo, simbolo) for simbolo in self.Alfabeto - {self.simbolo_epsilon}}
+        if not representantes.issubset(self.Alfabeto):
+            raise ValueError(f"Representantes {representantes - self.Alfabeto} não pertencem a Alfabeto.")
+
+        transicoes = FuncaoTransicaoNFA()
+        for origem, transicoes_origem in self.Transicoes.mapa.items():
+            transicoes.mapa[origem] = {
+                simbolo: set(destinos) for simbolo, destinos in transicoes_origem.items()
+                if simbolo in representantes or simbolo == self.simbolo_epsilon
+            }
+
+        return AutomatoFinitoNaoDeterministico(
+            Q=self.Q,
+            Alfabeto=representantes,
+            Transicoes=transicoes,
+            q0=self.q0,
+            F=self.F,
+            simbolo_epsilon=self.simbolo_epsilon,
+            validar=False,
+            iniciais=self.iniciais
+        )
+
+    def _estados_acessiveis(self):
+        alcancados = set(self.iniciais)
+        fila_processamento = list(alcancados)
+        for estado in fila_processamento:
+            for destinos in self.Transicoes.mapa.get(estado, {}).values():
+                for destino in destinos:
+                    if destino not in alcancados:
+                        alcancados.add(destino)
+                        fila_processamento.append(destino)
+        return alcancados
+
+    def _estados_coacessiveis(self):
+        # Busca em largura reversa a partir de F, seguindo também as transições ε.
+        if self._vivos is not None:
+            return self._vivos
+
+        predecessores = {}
+        for origem, transicoes in self.Transicoes.mapa.items():
+            for destinos in transicoes.values():
+                for destino in destinos:
+                    predecessores.setdefault(destino, []).append(origem)
+
+        vivos = set(self.F)
+        fila_processamento = list(vivos)
+        for estado in fila_processamento:
+            for predecessor in predecessores.get(estado, ()):
+                if predecessor not in vivos:
+                    vivos.add(predecessor)
+                    fila_processamento.append(predecessor)
+        self._vivos = vivos
+        return vivos
+
+    def remover_estados_inuteis(self, estatisticas=None):
+        # Mantém só os estados alcançáveis a partir dos iniciais que ainda alcançam
+        # algum final; os outros só gerariam superestados que acabam no estado morto.
+        uteis = self._estados_acessiveis() & self._estados_coacessiveis()
+        if uteis == self.Q:
+            registro.info("... (Poda) Todos os estados do AFN são úteis.")
+            return self
+
+        _contar(estatisticas, "estados_inuteis_removidos", len(self.Q) - len(uteis))
+        if registro.isEnabledFor(logging.DEBUG):
+            registro.debug("... (Poda) Removendo estados inalcançáveis ou sem caminho até F: %s", self.Q - uteis)
+
+        transicoes = FuncaoTransicaoNFA()
+        for origem in uteis:
+            for simbolo, destinos in self.Transicoes.mapa.get(origem, {}).items():
+                destinos_uteis = destinos & uteis
+                if destinos_uteis:
+                    if origem not in transicoes.mapa:
+                        transicoes.mapa[origem] = {}
+                    transicoes.mapa[origem][simbolo] = destinos_uteis
+
+        # Sem nenhum estado útil a linguagem é vazia, e Q fica vazio: a
+        # determinização devolve só o estado de erro.
+        iniciais = self.iniciais & uteis
+        q0 = self.q0 if self.q0 in uteis else min(iniciais, default=None)
+        podado = AutomatoFinitoNaoDeterministico(
+            Q=uteis,
+            Alfabeto=self.Alfabeto,
+            Transicoes=transicoes,
+            q0=q0,
+            F=self.F & uteis,
+            simbolo_epsilon=self.simbolo_epsilon,
+            validar=False,
+            iniciais=iniciais
+        )
+        podado._vivos = uteis
+        return podado
+
+    def _indexar_estados(self):
+        if self._estados_indexados is None:
+            self._estados_indexados = sorted(self.Q)
+            self._indice_estado = {estado: indice for indice, estado in enumerate(self._estados_indexados)}
+        return self._estados_indexados, self._indice_estado
+
+    def _mascara(self, conjunto_estados):
+        _, indice_estado = self._indexar_estados()
+        mascara = 0
+        for estado in conjunto_estados:
+            mascara |= 1 << indice_estado[estado]
+        return mascara
+
+    def _mascaras_sucessores(self):
+        # sucessores[simbolo][i] é a máscara de δ(estado_i, simbolo).
+        if self._sucessores is None:
+            estados, _ = self._indexar_estados()
+            self._sucessores = {}
+            for simbolo in self.Alfabeto | {self.simbolo_epsilon}:
+                self._sucessores[simbolo] = [
+                    self._mascara(self.Transicoes.obter(estado, simbolo)) for estado in estados
+                ]
+        return self._sucessores
+
+    # Com `limite_estados`, a construção de subconjuntos levanta
+    # LimiteEstadosExcedido ao criar mais superestados do que isso.
+    # `trabalhadores` só vale para o modo paralelo (padrão: número de CPUs).
+    def converter_afn_para_afd(self, modo=MODO_BITSET, estatisticas=None, limite_estados=None, trabalhadores=None):
+        if modo not in MODOS_DETERMINIZACAO:
+            raise ValueError(f"Modo de determinização '{modo}' desconhecido. Opções: {MODOS_DETERMINIZACAO}.")
+
+        if modo == MODO_CONJUNTOS:
+            return self._converter_afn_para_afd_conjuntos(estatisticas, limite_estados)
+
+        registro.info("Iniciando conversão de AFN para AFD...")
+        if modo == MODO_PARALELO:
+            afd = self._determinizar_paralelo(estatisticas, limite_estados, trabalhadores)
+        else:
+            afd = self._determinizar_bitset(com_fecho_epsilon=False, estatisticas=estatisticas, limite_estados=limite_estados)
+        registro.info("Conversão de AFN para AFD concluída.")
+        return afd
+
+    # Como converter_afn_para_afd, mas com no máximo `orcamento_estados`
+    # superestados em memória e, com `caminho`, checkpoint retomável (ver
+    # DeterminizacaoEmDisco). Devolve o AFD compacto.
+    def converter_afn_para_afd_em_disco(self, caminho=None, orcamento_estados=ORCAMENTO_PADRAO_SUPERESTADOS, estatisticas=None, limite_estados=None, progresso=None):
+        registro.info("Iniciando conversão de AFN para AFD com até %d superestados em memória...", orcamento_estados)
+        afd = DeterminizacaoEmDisco(self, caminho, orcamento_estados, estatisticas=estatisticas).executar(limite_estados, progresso)
+        registro.info("Conversão de AFN para AFD concluída.")
+        return afd
+
+    def converter_afne_para_afd(self, estatisticas=None, limite_estados=None):
+        registro.info("Iniciando conversão direta de AFNe para AFD...")
+        afd = self._determinizar_bitset(com_fecho_epsilon=True, estatisticas=estatisticas, limite_estados=limite_estados)
+        registro.info("Conversão direta de AFNe para AFD concluída.")
+        return afd
+
+    def _determinizar_bitset(self, com_fecho_epsilon, estatisticas=None, limite_estados=None):
+        # Mesma ordem de exploração da versão por conjuntos, para gerar os mesmos nomes.
+        simbolos = list(self.Alfabeto)
+        sucessores = self._mascaras_sucessores()
+        tabelas_brutas = [sucessores[simbolo] for simbolo in simbolos]
+        # Um superestado sem nenhum estado que alcance F é morto: vai direto para o
+        # estado de erro, em vez de virar um superestado próprio a ser explorado.
+        indice = _IndiceSuperestadosMemoria(
+            self._mascara(self._estados_coacessiveis()), self._mascara(self.F), limite_estados
+        )
+
+        if com_fecho_epsilon:
+            # As tabelas com fecho são preenchidas só para os estados do AFNe que
+            # aparecem em algum superestado alcançável.
+            estados, _ = self._indexar_estados()
+            tabelas = [[0] * len(estados) for _ in simbolos]
+            expandido = bytearray(len(estados))
+        else:
+            tabelas = tabelas_brutas
+
+        novas_transicoes = FuncaoTransicaoDFA()
+
+        q0_mascara = self._mascara(self.iniciais)
+        if com_fecho_epsilon:
+            self._tabela_fecho_epsilon(estatisticas)
+            q0_mascara = self._fecho_epsilon_mascara(q0_mascara)
+        indice.registrar_inicial(q0_mascara)
+
+        fila_processamento = indice.fila
+        nomear = indice.nome
+        nome_por_mascara = indice.nome_por_mascara
+        while fila_processamento:
+            super_estado_atual = fila_processamento.popleft()
+            nome_estado_atual = nome_por_mascara[super_estado_atual]
+            estados_nfa = _indices_bits(super_estado_atual)
+
+            if com_fecho_epsilon:
+                for indice_estado in estados_nfa:
+                    if not expandido[indice_estado]:
+                        expandido[indice_estado] = 1
+                        for tabela, tabela_bruta in zip(tabelas, tabelas_brutas):
+                            tabela[indice_estado] = self._fecho_epsilon_mascara(tabela_bruta[indice_estado])
+
+            for simbolo, tabela in zip(simbolos, tabelas):
+                proximo_super_estado = 0
+                for indice_estado in estados_nfa:
+                    proximo_super_estado |= tabela[indice_estado]
+
+                nome_proximo = nome_por_mascara.get(proximo_super_estado)
+                if nome_proximo is None:
+                    nome_proximo = nomear(proximo_super_estado)
+                novas_transicoes.adicionar(nome_estado_atual, simbolo, nome_proximo)
+
+        return indice.automato(self.Alfabeto, simbolos, novas_transicoes, estatisticas)
+
+    def _determinizar_paralelo(self, estatisticas=None, limite_estados=None, trabalhadores=None):
+        # Construção de subconjuntos nível a nível da BFS. Os superestados de um
+        # nível são expandidos em fatias por um ProcessPoolExecutor; os sucessores
+        # voltam na ordem das fatias e são numerados aqui, na mesma ordem em que a
+        # fila de _determinizar_bitset os encontraria, então o AFD sai idêntico.
+        if trabalhadores is None:
+            trabalhadores = os.cpu_count() or 1
+        if trabalhadores < 1:
+            raise ValueError("O número de trabalhadores deve ser pelo menos 1.")
+
+        simbolos = list(self.Alfabeto)
+        sucessores = self._mascaras_sucessores()
+        tabelas = [sucessores[simbolo] for simbolo in simbolos]
+        mascara_vivos = self._mascara(self._estados_coacessiveis())
+        indice = _IndiceSuperestadosMemoria(mascara_vivos, self._mascara(self.F), limite_estados)
+        novas_transicoes = FuncaoTransicaoDFA()
+        indice.registrar_inicial(self._mascara(self.iniciais))
+
+        nomear = indice.nome
+        nome_por_mascara = indice.nome_por_mascara
+        niveis_paralelos = 0
+        executor = None
+        try:
+            while indice.fila:
+                nivel = list(indice.fila)
+                indice.fila.clear()
+                if len(nivel) < MINIMO_NIVEL_PARALELO or trabalhadores == 1:
+                    fatias = [_expandir_superestados(nivel, tabelas, mascara_vivos)]
+                else:
+                    if executor is None:
+                        # Com fork, as tabelas passam aos filhos sem serialização.
+                        executor = ProcessPoolExecutor(
+                            max_workers=trabalhadores, initializer=_iniciar_expansao, initargs=(tabelas, mascara_vivos)
+                        )
+                    # Algumas fatias por trabalhador, para equilibrar níveis desiguais.
+                    tamanho_fatia = -(-len(nivel) // (trabalhadores * 4))
+                    fatias = executor.map(
+                        _expandir_fatia, [nivel[inicio:inicio + tamanho_fatia] for inicio in range(0, len(nivel), tamanho_fatia)]
+                    )
+                    niveis_paralelos += 1
+
+                superestados_nivel = iter(nivel)
+                for mascaras, linhas in fatias:
+                    for linha in linhas:
+                        nome_estado_atual = nome_por_mascara[next(superestados_nivel)]
+                        for simbolo, posicao in zip(simbolos, linha):
+                            mascara = mascaras[posicao]
+                            nome_proximo = nome_por_mascara.get(mascara)
+                            if nome_proximo is None:
+                                nome_proximo = nomear(mascara)
+                            novas_transicoes.adicionar(nome_estado_atual, simbolo, nome_proximo)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        _contar(estatisticas, "niveis_paralelos", niveis_paralelos)
+        return indice.automato(self.Alfabeto, simbolos, novas_transicoes, estatisticas)
+
+    def reverter(self):
+        # Inverte todas as arestas, inclusive as ε; os finais viram os iniciais e
+        # os iniciais viram os finais.
+        transicoes = FuncaoTransicaoNFA()
+        for origem, transicoes_origem in self.Transicoes.mapa.items():
+            for simbolo, destinos in transicoes_origem.items():
+                for destino in destinos:
+                    transicoes.adicionar(destino, simbolo, origem)
+
+        return AutomatoFinitoNaoDeterministico(
+            Q=self.Q,
+            Alfabeto=self.Alfabeto,
+            Transicoes=transicoes,
+            q0=min(self.F) if self.F else None,
+            F=self.iniciais,
+            simbolo_epsilon=self.simbolo_epsilon,
+            validar=False,
+            iniciais=self.F
+        )
+
+    def minimizar_brzozowski(self, estatisticas=None, limite_estados=None):
+        return _minimizar_brzozowski(self, estatisticas, limite_estados)
+
+    def _contar_superestados(self, limite):
+        # Construção de subconjuntos interrompida ao chegar a `limite` superestados:
+        # uma estimativa barata do tamanho do AFD.
+        com_fecho_epsilon = self.possui_transicoes_epsilon()
+        sucessores = self._mascaras_sucessores()
+        tabelas = [sucessores[simbolo] for simbolo in self.Alfabeto]
+
+        inicial = self._mascara(self.iniciais)
+        if com_fecho_epsilon:
+            inicial = self._fecho_epsilon_mascara(inicial)
+        vistos = {inicial}
+        fila_processamento = [inicial]
+
+        for mascara in fila_processamento:
+            estados_nfa = _indices_bits(mascara)
+            for tabela in tabelas:
+                proximo = 0
+                for indice in estados_nfa:
+                    proximo |= tabela[indice]
+                if com_fecho_epsilon:
+                    proximo = self._fecho_epsilon_mascara(proximo)
+                if proximo not in vistos:
+                    vistos.add(proximo)
+                    if len(vistos) >= limite:
+                        return len(vistos)
+                    fila_processamento.append(proximo)
+
+        return len(vistos)
+
+    def escolher_estrategia(self, limite=None):
+        # Brzozowski custa det(rev(A)) mais o AFD mínimo, e a segunda determinização
+        # nunca passa do AFD de det(A); compensa quando o reverso é o lado "quase
+        # determinístico". Com ε, o caminho por subconjuntos ainda paga a remoção de
+        # ε em todos os estados, contada como um superestado por estado. Na dúvida
+        # (as duas estimativas estouram), fica a construção de subconjuntos.
+        if limite is None:
+            limite = 4 * len(self.Q) + 16
+        direto = self._contar_superestados(limite)
+        if self.possui_transicoes_epsilon():
+            direto += len(self.Q)
+        # O reverso só precisa ser explorado até empatar com o lado direto.
+        reverso = self.reverter()._contar_superestados(min(limite, direto))
+        registro.debug("Estimativa de superestados: direto %d, reverso %d (limite %d).", direto, reverso, limite)
+        if reverso < direto:
+            return ESTRATEGIA_BRZOZOWSKI
+        return ESTRATEGIA_SUBCONJUNTOS
+
+    def _converter_afn_para_afd_conjuntos(self, estatisticas=None, limite_estados=None):
+        registro.info("Iniciando conversão de AFN para AFD...")
 
         novos_estados_q = set()
         novos_estados_finais = set()
@@ -158,10 +927,10 @@ class AutomatoFinitoNaoDeterministico:
         mapa_estados = {}
         contador_estados = {'count': 0} 
         
-        fila_processamento = []
+        fila_processamento = deque()
         estados_processados = set()
 
-        q0_conjunto = {self.q0}
+        q0_conjunto = set(self.iniciais)
         q0_fs = frozenset(q0_conjunto)
         
         q0_nome_afd = self._gerar_nome_estado(q0_fs, mapa_estados, contador_estados)
@@ -173,11 +942,14 @@ class AutomatoFinitoNaoDeterministico:
         if not q0_conjunto.isdisjoint(self.F):
             novos_estados_finais.add(q0_nome_afd)
             
+        vivos = self._estados_coacessiveis()
         nome_estado_erro = "Q_ERRO"
+        if q0_fs.isdisjoint(vivos):
+            nome_estado_erro = q0_nome_afd
         precisa_estado_erro = False
 
         while fila_processamento:
-            super_estado_atual_fs = fila_processamento.pop(0)
+            super_estado_atual_fs = fila_processamento.popleft()
             nome_estado_atual = mapa_estados[super_estado_atual_fs]
             
             for simbolo in self.Alfabeto:
@@ -190,10 +962,13 @@ class AutomatoFinitoNaoDeterministico:
                 
                 nome_destino = ""
 
-                if not proximo_super_estado_fs:
+                if proximo_super_estado_fs.isdisjoint(vivos):
                     nome_destino = nome_estado_erro
                     precisa_estado_erro = True
                 else:
+                    if (limite_estados is not None and proximo_super_estado_fs not in mapa_estados
+                            and len(mapa_estados) >= limite_estados):
+                        raise LimiteEstadosExcedido(limite_estados)
                     nome_destino = self._gerar_nome_estado(
                         proximo_super_estado_fs, 
                         mapa_estados, 
@@ -216,7 +991,8 @@ class AutomatoFinitoNaoDeterministico:
             for simbolo in self.Alfabeto:
                 novas_transicoes.adicionar(nome_estado_erro, simbolo, nome_estado_erro)
         
-        print("Conversão de AFN para AFD concluída.")
+        _contar(estatisticas, "superestados_criados", len(mapa_estados))
+        registro.info("Conversão de AFN para AFD concluída.")
         
         return AutomatoFinitoDeterministico(
             Q=novos_estados_q,
@@ -246,13 +1022,25 @@ class FuncaoTransicaoDFA:
         return "\n".join(linhas)
     
 class AutomatoFinitoDeterministico:
-    def __init__(self, Q, Alfabeto, Transicoes, q0, F):
+    # `classes_simbolos` ({símbolo: representante}) estende o alfabeto no
+    # reconhecimento: δ só tem os representantes, e cada símbolo da classe usa a
+    # transição do seu representante.
+    # A forma compacta usada no reconhecimento é montada uma vez e supõe o
+    # autômato congelado daí em diante; depois de editar Q, F, q0, Transicoes ou as
+    # classes, chame invalidar_cache().
+    def __init__(self, Q, Alfabeto, Transicoes, q0, F, validar=True, classes_simbolos=None):
         self.Q = set(Q)
         self.Alfabeto = set(Alfabeto)
         self.Transicoes = Transicoes
         self.q0 = q0
         self.F = set(F)
-        self._validar()
+        self.classes_simbolos = dict(classes_simbolos or {})
+        self.invalidar_cache()
+        if validar:
+            self._validar()
+
+    def invalidar_cache(self):
+        self._compacto = None
 
     def _validar(self):
         if not self.Q:
@@ -261,6 +1049,9 @@ class AutomatoFinitoDeterministico:
             raise ValueError(f"q0 (estado inicial '{self.q0}') não pertence a Q.")
         if not self.F.issubset(self.Q):
             raise ValueError(f"F (estados finais {self.F}) não é um subconjunto de Q.")
+        for simbolo, representante in self.classes_simbolos.items():
+            if representante not in self.Alfabeto:
+                raise ValueError(f"Representante '{representante}' da classe de '{simbolo}' não pertence a Alfabeto.")
         
         for estado in self.Q:
             if estado not in self.Transicoes.mapa:
@@ -275,31 +1066,243 @@ class AutomatoFinitoDeterministico:
                     raise ValueError(f"Estado de destino '{destino}' (de δ({estado},{simbolo})) não pertence a Q.")
                 
 
+    def compactar(self):
+        if self._compacto is None:
+            self._compacto = AutomatoFinitoDeterministicoCompacto.de_afd(self)
+        return self._compacto
+
     def processar_cadeia(self, cadeia):
-        estado_atual = self.q0
-        for simbolo in cadeia:
-            if simbolo not in self.Alfabeto:
-                print(f"Símbolo '{simbolo}' não pertence ao alfabeto {self.Alfabeto}.")
-                return False
-            
-            estado_atual = self.Transicoes.obter(estado_atual, simbolo)
-            
-            if estado_atual is None:
-                return False
-        
-        return estado_atual in self.F
+        return self.compactar().processar_cadeia(cadeia)
+
+    def processar_lote(self, cadeias):
+        return self.compactar().processar_lote(cadeias)
+
+    def compilar(self, caminho_cache=None):
+        return self.compactar().compilar(caminho_cache)
+
+    def salvar_binario(self, caminho_arquivo):
+        self.compactar().salvar_binario(caminho_arquivo)
+
+    def salvar_texto(self, caminho_arquivo):
+        # No formato lido por carregar_automato. O formato de texto não tem classes
+        # de símbolos, então cada membro ganha as transições do seu representante.
+        simbolos = sorted(self.Alfabeto | set(self.classes_simbolos))
+        linhas = ["[ESTADOS]", *sorted(self.Q), "[ALFABETO]", *simbolos]
+        linhas += ["[INICIAL]", self.q0, "[FINAIS]", *sorted(self.F), "[TRANSICOES]"]
+        for origem in sorted(self.Q):
+            transicoes = self.Transicoes.mapa[origem]
+            for simbolo in simbolos:
+                linhas.append(f"{origem} {simbolo} {transicoes[self.classes_simbolos.get(simbolo, simbolo)]}")
+        with open(caminho_arquivo, "w", encoding="utf-8") as arquivo:
+            arquivo.write("\n".join(linhas) + "\n")
+
+    def classes_de_simbolos(self):
+        return self.compactar().classes_de_simbolos()
+
+    def comprimir_alfabeto(self, classes):
+        return self.compactar().comprimir_alfabeto(classes).para_afd()
 
     def __str__(self):
+        membros = {}
+        for simbolo, representante in sorted(self.classes_simbolos.items()):
+            if simbolo != representante:
+                membros.setdefault(representante, []).append(simbolo)
         return (
             f"M = (Q, Σ, δ, q0, F)\n"
             f"Q = {self.Q}\n"
             f"Σ = {self.Alfabeto}\n"
-            f"q0 = {self.q0}\n"
+            + (f"Classes de Σ = {membros}\n" if membros else "")
+            + f"q0 = {self.q0}\n"
             f"F = {self.F}\n"
             f"δ = \n{self.Transicoes}"
         )
 
-    def _remover_estados_inalcancaveis(self):
+    def reverter(self):
+        transicoes = FuncaoTransicaoNFA()
+        for origem, transicoes_origem in self.Transicoes.mapa.items():
+            for simbolo, destino in transicoes_origem.items():
+                transicoes.adicionar(destino, simbolo, origem)
+
+        return AutomatoFinitoNaoDeterministico(
+            Q=self.Q,
+            Alfabeto=self.Alfabeto,
+            Transicoes=transicoes,
+            q0=min(self.F) if self.F else None,
+            F={self.q0},
+            validar=False,
+            iniciais=self.F
+        )
+
+    def intersecao(self, outro, minimizar=False):
+        return _operacao_produto(self, outro, lambda final_a, final_b: final_a and final_b, minimizar)
+
+    def uniao(self, outro, minimizar=False):
+        return _operacao_produto(self, outro, lambda final_a, final_b: final_a or final_b, minimizar)
+
+    def diferenca(self, outro, minimizar=False):
+        return _operacao_produto(self, outro, lambda final_a, final_b: final_a and not final_b, minimizar)
+
+    def complemento(self):
+        transicoes = FuncaoTransicaoDFA()
+        transicoes.mapa = {origem: dict(transicoes_origem) for origem, transicoes_origem in self.Transicoes.mapa.items()}
+        return AutomatoFinitoDeterministico(
+            self.Q, self.Alfabeto, transicoes, self.q0, self.Q - self.F, validar=False, classes_simbolos=self.classes_simbolos
+        )
+
+    # As consultas abaixo param no primeiro par que decide a resposta e devolvem
+    # a menor palavra que a comprova.
+    def e_vazio(self):
+        return _explorar_produto(self, self, lambda final_a, _: final_a, parar_em_aceitacao=True) is None
+
+    def intersecao_vazia(self, outro):
+        testemunha = _explorar_produto(self, outro, lambda final_a, final_b: final_a and final_b, parar_em_aceitacao=True)
+        return testemunha is None, testemunha
+
+    def esta_contido_em(self, outro):
+        contraexemplo = _explorar_produto(self, outro, lambda final_a, final_b: final_a and not final_b, parar_em_aceitacao=True)
+        return contraexemplo is None, contraexemplo
+
+    # Contagem, enumeração e amostragem das cadeias aceitas de um comprimento
+    # exato. Os símbolos de cada classe contam separadamente, como no
+    # reconhecimento. destinos[i][c] é o índice de δ(estado_i, simbolos[c]), com
+    # os estados na ordem ordenada dos nomes e o alfabeto completo ordenado.
+    def _grafo_contagem(self):
+        estados = sorted(self.Q)
+        indice = {estado: posicao for posicao, estado in enumerate(estados)}
+        simbolos = sorted(_alfabeto_sem_epsilon(self))
+        mapa = self.Transicoes.mapa
+        classes = self.classes_simbolos
+        destinos = [[indice[mapa[estado][classes.get(simbolo, simbolo)]] for simbolo in simbolos] for estado in estados]
+        finais = [1 if estado in self.F else 0 for estado in estados]
+        return indice[self.q0], simbolos, destinos, finais
+
+    @staticmethod
+    def _completamentos(destinos, finais, comprimento, contar=True):
+        # tabela[r][i]: quantas cadeias de comprimento r levam o estado i a F (ou,
+        # com contar=False, só se existe alguma).
+        tabela = [finais]
+        for _ in range(comprimento):
+            anterior = tabela[-1]
+            if contar:
+                tabela.append([sum(anterior[j] for j in linha) for linha in destinos])
+            else:
+                tabela.append(bytearray(1 if any(anterior[j] for j in linha) else 0 for linha in destinos))
+        return tabela
+
+    def contar_aceitas(self, comprimento):
+        # Com NumPy e `comprimento` grande perto do número de estados, eleva a
+        # matriz densa de contagens (M[i][j] = quantos símbolos levam i a j) por
+        # quadrados sucessivos: int64 enquanto |Σ|^n cabe, senão dtype=object, com
+        # inteiros exatos do Python. Nos outros casos, programação dinâmica de trás
+        # para frente, O(n·|Q|·|Σ|).
+        if comprimento < 0:
+            raise ValueError("O comprimento deve ser não negativo.")
+        inicial, simbolos, destinos, finais = self._grafo_contagem()
+        n = len(destinos)
+
+        if np is not None and comprimento:
+            cabe_int64 = comprimento * (len(simbolos) - 1).bit_length() < 63
+            custo_potencia = n * n * comprimento.bit_length() * (1 if cabe_int64 else 50)
+            if custo_potencia < 25 * comprimento * len(simbolos):
+                matriz = np.zeros((n, n), dtype=np.int64 if cabe_int64 else object)
+                for origem, linha in enumerate(destinos):
+                    for destino in linha:
+                        matriz[origem, destino] += 1
+                potencia = np.linalg.matrix_power(matriz, comprimento)
+                return int(potencia[inicial, np.flatnonzero(finais)].sum())
+
+        contagem = finais
+        for _ in range(comprimento):
+            contagem = [sum(contagem[j] for j in linha) for linha in destinos]
+        return contagem[inicial]
+
+    def contagens_por_comprimento(self, comprimento_maximo):
+        # Lista com o número de cadeias aceitas de cada comprimento 0..comprimento_maximo.
+        if comprimento_maximo < 0:
+            raise ValueError("O comprimento deve ser não negativo.")
+        inicial, _, destinos, finais = self._grafo_contagem()
+        indices_finais = [indice for indice, final in enumerate(finais) if final]
+        vetor = [0] * len(destinos)
+        vetor[inicial] = 1
+        contagens = []
+        for comprimento in range(comprimento_maximo + 1):
+            contagens.append(sum(vetor[indice] for indice in indices_finais))
+            if comprimento == comprimento_maximo:
+                break
+            proximo = [0] * len(destinos)
+            for origem, quantidade in enumerate(vetor):
+                if quantidade:
+                    for destino in destinos[origem]:
+                        proximo[destino] += quantidade
+            vetor = proximo
+        return contagens
+
+    def enumerar_aceitas(self, comprimento):
+        # Gerador preguiçoso, em ordem lexicográfica. A tabela de quais estados
+        # ainda chegam a F no número exato de passos poda todo ramo sem saída, então
+        # cada cadeia custa O(comprimento·|Σ|).
+        if comprimento < 0:
+            raise ValueError("O comprimento deve ser não negativo.")
+        inicial, simbolos, destinos, finais = self._grafo_contagem()
+        alcanca = self._completamentos(destinos, finais, comprimento, contar=False)
+        if not alcanca[comprimento][inicial]:
+            return
+
+        prefixo = []
+        caminho = [inicial]
+        proximos = [0]
+        while proximos:
+            profundidade = len(prefixo)
+            if profundidade == comprimento:
+                yield "".join(prefixo)
+            else:
+                estado = caminho[-1]
+                vivos = alcanca[comprimento - profundidade - 1]
+                linha = destinos[estado]
+                posicao = proximos[-1]
+                while posicao < len(simbolos) and not vivos[linha[posicao]]:
+                    posicao += 1
+                if posicao < len(simbolos):
+                    proximos[-1] = posicao + 1
+                    prefixo.append(simbolos[posicao])
+                    caminho.append(linha[posicao])
+                    proximos.append(0)
+                    continue
+
+            proximos.pop()
+            caminho.pop()
+            if prefixo:
+                prefixo.pop()
+
+    def amostrar_aceitas(self, comprimento, quantidade=1, gerador=None):
+        # Amostra uniforme (com reposição) entre as cadeias aceitas de comprimento
+        # exato: a cada passo, cada símbolo pesa o número de completamentos aceitos
+        # a partir do seu destino. Depois da tabela, cada cadeia custa O(comprimento·|Σ|).
+        if comprimento < 0:
+            raise ValueError("O comprimento deve ser não negativo.")
+        gerador = gerador or random.Random()
+        inicial, simbolos, destinos, finais = self._grafo_contagem()
+        completamentos = self._completamentos(destinos, finais, comprimento)
+        if not completamentos[comprimento][inicial]:
+            raise ValueError(f"Nenhuma cadeia de comprimento {comprimento} é aceita.")
+
+        amostras = []
+        for _ in range(quantidade):
+            estado = inicial
+            cadeia = []
+            for restantes in range(comprimento, 0, -1):
+                sorteio = gerador.randrange(completamentos[restantes][estado])
+                seguintes = completamentos[restantes - 1]
+                for simbolo, destino in zip(simbolos, destinos[estado]):
+                    if sorteio < seguintes[destino]:
+                        break
+                    sorteio -= seguintes[destino]
+                cadeia.append(simbolo)
+                estado = destino
+            amostras.append("".join(cadeia))
+        return amostras
+
+    def _remover_estados_inalcancaveis(self, estatisticas=None):
         estados_alcancados = {self.q0}
         fila_processamento = [self.q0]
         
@@ -314,10 +1317,12 @@ class AutomatoFinitoDeterministico:
                     fila_processamento.append(estado_destino)
         
         if estados_alcancados == self.Q:
-            print("... (Minimização) Todos os estados são alcançáveis.")
+            registro.info("... (Minimização) Todos os estados são alcançáveis.")
             return self
 
-        print(f"... (Minimização) Removendo estados inalcançáveis: {self.Q - estados_alcancados}")
+        _contar(estatisticas, "estados_inalcancaveis_removidos", len(self.Q) - len(estados_alcancados))
+        if registro.isEnabledFor(logging.DEBUG):
+            registro.debug("... (Minimização) Removendo estados inalcançáveis: %s", self.Q - estados_alcancados)
         
         novo_Q = estados_alcancados
         novo_F = self.F.intersection(estados_alcancados)
@@ -334,20 +1339,13 @@ class AutomatoFinitoDeterministico:
             Alfabeto=self.Alfabeto,
             Transicoes=novas_Transicoes,
             q0=novo_q0,
-            F=novo_F
+            F=novo_F,
+            classes_simbolos=self.classes_simbolos
         )
 
-    def minimizar(self):
-        print("Iniciando minimização do AFD...")
-        
-        afd = self._remover_estados_inalcancaveis()
-        
-        if len(afd.Q) <= 1:
-            print(">>> AFD já é trivialmente mínimo.")
-            return afd
-
+    def _grupos_equivalentes_tabela(self, estatisticas=None):
         marked_pairs = {}
-        states_list = sorted(list(afd.Q)) 
+        states_list = sorted(list(self.Q)) 
         pares_a_processar = []
         
         for i in range(len(states_list)):
@@ -357,8 +1355,8 @@ class AutomatoFinitoDeterministico:
                 par = (p, q)
                 pares_a_processar.append(par)
                 
-                e_final_p = p in afd.F
-                e_final_q = q in afd.F
+                e_final_p = p in self.F
+                e_final_q = q in self.F
                 
                 if e_final_p != e_final_q:
                     marked_pairs[par] = True
@@ -366,16 +1364,18 @@ class AutomatoFinitoDeterministico:
                     marked_pairs[par] = False
 
         houve_marcacao = True
+        rodadas = 0
         while houve_marcacao:
             houve_marcacao = False
+            rodadas += 1
             
             for (p, q) in pares_a_processar:
                 if marked_pairs[(p, q)]:
                     continue
                 
-                for simbolo in afd.Alfabeto:
-                    p_destino = afd.Transicoes.obter(p, simbolo)
-                    q_destino = afd.Transicoes.obter(q, simbolo)
+                for simbolo in self.Alfabeto:
+                    p_destino = self.Transicoes.obter(p, simbolo)
+                    q_destino = self.Transicoes.obter(q, simbolo)
                     
                     if p_destino == q_destino:
                         continue
@@ -414,11 +1414,35 @@ class AutomatoFinitoDeterministico:
             
             grupos_equivalentes.append(novo_grupo)
 
-        print(f"Novos grupos de estados equivalentes: {grupos_equivalentes}")
+        _contar(estatisticas, "rodadas_refinamento", rodadas)
+        _contar(estatisticas, "pares_distinguidos", sum(marked_pairs.values()))
+        return grupos_equivalentes
+
+    def minimizar(self, motor=MOTOR_HOPCROFT, estatisticas=None):
+        if motor not in MOTORES_MINIMIZACAO:
+            raise ValueError(f"Motor de minimização '{motor}' desconhecido. Opções: {MOTORES_MINIMIZACAO}.")
+
+        if motor == MOTOR_HOPCROFT:
+            return self.compactar().minimizar(estatisticas).para_afd()
+
+        if motor == MOTOR_BRZOZOWSKI:
+            return _minimizar_brzozowski(self, estatisticas)
+
+        registro.info("Iniciando minimização do AFD...")
+        
+        afd = self._remover_estados_inalcancaveis(estatisticas)
+        
+        if len(afd.Q) <= 1:
+            registro.info(">>> AFD já é trivialmente mínimo.")
+            return afd
+
+        grupos_equivalentes = afd._grupos_equivalentes_tabela(estatisticas)
+
+        registro.debug("Novos grupos de estados equivalentes: %s", grupos_equivalentes)
 
         if len(grupos_equivalentes) == len(afd.Q):
-            print(">>> O AFD já é mínimo. Nenhum estado foi agrupado.")
-            print("Minimização concluída. Nenhum estado foi alterado.")
+            registro.info(">>> O AFD já é mínimo. Nenhum estado foi agrupado.")
+            registro.info("Minimização concluída. Nenhum estado foi alterado.")
             return afd
 
         mapa_novo_estado = {}
@@ -458,170 +1482,2867 @@ class AutomatoFinitoDeterministico:
                 nome_destino = mapa_novo_estado[destino_antigo]
                 novas_Transicoes_min.adicionar(nome_origem, simbolo, nome_destino)
 
-        print(f"Minimização concluída. Estados reduzidos de {len(self.Q)} para {len(novo_Q)}.")
+        registro.info("Minimização concluída. Estados reduzidos de %d para %d.", len(self.Q), len(novo_Q))
         
         return AutomatoFinitoDeterministico(
             Q=novo_Q,
             Alfabeto=afd.Alfabeto,
             Transicoes=novas_Transicoes_min,
             q0=novo_q0,
-            F=novo_F
+            F=novo_F,
+            classes_simbolos=afd.classes_simbolos
         )
-    
 
-def carregar_automato(caminho_arquivo):
-    estados = set()
-    alfabeto = set()
-    estado_inicial = None
-    estados_finais = set()
-    
-    transicoes_nfa = FuncaoTransicaoNFA()
-    e_nao_deterministico = False
-    tem_epsilon = False
-    
-    mapa_checa_determinismo = {}
+    def minimizador_incremental(self, estatisticas=None):
+        return MinimizadorIncremental(self, estatisticas)
 
-    modo_atual = None
-    
-    print(f"Lendo arquivo de autômato de: {caminho_arquivo}")
-    
-    try:
-        with open(caminho_arquivo, 'r', encoding='utf-8') as f:
-            for linha in f:
-                linha = linha.strip()
-                
-                if not linha or linha.startswith('#'):
-                    continue
-                
-                if linha.startswith('[') and linha.endswith(']'):
-                    modo_atual = linha
-                    continue
-                
-                if modo_atual == '[ESTADOS]':
-                    estados.add(linha)
-                
-                elif modo_atual == '[ALFABETO]':
-                    alfabeto.add(linha)
-                    
-                elif modo_atual == '[INICIAL]':
-                    if estado_inicial:
-                        raise ValueError("Erro: Múltiplos estados iniciais definidos.")
-                    estado_inicial = linha
-                    
-                elif modo_atual == '[FINAIS]':
-                    estados_finais.add(linha)
-                    
-                elif modo_atual == '[TRANSICOES]':
-                    partes = linha.split()
-                    if len(partes) != 3:
-                        raise ValueError(f"Formato de transição inválido: '{linha}'")
-                    
-                    origem, simbolo, destino = partes
-                    
-                    transicoes_nfa.adicionar(origem, simbolo, destino)
-                    
-                    if simbolo == SIMBOLO_EPSILON:
-                        tem_epsilon = True
-                    else:
-                        alfabeto.add(simbolo) 
-                    
-                    chave_transicao = (origem, simbolo)
-                    if chave_transicao in mapa_checa_determinismo:
-                        e_nao_deterministico = True
-                    mapa_checa_determinismo[chave_transicao] = destino
 
-    except FileNotFoundError:
-        print(f"Erro: Arquivo não encontrado em '{caminho_arquivo}'")
-        return None
-    except Exception as e:
-        print(f"Erro ao processar o arquivo: {e}")
+class MinimizadorIncremental:
+    # Mantém a partição de Q em classes de equivalência e o índice inverso de δ
+    # enquanto o AFD é editado, para que cada edição só mexa nos blocos afetados:
+    #   1. os estados tocados saem dos seus blocos e a partição é refinada a partir
+    #      deles (Hopcroft, com os blocos novos como divisores);
+    #   2. os blocos cuja assinatura (final?, blocos dos sucessores) mudou são
+    #      consultados num registro de assinaturas: assinatura repetida numa partição
+    #      estável é fusão certa, e a fusão muda a assinatura dos predecessores;
+    #   3. pares de predecessores dos dois lados de uma fusão são testados por
+    #      Hopcroft-Karp, o que pega equivalências que dependem de um ciclo.
+    # Uma fusão nova sempre leva, por algum caminho, a um par com um estado tocado;
+    # se um estado tocado alcança um estado tocado, esse par pode depender de um
+    # ciclo que passa por ele mesmo e o registro não o encontra. Nesse caso o
+    # quociente inteiro é refinado de novo, com custo do AFD mínimo e não de Q.
+    # Custo por edição, com k símbolos e m blocos no quociente: a busca de
+    # _alcanca_tocado é O(k·m) no pior caso (ela só para cedo quando encontra um
+    # estado tocado); cada fusão em _fundir percorre os predecessores dos dois
+    # blocos, e o bloco que recebe pode ser o do estado de erro, com predecessores
+    # em quase todo Q; o reagrupamento é O(k·m·log m). Só o refinamento do passo 1
+    # é proporcional aos blocos efetivamente afetados.
+    # As classes de símbolos do AFD são expandidas, já que uma edição pode separar
+    # um membro do seu representante.
+    def __init__(self, afd, estatisticas=None):
+        self.estatisticas = estatisticas
+        classes = afd.classes_simbolos
+        self.simbolos = sorted(afd.Alfabeto | set(classes))
+        self.q0 = afd.q0
+        self.finais = set(afd.F)
+        self.delta = {}
+        self.inversas = {simbolo: {} for simbolo in self.simbolos}
+        for estado in afd.Q:
+            transicoes = afd.Transicoes.mapa[estado]
+            self.delta[estado] = {simbolo: transicoes[classes.get(simbolo, simbolo)] for simbolo in self.simbolos}
+            for simbolo, destino in self.delta[estado].items():
+                self.inversas[simbolo].setdefault(destino, set()).add(estado)
+
+        # Destino das transições removidas e dos estados novos; fica de fora de
+        # automato() enquanto ninguém chega nele.
+        self.estado_erro = "Q_ERRO"
+        sufixo = 0
+        while self.estado_erro in self.delta:
+            sufixo += 1
+            self.estado_erro = f"Q_ERRO_{sufixo}"
+        self._criar_estado(self.estado_erro, False, self.estado_erro)
+
+        self.blocos = {}
+        self.bloco_de = {}
+        self.assinatura_bloco = {}
+        self.bloco_da_assinatura = {}
+        self._proximo_bloco = 0
+        for estado in self.delta:
+            self._novo_bloco({estado})
+        self._reagrupar(self.delta)
+
+    def _novo_bloco(self, estados):
+        bloco = self._proximo_bloco
+        self._proximo_bloco += 1
+        self.blocos[bloco] = estados
+        for estado in estados:
+            self.bloco_de[estado] = bloco
+        return bloco
+
+    def _remover_bloco(self, bloco):
+        assinatura = self.assinatura_bloco.pop(bloco, None)
+        if assinatura is not None and self.bloco_da_assinatura.get(assinatura) == bloco:
+            del self.bloco_da_assinatura[assinatura]
+        return self.blocos.pop(bloco)
+
+    def _assinatura(self, bloco):
+        estado = next(iter(self.blocos[bloco]))
+        transicoes = self.delta[estado]
+        return (estado in self.finais, tuple(self.bloco_de[transicoes[simbolo]] for simbolo in self.simbolos))
+
+    def _registrar(self, bloco):
+        # Devolve um bloco equivalente com a mesma assinatura, se houver. Entradas
+        # do registro podem estar velhas (o bloco sumiu ou a assinatura mudou e ele
+        # ainda vai ser registrado de novo), então a colisão é conferida.
+        antiga = self.assinatura_bloco.get(bloco)
+        if antiga is not None and self.bloco_da_assinatura.get(antiga) == bloco:
+            del self.bloco_da_assinatura[antiga]
+        assinatura = self._assinatura(bloco)
+        self.assinatura_bloco[bloco] = assinatura
+        outro = self.bloco_da_assinatura.get(assinatura)
+        if outro is not None and outro != bloco and outro in self.blocos and self._assinatura(outro) == assinatura:
+            return outro
+        self.bloco_da_assinatura[assinatura] = bloco
         return None
 
-    if not estado_inicial:
-        raise ValueError("Erro: Nenhum estado inicial definido.")
-    estados.update(estados_finais)
-    estados.add(estado_inicial)
-    
-    if tem_epsilon or e_nao_deterministico:
-        print(">>> Autômato detectado como AFN ou AFNe.")
-        return AutomatoFinitoNaoDeterministico(
-            Q=estados,
+    def _refinar(self, divisores, alterados):
+        # Os blocos fora de `divisores` já são estáveis em relação à partição, então
+        # basta dividir a partir dos blocos novos, como em _grupos_equivalentes_hopcroft.
+        # Os estados que mudaram de bloco e os seus predecessores vão para `alterados`.
+        lista_divisores = [(bloco, simbolo) for bloco in divisores for simbolo in self.simbolos]
+        divisoes = 0
+        while lista_divisores:
+            indice_divisor, simbolo_divisor = lista_divisores.pop()
+
+            inversas = self.inversas[simbolo_divisor]
+            atingidos_por_bloco = {}
+            for estado in self.blocos[indice_divisor]:
+                for predecessor in inversas.get(estado, ()):
+                    atingidos_por_bloco.setdefault(self.bloco_de[predecessor], set()).add(predecessor)
+
+            for indice_bloco, atingidos in atingidos_por_bloco.items():
+                alterados.update(atingidos)
+                bloco = self.blocos[indice_bloco]
+                if len(atingidos) == len(bloco):
+                    continue
+
+                if len(atingidos) <= len(bloco) - len(atingidos):
+                    bloco.difference_update(atingidos)
+                    novo_bloco = atingidos
+                else:
+                    novo_bloco = bloco - atingidos
+                    bloco.intersection_update(atingidos)
+
+                indice_novo = self._novo_bloco(novo_bloco)
+                alterados.update(novo_bloco)
+                divisoes += 1
+                for simbolo in self.simbolos:
+                    lista_divisores.append((indice_novo, simbolo))
+
+        _contar(self.estatisticas, "divisoes_refinamento", divisoes)
+
+    def _testar_equivalencia(self, bloco_a, bloco_b):
+        # Hopcroft-Karp sobre o quociente atual: devolve os grupos de blocos que
+        # são equivalentes se (bloco_a, bloco_b) for, ou None.
+        _contar(self.estatisticas, "testes_equivalencia")
+        pais = {}
+
+        def encontrar(bloco):
+            raiz = bloco
+            while raiz in pais:
+                raiz = pais[raiz]
+            while bloco != raiz:
+                pais[bloco], bloco = raiz, pais[bloco]
+            return raiz
+
+        pilha = [(bloco_a, bloco_b)]
+        while pilha:
+            x, y = pilha.pop()
+            raiz_x, raiz_y = encontrar(x), encontrar(y)
+            if raiz_x == raiz_y:
+                continue
+            estado_x = next(iter(self.blocos[x]))
+            estado_y = next(iter(self.blocos[y]))
+            if (estado_x in self.finais) != (estado_y in self.finais):
+                return None
+            pais[raiz_x] = raiz_y
+            transicoes_x, transicoes_y = self.delta[estado_x], self.delta[estado_y]
+            for simbolo in self.simbolos:
+                pilha.append((self.bloco_de[transicoes_x[simbolo]], self.bloco_de[transicoes_y[simbolo]]))
+
+        grupos = {}
+        for bloco in list(pais):
+            raiz = encontrar(bloco)
+            grupos.setdefault(raiz, [raiz]).append(bloco)
+        return list(grupos.values())
+
+    def _fundir(self, grupos, fila, pares):
+        # Cada grupo vai para o seu maior bloco. Os blocos dos predecessores dos
+        # estados movidos voltam ao registro, e cada predecessor de um estado movido
+        # forma um par candidato com os predecessores (pelo mesmo símbolo) do bloco
+        # que o recebeu.
+        for grupo in grupos:
+            destino = max(grupo, key=lambda bloco: len(self.blocos[bloco]))
+            estados_destino = self.blocos[destino]
+            for bloco in grupo:
+                if bloco == destino:
+                    continue
+                movidos = self._remover_bloco(bloco)
+                _contar(self.estatisticas, "fusoes_incrementais")
+                for simbolo in self.simbolos:
+                    inversas = self.inversas[simbolo]
+                    predecessores_movidos = {
+                        self.bloco_de[predecessor]: predecessor for estado in movidos for predecessor in inversas.get(estado, ())
+                    }
+                    if not predecessores_movidos:
+                        continue
+                    fila.extend(predecessores_movidos.values())
+                    predecessores_destino = {
+                        self.bloco_de[predecessor]: predecessor for estado in estados_destino for predecessor in inversas.get(estado, ())
+                    }
+                    for bloco_movido, movido in predecessores_movidos.items():
+                        final = movido in self.finais
+                        for bloco_destino, predecessor in predecessores_destino.items():
+                            if bloco_destino != bloco_movido and (predecessor in self.finais) == final:
+                                pares.append((movido, predecessor))
+                for estado in movidos:
+                    self.bloco_de[estado] = destino
+                estados_destino.update(movidos)
+            fila.append(next(iter(estados_destino)))
+
+    def _propagar(self, fila):
+        # `fila` tem estados cujos blocos precisam voltar ao registro.
+        fila = deque(fila)
+        pares = []
+        while fila or pares:
+            if fila:
+                bloco = self.bloco_de[fila.popleft()]
+                outro = self._registrar(bloco)
+                if outro is not None:
+                    self._fundir([[bloco, outro]], fila, pares)
+                continue
+
+            estado_a, estado_b = pares.pop()
+            bloco_a, bloco_b = self.bloco_de[estado_a], self.bloco_de[estado_b]
+            if bloco_a != bloco_b:
+                grupos = self._testar_equivalencia(bloco_a, bloco_b)
+                if grupos:
+                    self._fundir(grupos, fila, pares)
+
+    def _alcanca_tocado(self, tocados):
+        blocos_tocados = {self.bloco_de[estado] for estado in tocados}
+        visitados = set()
+        pilha = list(blocos_tocados)
+        while pilha:
+            transicoes = self.delta[next(iter(self.blocos[pilha.pop()]))]
+            for destino in transicoes.values():
+                bloco = self.bloco_de[destino]
+                if bloco in blocos_tocados:
+                    return True
+                if bloco not in visitados:
+                    visitados.add(bloco)
+                    pilha.append(bloco)
+        return False
+
+    def _reagrupar(self, alterados):
+        # Minimiza o quociente atual (um estado por bloco) com o Hopcroft do AFD
+        # compacto e funde os blocos de cada grupo. Voltam ao registro os blocos de
+        # `alterados`, os que receberam estados e os dos predecessores dos movidos.
+        _contar(self.estatisticas, "reagrupamentos_completos")
+        indices = list(self.blocos)
+        posicao = {bloco: indice for indice, bloco in enumerate(indices)}
+        k = len(self.simbolos)
+        delta = array('i', bytes(4 * len(indices) * k))
+        finais = []
+        for indice, bloco in enumerate(indices):
+            estado = next(iter(self.blocos[bloco]))
+            if estado in self.finais:
+                finais.append(indice)
+            transicoes = self.delta[estado]
+            for coluna, simbolo in enumerate(self.simbolos):
+                delta[indice * k + coluna] = posicao[self.bloco_de[transicoes[simbolo]]]
+        quociente = AutomatoFinitoDeterministicoCompacto(
+            indices, self.simbolos, delta, 0, AutomatoFinitoDeterministicoCompacto._mapa_bits(finais, len(indices))
+        )
+
+        alterados = set(alterados)
+        for grupo in quociente._grupos_equivalentes_hopcroft(self.estatisticas):
+            if len(grupo) > 1:
+                grupo = [indices[indice] for indice in grupo]
+                destino = max(grupo, key=lambda bloco: len(self.blocos[bloco]))
+                for bloco in grupo:
+                    if bloco != destino:
+                        movidos = self._remover_bloco(bloco)
+                        for estado in movidos:
+                            self.bloco_de[estado] = destino
+                            for simbolo in self.simbolos:
+                                alterados.update(self.inversas[simbolo].get(estado, ()))
+                        self.blocos[destino].update(movidos)
+                alterados.add(next(iter(self.blocos[destino])))
+
+        for bloco in {self.bloco_de[estado] for estado in alterados}:
+            self._registrar(bloco)
+
+    def _atualizar(self, tocados):
+        divisores = []
+        for estado in tocados:
+            bloco = self.bloco_de.get(estado)
+            if bloco is None:
+                divisores.append(self._novo_bloco({estado}))
+            elif len(self.blocos[bloco]) > 1:
+                self.blocos[bloco].discard(estado)
+                divisores.append(self._novo_bloco({estado}))
+        alterados = set(tocados)
+        self._refinar(divisores, alterados)
+
+        if self._alcanca_tocado(tocados):
+            self._reagrupar(alterados)
+        else:
+            self._propagar(alterados)
+
+    def _verificar_estado(self, estado, editavel=True):
+        if estado not in self.delta:
+            raise ValueError(f"Estado '{estado}' não pertence a Q.")
+        if editavel and estado == self.estado_erro:
+            raise ValueError(f"O estado de erro '{estado}' não pode ser editado.")
+
+    def _verificar_simbolo(self, simbolo):
+        if simbolo not in self.inversas:
+            raise ValueError(f"Símbolo '{simbolo}' não pertence ao alfabeto.")
+
+    def _mover_transicao(self, origem, simbolo, destino):
+        inversas = self.inversas[simbolo]
+        inversas[self.delta[origem][simbolo]].discard(origem)
+        self.delta[origem][simbolo] = destino
+        inversas.setdefault(destino, set()).add(origem)
+
+    def _criar_estado(self, estado, final, destino):
+        self.delta[estado] = dict.fromkeys(self.simbolos, destino)
+        for simbolo in self.simbolos:
+            self.inversas[simbolo].setdefault(destino, set()).add(estado)
+        if final:
+            self.finais.add(estado)
+
+    def definir_transicao(self, origem, simbolo, destino):
+        self._verificar_estado(origem)
+        self._verificar_estado(destino, editavel=False)
+        self._verificar_simbolo(simbolo)
+        if self.delta[origem][simbolo] != destino:
+            self._mover_transicao(origem, simbolo, destino)
+            self._atualizar([origem])
+
+    def remover_transicao(self, origem, simbolo):
+        # Num AFD completo, remover δ(origem, símbolo) é desviá-la para o estado de erro.
+        self.definir_transicao(origem, simbolo, self.estado_erro)
+
+    def alternar_final(self, estado):
+        self._verificar_estado(estado)
+        if estado in self.finais:
+            self.finais.discard(estado)
+        else:
+            self.finais.add(estado)
+        self._atualizar([estado])
+
+    def adicionar_estado(self, estado, final=False):
+        # O estado novo começa com todas as transições para o estado de erro.
+        if estado in self.delta:
+            raise ValueError(f"Estado '{estado}' já pertence a Q.")
+        self._criar_estado(estado, final, self.estado_erro)
+        self._atualizar([estado])
+
+    def automato(self):
+        # O AFD editado, sem minimizar.
+        estados = set(self.delta)
+        if all(self.inversas[simbolo][self.estado_erro] == {self.estado_erro} for simbolo in self.simbolos):
+            estados.discard(self.estado_erro)
+        transicoes = FuncaoTransicaoDFA()
+        transicoes.mapa = {estado: dict(self.delta[estado]) for estado in estados}
+        return AutomatoFinitoDeterministico(estados, self.simbolos, transicoes, self.q0, self.finais & estados, validar=False)
+
+    def minimo(self):
+        # O quociente restrito aos blocos alcançáveis a partir de q0: o mesmo AFD de
+        # minimizar(), a menos dos nomes dos estados.
+        nomes = {self.bloco_de[self.q0]: "M0"}
+        fila = deque(nomes)
+        transicoes = FuncaoTransicaoDFA()
+        finais = set()
+        while fila:
+            bloco = fila.popleft()
+            estado = next(iter(self.blocos[bloco]))
+            if estado in self.finais:
+                finais.add(nomes[bloco])
+            for simbolo, destino in self.delta[estado].items():
+                bloco_destino = self.bloco_de[destino]
+                if bloco_destino not in nomes:
+                    nomes[bloco_destino] = f"M{len(nomes)}"
+                    fila.append(bloco_destino)
+                transicoes.adicionar(nomes[bloco], simbolo, nomes[bloco_destino])
+        return AutomatoFinitoDeterministico(nomes.values(), self.simbolos, transicoes, "M0", finais, validar=False)
+
+
+def _minimizar_brzozowski(automato, estatisticas=None, limite_estados=None):
+    # det(rev(det(rev(A)))): a segunda determinização parte do reverso de um AFD
+    # acessível, então já sai mínima, sem refinamento de partições.
+    registro.info("Iniciando minimização de Brzozowski...")
+    reverso = automato.reverter()
+    afd_reverso = reverso._determinizar_bitset(reverso.possui_transicoes_epsilon(), estatisticas, limite_estados)
+    minimo = afd_reverso.reverter()._determinizar_bitset(False, estatisticas, limite_estados)
+    if getattr(automato, "classes_simbolos", None):
+        # O reverso só conhece os representantes; a tabela de classes volta aqui.
+        minimo = minimo.comprimir_alfabeto(automato.classes_simbolos)
+    registro.info(
+        "Minimização de Brzozowski concluída: %d estados no AFD do reverso, %d no AFD mínimo.",
+        len(afd_reverso.Q), len(minimo.Q)
+    )
+    return minimo
+
+def _preparar_produto(afd_a, afd_b):
+    # Os dois lados na forma compacta, com as colunas de cada um alinhadas a um
+    # alfabeto comum; -1 marca símbolo ausente (e o estado morto).
+    compactos = []
+    for afd in (afd_a, afd_b):
+        if isinstance(afd, AutomatoFinitoDeterministico):
+            afd = afd.compactar()
+        compactos.append(afd)
+    a, b = compactos
+    simbolos = sorted(set(a.indice_simbolo) | set(b.indice_simbolo))
+    colunas_a = [a.indice_simbolo.get(simbolo, -1) for simbolo in simbolos]
+    colunas_b = [b.indice_simbolo.get(simbolo, -1) for simbolo in simbolos]
+    return a, b, simbolos, colunas_a, colunas_b
+
+def _explorar_produto(afd_a, afd_b, aceita, parar_em_aceitacao=False):
+    # Busca em largura só sobre os pares (estado de A, estado de B) alcançáveis; a
+    # memória cresce com esses pares, nunca com |Q1|·|Q2|. Um par vira uma chave
+    # inteira (a + 1)·(n_B + 1) + (b + 1), com -1 para o estado morto.
+    # Com parar_em_aceitacao, devolve a menor palavra que leva a um par aceito por
+    # `aceita` (ou None); senão devolve o produto como AFD compacto.
+    a, b, simbolos, colunas_a, colunas_b = _preparar_produto(afd_a, afd_b)
+    delta_a, k_a = a.delta, a.k
+    delta_b, k_b = b.delta, b.k
+    largura = b.n + 1
+
+    indice_par = {(a.q0 + 1) * largura + b.q0 + 1: 0}
+    pares = [(a.q0, b.q0)]
+    origem_par = [(-1, -1)]
+    delta = array('i')
+    finais = []
+
+    for indice, (estado_a, estado_b) in enumerate(pares):
+        if aceita(estado_a >= 0 and a.e_final(estado_a), estado_b >= 0 and b.e_final(estado_b)):
+            if parar_em_aceitacao:
+                palavra = []
+                while indice > 0:
+                    indice, indice_simbolo = origem_par[indice]
+                    palavra.append(simbolos[indice_simbolo])
+                return "".join(reversed(palavra))
+            finais.append(indice)
+
+        base_a = estado_a * k_a
+        base_b = estado_b * k_b
+        for indice_simbolo, (coluna_a, coluna_b) in enumerate(zip(colunas_a, colunas_b)):
+            destino_a = delta_a[base_a + coluna_a] if estado_a >= 0 and coluna_a >= 0 else -1
+            destino_b = delta_b[base_b + coluna_b] if estado_b >= 0 and coluna_b >= 0 else -1
+            chave = (destino_a + 1) * largura + destino_b + 1
+            destino = indice_par.get(chave)
+            if destino is None:
+                destino = indice_par[chave] = len(pares)
+                pares.append((destino_a, destino_b))
+                if parar_em_aceitacao:
+                    origem_par.append((indice, indice_simbolo))
+            if not parar_em_aceitacao:
+                delta.append(destino)
+
+    if parar_em_aceitacao:
+        return None
+
+    registro.info("Produto construído com %d pares alcançáveis (de %d possíveis).", len(pares), (a.n + 1) * largura)
+    nomes = [f"P{indice}" for indice in range(len(pares))]
+    return AutomatoFinitoDeterministicoCompacto(
+        nomes, simbolos, delta, 0, AutomatoFinitoDeterministicoCompacto._mapa_bits(finais, len(pares))
+    )
+
+def _operacao_produto(afd_a, afd_b, aceita, minimizar):
+    produto = _explorar_produto(afd_a, afd_b, aceita)
+    if minimizar:
+        produto = produto.minimizar()
+    return produto.para_afd()
+
+class ResultadoLote:
+    # aceitas[i] diz se a cadeia i foi aceita; posicoes_invalidas[i] é a posição do
+    # primeiro símbolo fora do alfabeto na cadeia i, ou -1 se não houver.
+    def __init__(self, aceitas, posicoes_invalidas):
+        self.aceitas = aceitas
+        self.posicoes_invalidas = posicoes_invalidas
+
+    def rejeitadas(self):
+        return [indice for indice, aceita in enumerate(self.aceitas) if not aceita]
+
+    def invalidas(self):
+        return [indice for indice, posicao in enumerate(self.posicoes_invalidas) if posicao >= 0]
+
+
+class AutomatoFinitoDeterministicoCompacto:
+    # Estados numerados 0..n-1 e símbolos 0..k-1; δ(i, c) fica em delta[i * k + c].
+    # Com `classes` ({símbolo: representante}), as colunas são só dos representantes
+    # e indice_simbolo leva cada símbolo da classe à coluna do seu representante.
+    def __init__(self, estados, simbolos, delta, q0, finais, classes=None):
+        self.estados = list(estados)
+        self.simbolos = list(simbolos)
+        self.indice_simbolo = {simbolo: indice for indice, simbolo in enumerate(self.simbolos)}
+        self.classes = dict(classes or {})
+        for simbolo, representante in self.classes.items():
+            if representante not in self.indice_simbolo:
+                raise ValueError(f"Representante '{representante}' da classe de '{simbolo}' não pertence ao alfabeto.")
+            self.indice_simbolo[simbolo] = self.indice_simbolo[representante]
+        self.n = len(self.estados)
+        self.k = len(self.simbolos)
+        self.delta = delta
+        self.q0 = q0
+        self.finais = finais
+        self._tabela_densa = None
+        self._validar()
+
+    def _validar(self):
+        if not self.n:
+            raise ValueError("Q (conjunto de estados) não pode ser vazio.")
+        if not 0 <= self.q0 < self.n:
+            raise ValueError(f"q0 (índice {self.q0}) não pertence a Q.")
+        if len(self.delta) != self.n * self.k:
+            raise ValueError(f"Função delta incompleta: esperadas {self.n * self.k} transições, obtidas {len(self.delta)}.")
+        if len(self.finais) != (self.n + 7) // 8:
+            raise ValueError("Mapa de bits de F com tamanho incompatível com Q.")
+
+    @staticmethod
+    def _mapa_bits(indices, tamanho):
+        mapa = bytearray((tamanho + 7) // 8)
+        for indice in indices:
+            mapa[indice >> 3] |= 1 << (indice & 7)
+        return mapa
+
+    @classmethod
+    def de_afd(cls, afd):
+        estados = sorted(afd.Q)
+        simbolos = sorted(afd.Alfabeto)
+        indice_estado = {estado: indice for indice, estado in enumerate(estados)}
+
+        delta = array('i', bytes(4 * len(estados) * len(simbolos)))
+        posicao = 0
+        for estado in estados:
+            transicoes = afd.Transicoes.mapa[estado]
+            for simbolo in simbolos:
+                delta[posicao] = indice_estado[transicoes[simbolo]]
+                posicao += 1
+
+        finais = cls._mapa_bits((indice_estado[estado] for estado in afd.F), len(estados))
+        return cls(estados, simbolos, delta, indice_estado[afd.q0], finais, afd.classes_simbolos)
+
+    def para_afd(self):
+        transicoes = FuncaoTransicaoDFA()
+        delta = self.delta
+        k = self.k
+        for origem, nome_origem in enumerate(self.estados):
+            base = origem * k
+            for indice_simbolo, simbolo in enumerate(self.simbolos):
+                transicoes.adicionar(nome_origem, simbolo, self.estados[delta[base + indice_simbolo]])
+
+        return AutomatoFinitoDeterministico(
+            Q=self.estados,
+            Alfabeto=self.simbolos,
+            Transicoes=transicoes,
+            q0=self.estados[self.q0],
+            F=[self.estados[indice] for indice in self.indices_finais()],
+            classes_simbolos=self.classes
+        )
+
+    def e_final(self, estado):
+        return (self.finais[estado >> 3] >> (estado & 7)) & 1 == 1
+
+    def indices_finais(self):
+        return [estado for estado in range(self.n) if self.e_final(estado)]
+
+    def processar_cadeia(self, cadeia):
+        delta = self.delta
+        k = self.k
+        indice_simbolo = self.indice_simbolo
+        estado_atual = self.q0
+        for simbolo in cadeia:
+            indice = indice_simbolo.get(simbolo)
+            if indice is None:
+                registro.debug("Símbolo '%s' não pertence ao alfabeto %s.", simbolo, self.simbolos)
+                return False
+
+            estado_atual = delta[estado_atual * k + indice]
+
+        return self.e_final(estado_atual)
+
+    def __str__(self):
+        return self.para_afd().__str__()
+
+    def _tabela_lote(self):
+        # Tabela densa (n + 1) x (k + 2), achatada: a linha n é um sumidouro para
+        # símbolos inválidos, a coluna k é o preenchimento (não muda o estado) e a
+        # coluna k + 1 representa um símbolo fora do alfabeto.
+        if self._tabela_densa is None:
+            n, k = self.n, self.k
+            tabela = np.empty((n + 1, k + 2), dtype=np.int32)
+            tabela[:n, :k] = np.frombuffer(self.delta, dtype=np.int32).reshape(n, k)
+            tabela[:, k] = np.arange(n + 1, dtype=np.int32)
+            tabela[:, k + 1] = n
+            tabela[n, :] = n
+
+            finais = np.zeros(n + 1, dtype=bool)
+            finais[self.indices_finais()] = True
+
+            # Ponto de código -> índice de símbolo, para símbolos de um caractere.
+            unitarios = {ord(simbolo): indice for simbolo, indice in self.indice_simbolo.items() if len(simbolo) == 1}
+            pontos = np.full(max(unitarios, default=0) + 1, k + 1, dtype=np.int32)
+            for ponto, indice in unitarios.items():
+                pontos[ponto] = indice
+
+            self._tabela_densa = (tabela.ravel(), finais, pontos)
+        return self._tabela_densa
+
+    def _codificar_lote(self, cadeias):
+        # Devolve a matriz de símbolos transposta (uma linha por posição), para que
+        # cada passo leia um vetor contíguo.
+        k = self.k
+        comprimentos = np.fromiter((len(cadeia) for cadeia in cadeias), dtype=np.int64, count=len(cadeias))
+        largura = int(comprimentos.max()) if len(cadeias) else 0
+        colunas = np.full((largura, len(cadeias)), k, dtype=np.int32)
+        matriz = colunas.T
+
+        if all(isinstance(cadeia, str) for cadeia in cadeias):
+            # Caminho rápido: todos os caracteres viram pontos de código de uma vez.
+            _, _, tabela_pontos = self._tabela_lote()
+            pontos = np.frombuffer("".join(cadeias).encode("utf-32-le"), dtype=np.uint32)
+            limite = len(tabela_pontos)
+            simbolos = np.where(pontos < limite, tabela_pontos[np.minimum(pontos, limite - 1)], k + 1)
+            matriz[np.arange(largura) < comprimentos[:, None]] = simbolos
+        else:
+            for linha, cadeia in enumerate(cadeias):
+                matriz[linha, :len(cadeia)] = [self.indice_simbolo.get(simbolo, k + 1) for simbolo in cadeia]
+
+        return colunas
+
+    def processar_lote(self, cadeias):
+        cadeias = list(cadeias)
+
+        if np is None:
+            aceitas = []
+            posicoes_invalidas = []
+            delta = self.delta
+            k = self.k
+            indice_simbolo = self.indice_simbolo
+            for cadeia in cadeias:
+                estado_atual = self.q0
+                for simbolo in cadeia:
+                    indice = indice_simbolo.get(simbolo)
+                    if indice is None:
+                        break
+                    estado_atual = delta[estado_atual * k + indice]
+                else:
+                    aceitas.append(self.e_final(estado_atual))
+                    posicoes_invalidas.append(-1)
+                    continue
+
+                aceitas.append(False)
+                posicoes_invalidas.append(next(
+                    posicao for posicao, simbolo in enumerate(cadeia) if simbolo not in indice_simbolo
+                ))
+            return ResultadoLote(aceitas, posicoes_invalidas)
+
+        tabela, finais, _ = self._tabela_lote()
+        largura_tabela = self.k + 2
+        aceitas = np.zeros(len(cadeias), dtype=bool)
+        posicoes_invalidas = np.full(len(cadeias), -1, dtype=np.int64)
+
+        for inicio in range(0, len(cadeias), TAMANHO_BLOCO_LOTE):
+            bloco = cadeias[inicio:inicio + TAMANHO_BLOCO_LOTE]
+            colunas = self._codificar_lote(bloco)
+
+            estados = np.full(len(bloco), self.q0, dtype=np.int32)
+            for coluna in colunas:
+                estados = tabela[estados * largura_tabela + coluna]
+            aceitas[inicio:inicio + len(bloco)] = finais[estados]
+
+            # Um bloco só de cadeias vazias não tem colunas (nem símbolos inválidos).
+            if colunas.shape[0]:
+                invalidos = colunas.T == self.k + 1
+                possui_invalido = invalidos.any(axis=1)
+                posicoes_invalidas[inicio:inicio + len(bloco)][possui_invalido] = invalidos.argmax(axis=1)[possui_invalido]
+
+        return ResultadoLote(aceitas, posicoes_invalidas)
+
+    def _remover_estados_inalcancaveis(self, estatisticas=None):
+        delta = self.delta
+        k = self.k
+        alcancado = bytearray(self.n)
+        alcancado[self.q0] = 1
+        fila_processamento = [self.q0]
+
+        for estado_atual in fila_processamento:
+            base = estado_atual * k
+            for estado_destino in delta[base:base + k]:
+                if not alcancado[estado_destino]:
+                    alcancado[estado_destino] = 1
+                    fila_processamento.append(estado_destino)
+
+        if len(fila_processamento) == self.n:
+            registro.info("... (Minimização) Todos os estados são alcançáveis.")
+            return self
+
+        _contar(estatisticas, "estados_inalcancaveis_removidos", self.n - len(fila_processamento))
+        if registro.isEnabledFor(logging.DEBUG):
+            inalcancaveis = {self.estados[estado] for estado in range(self.n) if not alcancado[estado]}
+            registro.debug("... (Minimização) Removendo estados inalcançáveis: %s", inalcancaveis)
+
+        # A renumeração preserva a ordem relativa (e portanto a ordem dos nomes).
+        novo_indice = [-1] * self.n
+        estados = []
+        for estado in range(self.n):
+            if alcancado[estado]:
+                novo_indice[estado] = len(estados)
+                estados.append(self.estados[estado])
+
+        novo_delta = array('i', bytes(4 * len(estados) * k))
+        posicao = 0
+        for estado in range(self.n):
+            if alcancado[estado]:
+                base = estado * k
+                for estado_destino in delta[base:base + k]:
+                    novo_delta[posicao] = novo_indice[estado_destino]
+                    posicao += 1
+
+        finais = self._mapa_bits(
+            (novo_indice[estado] for estado in self.indices_finais() if alcancado[estado]),
+            len(estados)
+        )
+        return AutomatoFinitoDeterministicoCompacto(estados, self.simbolos, novo_delta, novo_indice[self.q0], finais, self.classes)
+
+    def _transicoes_inversas(self):
+        # Índice inverso por símbolo em formato CSR: os predecessores de t por c
+        # ficam em origens[c][inicio[c][t]:inicio[c][t + 1]].
+        n = self.n
+        k = self.k
+        delta = self.delta
+        inicios = []
+        origens = []
+
+        for simbolo in range(k):
+            contagem = array('i', bytes(4 * (n + 1)))
+            for estado in range(n):
+                contagem[delta[estado * k + simbolo] + 1] += 1
+            for estado in range(n):
+                contagem[estado + 1] += contagem[estado]
+
+            posicoes = array('i', contagem)
+            predecessores = array('i', bytes(4 * n))
+            for estado in range(n):
+                destino = delta[estado * k + simbolo]
+                predecessores[posicoes[destino]] = estado
+                posicoes[destino] += 1
+
+            inicios.append(contagem)
+            origens.append(predecessores)
+
+        return inicios, origens
+
+    def _grupos_equivalentes_hopcroft(self, estatisticas=None):
+        inicios, origens = self._transicoes_inversas()
+
+        finais = set(self.indices_finais())
+        nao_finais = set(range(self.n)) - finais
+        blocos = [bloco for bloco in (finais, nao_finais) if bloco]
+        bloco_do_estado = array('i', bytes(4 * self.n))
+        for indice_bloco, bloco in enumerate(blocos):
+            for estado in bloco:
+                bloco_do_estado[estado] = indice_bloco
+
+        lista_divisores = []
+        if len(blocos) == 2:
+            menor_bloco = 0 if len(blocos[0]) <= len(blocos[1]) else 1
+            lista_divisores = [(menor_bloco, simbolo) for simbolo in range(self.k)]
+
+        divisoes = 0
+        while lista_divisores:
+            indice_divisor, simbolo_divisor = lista_divisores.pop()
+
+            inicio = inicios[simbolo_divisor]
+            predecessores = origens[simbolo_divisor]
+            atingidos_por_bloco = {}
+            for estado in blocos[indice_divisor]:
+                for predecessor in predecessores[inicio[estado]:inicio[estado + 1]]:
+                    indice_bloco = bloco_do_estado[predecessor]
+                    if indice_bloco in atingidos_por_bloco:
+                        atingidos_por_bloco[indice_bloco].add(predecessor)
+                    else:
+                        atingidos_por_bloco[indice_bloco] = {predecessor}
+
+            for indice_bloco, atingidos in atingidos_por_bloco.items():
+                bloco = blocos[indice_bloco]
+                if len(atingidos) == len(bloco):
+                    continue
+
+                # A parte menor vira o bloco novo, mantendo o custo total em O(n log n).
+                if len(atingidos) <= len(bloco) - len(atingidos):
+                    bloco.difference_update(atingidos)
+                    novo_bloco = atingidos
+                else:
+                    novo_bloco = bloco - atingidos
+                    blocos[indice_bloco] = atingidos
+
+                indice_novo = len(blocos)
+                blocos.append(novo_bloco)
+                divisoes += 1
+                for estado in novo_bloco:
+                    bloco_do_estado[estado] = indice_novo
+
+                # Se o bloco original já estava pendente como divisor, ele continua
+                # pendente com o conteúdo reduzido; caso contrário basta a parte menor.
+                for simbolo in range(self.k):
+                    lista_divisores.append((indice_novo, simbolo))
+
+        _contar(estatisticas, "divisoes_refinamento", divisoes)
+        return sorted(blocos, key=min)
+
+    def minimizar(self, estatisticas=None):
+        registro.info("Iniciando minimização do AFD...")
+
+        afd = self._remover_estados_inalcancaveis(estatisticas)
+
+        if afd.n <= 1:
+            registro.info(">>> AFD já é trivialmente mínimo.")
+            return afd
+
+        grupos_equivalentes = afd._grupos_equivalentes_hopcroft(estatisticas)
+
+        if registro.isEnabledFor(logging.DEBUG):
+            registro.debug(
+                "Novos grupos de estados equivalentes: %s",
+                [{afd.estados[estado] for estado in grupo} for grupo in grupos_equivalentes]
+            )
+
+        if len(grupos_equivalentes) == afd.n:
+            registro.info(">>> O AFD já é mínimo. Nenhum estado foi agrupado.")
+            registro.info("Minimização concluída. Nenhum estado foi alterado.")
+            return afd
+
+        grupo_do_estado = array('i', bytes(4 * afd.n))
+        for indice_grupo, grupo in enumerate(grupos_equivalentes):
+            for estado in grupo:
+                grupo_do_estado[estado] = indice_grupo
+
+        k = afd.k
+        novo_delta = array('i', bytes(4 * len(grupos_equivalentes) * k))
+        for indice_grupo, grupo in enumerate(grupos_equivalentes):
+            base = next(iter(grupo)) * k
+            for simbolo in range(k):
+                novo_delta[indice_grupo * k + simbolo] = grupo_do_estado[afd.delta[base + simbolo]]
+
+        novos_estados = [f"M{indice}" for indice in range(len(grupos_equivalentes))]
+        finais = self._mapa_bits({grupo_do_estado[estado] for estado in afd.indices_finais()}, len(novos_estados))
+
+        registro.info("Minimização concluída. Estados reduzidos de %d para %d.", self.n, len(novos_estados))
+
+        return AutomatoFinitoDeterministicoCompacto(
+            novos_estados, afd.simbolos, novo_delta, grupo_do_estado[afd.q0], finais, afd.classes
+        )
+
+    def classes_de_simbolos(self):
+        # A assinatura de um símbolo é a sua coluna de δ. Símbolos que já estavam
+        # numa classe acompanham o representante.
+        assinaturas = {simbolo: tuple(self.delta[coluna::self.k]) for coluna, simbolo in enumerate(self.simbolos)}
+        representantes = _classes_por_assinatura(assinaturas)
+        return {simbolo: representantes[self.simbolos[coluna]] for simbolo, coluna in self.indice_simbolo.items()}
+
+    def comprimir_alfabeto(self, classes):
+        # Mantém só as colunas dos representantes. As classes são compostas com as
+        # que o autômato já tinha, e `classes` pode citar símbolos fora de Σ (como
+        # ao devolver a tabela a um AFD minimizado sobre os representantes).
+        novas_classes = {}
+        for simbolo, coluna in self.indice_simbolo.items():
+            atual = self.simbolos[coluna]
+            novas_classes[simbolo] = classes.get(atual, atual)
+        for simbolo, representante in classes.items():
+            if simbolo not in novas_classes:
+                if representante not in novas_classes:
+                    raise ValueError(f"Representante '{representante}' da classe de '{simbolo}' não pertence ao alfabeto.")
+                novas_classes[simbolo] = novas_classes[representante]
+
+        representantes = sorted({novas_classes[simbolo] for simbolo in self.simbolos})
+        colunas = []
+        for representante in representantes:
+            coluna = self.indice_simbolo.get(representante)
+            if coluna is None or self.simbolos[coluna] != representante:
+                raise ValueError(f"Representante '{representante}' não tem coluna própria em δ.")
+            colunas.append(coluna)
+
+        k = len(colunas)
+        delta = array('i', bytes(4 * self.n * k))
+        for estado in range(self.n):
+            base = estado * self.k
+            for indice, coluna in enumerate(colunas):
+                delta[estado * k + indice] = self.delta[base + coluna]
+
+        novas_classes = {simbolo: representante for simbolo, representante in novas_classes.items() if simbolo != representante}
+        return AutomatoFinitoDeterministicoCompacto(self.estados, representantes, delta, self.q0, self.finais, novas_classes)
+
+    def assinatura(self):
+        conteudo = repr((self.estados, self.simbolos, self.q0, sorted(self.classes.items()))).encode("utf-8")
+        return hashlib.sha256(conteudo + bytes(self.delta) + bytes(self.finais)).hexdigest()
+
+    def _gerar_codigo_compilado(self, assinatura):
+        # Os membros das classes de símbolos entram nos dicionários como chaves
+        # próprias, então a tabela de classes não custa nada no reconhecimento.
+        for simbolo in self.indice_simbolo:
+            if len(simbolo) != 1:
+                raise ValueError(f"Compilação exige símbolos de um caractere; '{simbolo}' não é.")
+
+        n, k = self.n, self.k
+        delta = self.delta
+        todos_simbolos = len(self.indice_simbolo)
+
+        def classe_complementar(simbolos):
+            if not simbolos:
+                return "(?s)."
+            return "[^" + "".join(re.escape(simbolo) for simbolo in sorted(simbolos)) + "]"
+
+        linhas = [
+            f"# Gerado por AutomatoFinitoDeterministicoCompacto.compilar; assinatura {assinatura}",
+            "import re",
+            "",
+            "_FINAL = object()",
+            "_PULO = object()",
+            "_SUMIDOURO = object()",
+            f"_FORA_DO_ALFABETO = re.compile({classe_complementar(set(self.indice_simbolo))!r}).search",
+            "",
+            "# Cada estado é um dicionário símbolo -> dicionário do próximo estado, então",
+            "# um passo custa uma única consulta. _PULO consome de uma vez, por busca em C,",
+            "# a sequência de laços sobre o próprio estado; _SUMIDOURO vale 1 para estados",
+            "# de rejeição sem saída e 2 para estados de aceitação sem saída.",
+            f"_E = [{{}} for _ in range({n})]",
+        ]
+
+        for estado in range(n):
+            base = estado * k
+            destinos = {simbolo: delta[base + coluna] for simbolo, coluna in self.indice_simbolo.items()}
+            laco = {simbolo for simbolo, destino in destinos.items() if destino == estado}
+
+            sumidouro = 0
+            if len(laco) == todos_simbolos:
+                sumidouro = 2 if self.e_final(estado) else 1
+            pulo = None
+            if laco and not sumidouro:
+                pulo = f"re.compile({classe_complementar(laco)!r}).search"
+
+            entradas = "".join(f"{simbolo!r}: _E[{destino}], " for simbolo, destino in destinos.items())
+            linhas.append(
+                f"_E[{estado}].update({{{entradas}_FINAL: {self.e_final(estado)}, _PULO: {pulo}, _SUMIDOURO: {sumidouro}}})"
+            )
+
+        linhas += [
+            "",
+            "def aceita(cadeia):",
+            f"    estado = _E[{self.q0}]",
+            "    posicao = 0",
+            "    tamanho = len(cadeia)",
+            "    while posicao < tamanho:",
+            "        sumidouro = estado[_SUMIDOURO]",
+            "        if sumidouro:",
+            "            return sumidouro == 2 and _FORA_DO_ALFABETO(cadeia, posicao) is None",
+            "        pulo = estado[_PULO]",
+            "        if pulo is not None:",
+            "            encontrado = pulo(cadeia, posicao)",
+            "            if encontrado is None:",
+            "                return estado[_FINAL]",
+            "            posicao = encontrado.start()",
+            f"        fim = posicao + {TAMANHO_TRECHO_COMPILADO}",
+            "        try:",
+            "            for simbolo in cadeia[posicao:fim]:",
+            "                estado = estado[simbolo]",
+            "        except KeyError:",
+            "            return False",
+            "        posicao = fim",
+            "    return estado[_FINAL]",
+        ]
+
+        return "\n".join(linhas) + "\n"
+
+    def compilar(self, caminho_cache=None):
+        assinatura = self.assinatura()
+        codigo = None
+
+        if caminho_cache and os.path.exists(caminho_cache):
+            with open(caminho_cache, "r", encoding="utf-8") as arquivo:
+                conteudo = arquivo.read()
+            if conteudo.startswith("#") and assinatura in conteudo.split("\n", 1)[0]:
+                codigo = conteudo
+
+        if codigo is None:
+            codigo = self._gerar_codigo_compilado(assinatura)
+            if caminho_cache:
+                with open(caminho_cache, "w", encoding="utf-8") as arquivo:
+                    arquivo.write(codigo)
+
+        espaco_nomes = {}
+        exec(compile(codigo, caminho_cache or f"<afd {assinatura[:12]}>", "exec"), espaco_nomes)
+        funcao = espaco_nomes["aceita"]
+        funcao.codigo_fonte = codigo
+        return funcao
+
+    def salvar_binario(self, caminho_arquivo):
+        # Formato: cabeçalho fixo, tabela de nomes (UTF-8 separados por '\n'),
+        # mapa de bits de F e δ como int32 little-endian, alinhado em 4 bytes.
+        # Desde a versão 2, as classes de símbolos seguem os k símbolos na mesma
+        # tabela, uma linha "membro\trepresentante" por membro.
+        nomes_estados = "\n".join(self.estados).encode("utf-8")
+        linhas_simbolos = self.simbolos + [f"{simbolo}\t{representante}" for simbolo, representante in sorted(self.classes.items())]
+        nomes_simbolos = "\n".join(linhas_simbolos).encode("utf-8")
+        cabecalho = struct.pack(
+            FORMATO_CABECALHO_BINARIO, MAGICO_BINARIO, VERSAO_BINARIO,
+            self.n, self.k, self.q0, len(nomes_estados), len(nomes_simbolos)
+        )
+
+        delta = array('i', self.delta)
+        if sys.byteorder == "big":
+            delta.byteswap()
+
+        with open(caminho_arquivo, "wb") as arquivo:
+            for parte in (cabecalho, nomes_estados, nomes_simbolos):
+                arquivo.write(parte)
+            arquivo.write(bytes(-arquivo.tell() % 4))
+            arquivo.write(bytes(self.finais))
+            arquivo.write(bytes(-arquivo.tell() % 4))
+            arquivo.write(delta.tobytes())
+
+    @classmethod
+    def carregar_binario(cls, caminho_arquivo):
+        with open(caminho_arquivo, "rb") as arquivo:
+            mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magico, versao, n, k, q0, tamanho_estados, tamanho_simbolos = struct.unpack_from(FORMATO_CABECALHO_BINARIO, mapa)
+        if magico != MAGICO_BINARIO:
+            raise ValueError(f"Arquivo '{caminho_arquivo}' não é um autômato binário.")
+        if not 1 <= versao <= VERSAO_BINARIO:
+            raise ValueError(f"Versão {versao} do formato binário não suportada (esperada até {VERSAO_BINARIO}).")
+
+        posicao = struct.calcsize(FORMATO_CABECALHO_BINARIO)
+        estados = mapa[posicao:posicao + tamanho_estados].decode("utf-8").split("\n")
+        posicao += tamanho_estados
+        simbolos = mapa[posicao:posicao + tamanho_simbolos].decode("utf-8").split("\n") if k else []
+        classes = dict(linha.split("\t", 1) for linha in simbolos[k:])
+        simbolos = simbolos[:k]
+        posicao += tamanho_simbolos
+        posicao += -posicao % 4
+
+        visao = memoryview(mapa)
+        finais = visao[posicao:posicao + (n + 7) // 8]
+        posicao += (n + 7) // 8
+        posicao += -posicao % 4
+
+        if len(visao) < posicao + 4 * n * k:
+            raise ValueError(f"Arquivo '{caminho_arquivo}' truncado: δ incompleta.")
+
+        # δ é usada direto do mmap, sem cópia nem análise, em máquinas little-endian.
+        if sys.byteorder == "little":
+            delta = visao[posicao:posicao + 4 * n * k].cast("i")
+        else:
+            delta = array('i')
+            delta.frombytes(visao[posicao:posicao + 4 * n * k])
+            delta.byteswap()
+
+        # Uma passada só sobre δ: um destino fora de [0, n) num arquivo corrompido
+        # falharia só lá dentro de processar_cadeia ou minimizar.
+        if np is not None:
+            destinos = np.frombuffer(delta, dtype=np.int32)
+            fora = (destinos < 0) | (destinos >= n)
+            posicao_invalida = int(fora.argmax()) if fora.any() else None
+        elif delta and (min(delta) < 0 or max(delta) >= n):
+            posicao_invalida = next(posicao for posicao, destino in enumerate(delta) if not 0 <= destino < n)
+        else:
+            posicao_invalida = None
+        if posicao_invalida is not None:
+            origem, coluna = divmod(posicao_invalida, k)
+            raise ValueError(
+                f"Estado de destino {delta[posicao_invalida]} (de δ({estados[origem]},{simbolos[coluna]})) não pertence a Q."
+            )
+
+        return cls(estados, simbolos, delta, q0, finais, classes)
+
+class EstadoFluxo:
+    # Estado retomável de uma leitura em fluxo: estado atual do AFD, bytes
+    # consumidos, registros concluídos e onde começou o registro aberto.
+    def __init__(self, estado, consumidos=0, registros=0, inicio_registro=0):
+        self.estado = estado
+        self.consumidos = consumidos
+        self.registros = registros
+        self.inicio_registro = inicio_registro
+
+    def __repr__(self):
+        return f"EstadoFluxo(estado={self.estado}, consumidos={self.consumidos}, registros={self.registros})"
+
+
+class ProcessadorFluxo:
+    # Cada byte é mapeado para uma coluna de símbolo por uma tabela de 256 entradas
+    # (o byte b corresponde ao símbolo chr(b)); bytes fora do alfabeto levam a um
+    # sumidouro de rejeição.
+    def __init__(self, afd, delimitador=None):
+        if isinstance(afd, AutomatoFinitoDeterministico):
+            afd = afd.compactar()
+        self.afd = afd
+
+        if delimitador is not None:
+            if isinstance(delimitador, str):
+                delimitador = delimitador.encode("latin-1")
+            if len(delimitador) != 1:
+                raise ValueError(f"Delimitador de registro deve ter exatamente um byte: {delimitador!r}.")
+            delimitador = delimitador[0]
+        self.delimitador = delimitador
+
+        n, k = afd.n, afd.k
+        self._largura = k + 1
+        self._sumidouro = n
+        delta = array('i', bytes(4 * (n + 1) * self._largura))
+        for estado in range(n):
+            base_origem = estado * k
+            base_destino = estado * self._largura
+            delta[base_destino:base_destino + k] = array('i', afd.delta[base_origem:base_origem + k])
+            delta[base_destino + k] = n
+        for coluna in range(self._largura):
+            delta[n * self._largura + coluna] = n
+        self._delta = delta
+
+        self._colunas = array('i', [k] * 256)
+        for simbolo, indice in afd.indice_simbolo.items():
+            if len(simbolo) == 1 and ord(simbolo) < 256:
+                self._colunas[ord(simbolo)] = indice
+
+        self._finais = bytearray(n + 1)
+        for estado in afd.indices_finais():
+            self._finais[estado] = 1
+
+    def novo_estado(self):
+        return EstadoFluxo(self.afd.q0)
+
+    def aceita(self, estado_fluxo):
+        return self._finais[estado_fluxo.estado] == 1
+
+    def alimentar(self, estado_fluxo, bloco):
+        if isinstance(bloco, str):
+            bloco = bloco.encode("latin-1")
+        bloco = memoryview(bloco).cast("B")
+
+        delta = self._delta
+        largura = self._largura
+        colunas = self._colunas
+        estado = estado_fluxo.estado
+        registros_concluidos = []
+
+        if self.delimitador is None:
+            for byte in bloco:
+                estado = delta[estado * largura + colunas[byte]]
+        else:
+            delimitador = self.delimitador
+            q0 = self.afd.q0
+            posicao = estado_fluxo.consumidos
+            for byte in bloco:
+                posicao += 1
+                if byte == delimitador:
+                    registros_concluidos.append((estado_fluxo.registros, self._finais[estado] == 1))
+                    estado_fluxo.registros += 1
+                    estado_fluxo.inicio_registro = posicao
+                    estado = q0
+                else:
+                    estado = delta[estado * largura + colunas[byte]]
+
+        estado_fluxo.estado = estado
+        estado_fluxo.consumidos += len(bloco)
+        return registros_concluidos
+
+    def _blocos(self, fonte, tamanho_bloco):
+        if isinstance(fonte, (bytes, bytearray, memoryview, mmap.mmap)):
+            visao = memoryview(fonte).cast("B")
+            for inicio in range(0, len(visao), tamanho_bloco):
+                yield visao[inicio:inicio + tamanho_bloco]
+        elif hasattr(fonte, "readinto"):
+            buffer = bytearray(tamanho_bloco)
+            visao = memoryview(buffer)
+            while True:
+                lidos = fonte.readinto(buffer)
+                if not lidos:
+                    break
+                yield visao[:lidos]
+        elif hasattr(fonte, "read"):
+            while True:
+                bloco = fonte.read(tamanho_bloco)
+                if not bloco:
+                    break
+                yield bloco
+        else:
+            yield from fonte
+
+    def processar(self, fonte, estado_fluxo=None, tamanho_bloco=TAMANHO_BLOCO_FLUXO):
+        # Gera (número do registro, aceito) para cada registro delimitado e, ao
+        # final, para o registro aberto (que, sem delimitador, é o fluxo inteiro).
+        if estado_fluxo is None:
+            estado_fluxo = self.novo_estado()
+
+        for bloco in self._blocos(fonte, tamanho_bloco):
+            yield from self.alimentar(estado_fluxo, bloco)
+
+        if self.delimitador is None or estado_fluxo.consumidos > estado_fluxo.inicio_registro or estado_fluxo.registros == 0:
+            yield (estado_fluxo.registros, self.aceita(estado_fluxo))
+
+    def aceita_fluxo(self, fonte, tamanho_bloco=TAMANHO_BLOCO_FLUXO):
+        resultado = False
+        for _, resultado in self.processar(fonte, tamanho_bloco=tamanho_bloco):
+            pass
+        return resultado
+
+
+class AutomatoFinitoDeterministicoPreguicoso:
+    # AFD construído sob demanda a partir de um AFN: superestados (máscaras de bits)
+    # e suas transições só são criados quando a entrada passa por eles, e ficam num
+    # cache LRU limitado por um orçamento de memória aproximado; com
+    # orcamento_memoria=None o cache não tem limite e nada é contabilizado.
+    def __init__(self, afn, orcamento_memoria=ORCAMENTO_PADRAO_AFD_PREGUICOSO):
+        self.afn = afn
+        self.orcamento_memoria = orcamento_memoria
+        self.simbolos = sorted(afn.Alfabeto)
+        self.indice_simbolo = {simbolo: indice for indice, simbolo in enumerate(self.simbolos)}
+        # Lista de transições + entrada do OrderedDict: igual para todo superestado.
+        self._custo_linha = sys.getsizeof([None] * len(self.simbolos)) + 100
+
+        sucessores = afn._mascaras_sucessores()
+        self._tabelas = [sucessores[simbolo] for simbolo in self.simbolos]
+        self._com_fecho_epsilon = afn.possui_transicoes_epsilon()
+        self._mascara_finais = afn._mascara(afn.F)
+
+        self.q0 = afn._mascara(afn.iniciais)
+        if self._com_fecho_epsilon:
+            self.q0 = afn._fecho_epsilon_mascara(self.q0)
+
+        self._cache = OrderedDict()
+        self.memoria_usada = 0
+        self.superestados_criados = 0
+        self.superestados_descartados = 0
+
+    def _custo_superestado(self, mascara):
+        return sys.getsizeof(mascara) + self._custo_linha
+
+    def _linha_transicoes(self, mascara):
+        linha = self._cache.get(mascara)
+        if linha is not None:
+            self._cache.move_to_end(mascara)
+            return linha
+
+        if self.orcamento_memoria is not None:
+            custo = self._custo_superestado(mascara)
+            while self._cache and self.memoria_usada + custo > self.orcamento_memoria:
+                mascara_antiga, _ = self._cache.popitem(last=False)
+                self.memoria_usada -= self._custo_superestado(mascara_antiga)
+                self.superestados_descartados += 1
+            self.memoria_usada += custo
+
+        linha = [None] * len(self.simbolos)
+        self._cache[mascara] = linha
+        self.superestados_criados += 1
+        return linha
+
+    def transicao(self, mascara, indice_simbolo):
+        linha = self._linha_transicoes(mascara)
+        destino = linha[indice_simbolo]
+        if destino is None:
+            tabela = self._tabelas[indice_simbolo]
+            destino = 0
+            for indice in _indices_bits(mascara):
+                destino |= tabela[indice]
+            if self._com_fecho_epsilon:
+                destino = self.afn._fecho_epsilon_mascara(destino)
+            linha[indice_simbolo] = destino
+        return destino
+
+    def e_final(self, mascara):
+        return bool(mascara & self._mascara_finais)
+
+    def processar_cadeia(self, cadeia):
+        estado_atual = self.q0
+        for simbolo in cadeia:
+            indice = self.indice_simbolo.get(simbolo)
+            if indice is None:
+                registro.debug("Símbolo '%s' não pertence ao alfabeto %s.", simbolo, self.afn.Alfabeto)
+                return False
+
+            estado_atual = self.transicao(estado_atual, indice)
+
+        return self.e_final(estado_atual)
+
+    def limpar_cache(self):
+        self._cache.clear()
+        self.memoria_usada = 0
+
+
+class DeterminizacaoEmDisco(_IndiceSuperestados):
+    # Construção de subconjuntos com orçamento de memória: a mesma BFS (e os
+    # mesmos nomes) de _determinizar_bitset, para AFNs cuja explosão não cabe na
+    # RAM. Até `orcamento_estados` superestados, o índice máscara -> número fica
+    # num dicionário; passando disso, ele transborda para um banco sqlite e na
+    # memória ficam só os superestados ainda não gravados, e a fila da BFS passa a
+    # ser lida do banco, por número. δ fica num array('i') (4 bytes por transição),
+    # que já é o AFD compacto devolvido; -1 marca o estado de erro até o fim. A
+    # regra do estado morto, o limite e a numeração vêm de _IndiceSuperestados.
+    # Com `caminho`, o banco também é um checkpoint: a cada `intervalo_checkpoint`
+    # superestados expandidos, superestados, δ e o cursor da fila são confirmados
+    # juntos. Uma execução interrompida (tempo limite, Ctrl+C, LimiteEstadosExcedido)
+    # volta ao último checkpoint e, aberta de novo com o mesmo AFN, continua dali.
+    # Sem `caminho`, o transbordo usa um arquivo temporário.
+    def __init__(self, afn, caminho=None, orcamento_estados=ORCAMENTO_PADRAO_SUPERESTADOS, intervalo_checkpoint=INTERVALO_CHECKPOINT, estatisticas=None, manter_checkpoint=False):
+        if orcamento_estados < 1:
+            raise ValueError("O orçamento de superestados deve ser pelo menos 1.")
+        if intervalo_checkpoint < 1:
+            raise ValueError("O intervalo entre checkpoints deve ser pelo menos 1.")
+
+        self.caminho = caminho
+        self.orcamento_estados = orcamento_estados
+        self.intervalo_checkpoint = intervalo_checkpoint
+        self.estatisticas = estatisticas
+        self.manter_checkpoint = manter_checkpoint
+
+        super().__init__(afn._mascara(afn._estados_coacessiveis()), afn._mascara(afn.F))
+        sucessores = afn._mascaras_sucessores()
+        self._q0_mascara = afn._mascara(afn.iniciais)
+        self.impressao = self._impressao_digital(sucessores)
+
+        self.simbolos = list(afn.Alfabeto)
+        self.delta = array('i')
+        self.finais = bytearray()
+        self.processados = 0
+        self.em_disco = False
+        self.retomado = False
+        self._memoria = {}
+        self._nao_gravados = []
+        self._fila = deque()
+        self._delta_gravado = 0
+        self._conexao = None
+        self._temporario = None
+
+        if caminho is not None and os.path.exists(caminho):
+            self._retomar()
+        else:
+            if caminho is not None:
+                self._abrir_banco()
+            self.registrar_inicial(self._q0_mascara)
+            self._checkpoint()
+        # A ordem dos símbolos decide a numeração; ao retomar, vale a gravada.
+        self._tabelas = [sucessores[simbolo] for simbolo in self.simbolos]
+
+    def _impressao_digital(self, sucessores):
+        # Identifica o AFN pelas tabelas de sucessores (estados na ordem ordenada
+        # dos nomes), para não retomar o checkpoint de outro autômato.
+        resumo = hashlib.sha256(repr((VERSAO_CHECKPOINT, sorted(map(str, sucessores)))).encode("utf-8"))
+        mascaras = [self._q0_mascara, self.mascara_finais, self.mascara_vivos]
+        for simbolo in sorted(sucessores, key=str):
+            mascaras.extend(sucessores[simbolo])
+        for mascara in mascaras:
+            dados = _mascara_para_bytes(mascara)
+            resumo.update(struct.pack("<I", len(dados)))
+            resumo.update(dados)
+        return resumo.hexdigest()
+
+    def _abrir_banco(self):
+        if self.caminho is None:
+            descritor, self._temporario = tempfile.mkstemp(prefix="superestados-", suffix=".sqlite")
+            os.close(descritor)
+        else:
+            os.makedirs(os.path.dirname(self.caminho) or ".", exist_ok=True)
+        self._conexao = sqlite3.connect(self._temporario or self.caminho)
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(
+            "CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS superestados (numero INTEGER PRIMARY KEY, mascara BLOB NOT NULL UNIQUE, final INTEGER NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS transicoes (origem INTEGER PRIMARY KEY, destinos BLOB NOT NULL);"
+        )
+
+    def _gravar_meta(self):
+        self._conexao.executemany("INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)", [
+            ("versao", str(VERSAO_CHECKPOINT)),
+            ("impressao", self.impressao),
+            ("simbolos", json.dumps(self.simbolos, ensure_ascii=False)),
+            ("processados", str(self.processados)),
+            ("precisa_estado_erro", "1" if self.precisa_estado_erro else "0"),
+        ])
+
+    def _retomar(self):
+        self._abrir_banco()
+        meta = dict(self._conexao.execute("SELECT chave, valor FROM meta"))
+        if meta.get("versao") != str(VERSAO_CHECKPOINT) or meta.get("impressao") != self.impressao:
+            self._fechar()
+            raise ValueError(f"O checkpoint '{self.caminho}' é de outro autômato ou de outra versão.")
+
+        self.simbolos = json.loads(meta["simbolos"])
+        self.precisa_estado_erro = meta["precisa_estado_erro"] == "1"
+        self.processados = self._delta_gravado = int(meta["processados"])
+        for (destinos,) in self._conexao.execute("SELECT destinos FROM transicoes WHERE origem < ? ORDER BY origem", (self.processados,)):
+            self.delta.frombytes(destinos)
+        for (final,) in self._conexao.execute("SELECT final FROM superestados ORDER BY numero"):
+            self.finais.append(final)
+        self.total = len(self.finais)
+        if not self._q0_mascara & self.mascara_vivos:
+            self.erro = 0
+
+        self.em_disco = self.total > self.orcamento_estados
+        if not self.em_disco:
+            for numero, dados in self._conexao.execute("SELECT numero, mascara FROM superestados ORDER BY numero"):
+                mascara = int.from_bytes(dados, "little")
+                self._memoria[mascara] = numero
+                if numero >= self.processados:
+                    self._fila.append(mascara)
+        self.retomado = True
+        _contar(self.estatisticas, "checkpoint_retomado")
+        registro.info(
+            "Retomando a determinização de '%s': %d de %d superestados já expandidos.",
+            self.caminho, self.processados, self.total
+        )
+
+    def _inserir(self, mascara, numero, final):
+        self._memoria[mascara] = numero
+        self.finais.append(1 if final else 0)
+        if self._conexao is not None:
+            self._nao_gravados.append((numero, mascara))
+        if not self.em_disco:
+            self._fila.append(mascara)
+            if self.total > self.orcamento_estados:
+                self._transbordar()
+        elif len(self._memoria) >= self.orcamento_estados:
+            self._gravar_superestados()
+
+    def _transbordar(self):
+        # O índice inteiro vai para o banco; daqui em diante a memória guarda só o
+        # que ainda não foi gravado, e a fila é lida do banco.
+        if self._conexao is None:
+            self._abrir_banco()
+            self._gravar_meta()
+            self._nao_gravados = [(numero, mascara) for mascara, numero in self._memoria.items()]
+        self.em_disco = True
+        self._fila.clear()
+        self._gravar_superestados()
+        _contar(self.estatisticas, "transbordos_disco")
+        registro.info("Orçamento de %d superestados em memória excedido: índice transbordado para disco.", self.orcamento_estados)
+
+    def _gravar_superestados(self):
+        finais = self.finais
+        self._conexao.executemany(
+            "INSERT INTO superestados (numero, mascara, final) VALUES (?, ?, ?)",
+            ((numero, _mascara_para_bytes(mascara), finais[numero]) for numero, mascara in self._nao_gravados)
+        )
+        self._nao_gravados = []
+        if self.em_disco:
+            self._memoria.clear()
+
+    def _buscar(self, mascara):
+        numero = self._memoria.get(mascara)
+        if numero is None and self.em_disco:
+            linha = self._conexao.execute(
+                "SELECT numero FROM superestados WHERE mascara = ?", (_mascara_para_bytes(mascara),)
+            ).fetchone()
+            if linha is not None:
+                numero = linha[0]
+        return numero
+
+    def _proxima_mascara(self):
+        if not self._fila and self.em_disco:
+            self._gravar_superestados()
+            linhas = self._conexao.execute(
+                "SELECT mascara FROM superestados WHERE numero >= ? ORDER BY numero LIMIT ?",
+                (self.processados, TAMANHO_LOTE_DISCO)
+            )
+            self._fila.extend(int.from_bytes(dados, "little") for (dados,) in linhas)
+        return self._fila.popleft()
+
+    def _checkpoint(self):
+        if self._conexao is None:
+            return
+        self._gravar_superestados()
+        if self.caminho is not None:
+            k = len(self.simbolos)
+            delta = self.delta
+            self._conexao.executemany(
+                "INSERT INTO transicoes (origem, destinos) VALUES (?, ?)",
+                ((origem, delta[origem * k:(origem + 1) * k].tobytes()) for origem in range(self._delta_gravado, self.processados))
+            )
+            self._delta_gravado = self.processados
+            self._gravar_meta()
+            _contar(self.estatisticas, "checkpoints")
+        self._conexao.commit()
+
+    def metricas(self):
+        return {
+            "superestados": self.total,
+            "expandidos": self.processados,
+            "na_fila": self.total - self.processados,
+            "em_disco": self.em_disco,
+            "retomado": self.retomado,
+        }
+
+    def _relatar(self, progresso, inicio, expandidos_inicio):
+        metricas = self.metricas()
+        decorrido = time.perf_counter() - inicio
+        metricas["tempo_s"] = decorrido
+        metricas["expandidos_por_s"] = (self.processados - expandidos_inicio) / decorrido if decorrido else 0.0
+        registro.info(
+            "Determinização: %d de %d superestados expandidos, %d na fila (%.0f/s)%s.",
+            self.processados, self.total, metricas["na_fila"], metricas["expandidos_por_s"],
+            ", índice em disco" if self.em_disco else ""
+        )
+        if progresso is not None:
+            progresso(metricas)
+
+    def executar(self, limite_estados=None, progresso=None):
+        # `progresso`, se dado, recebe o dicionário de metricas() (mais tempo e
+        # taxa) a cada checkpoint e ao final.
+        self.limite_estados = limite_estados
+        tabelas = self._tabelas
+        sucessor = self.sucessor
+        delta = self.delta
+        inicio = time.perf_counter()
+        expandidos_inicio = self.processados
+
+        try:
+            while self.processados < self.total:
+                estados_nfa = _indices_bits(self._proxima_mascara())
+                for tabela in tabelas:
+                    proximo_super_estado = 0
+                    for indice in estados_nfa:
+                        proximo_super_estado |= tabela[indice]
+                    delta.append(sucessor(proximo_super_estado))
+
+                self.processados += 1
+                if self.processados % self.intervalo_checkpoint == 0:
+                    self._checkpoint()
+                    self._relatar(progresso, inicio, expandidos_inicio)
+        except BaseException:
+            # Nada do que veio depois do último checkpoint é confirmado.
+            self._fechar()
+            raise
+
+        self._checkpoint()
+        self._relatar(progresso, inicio, expandidos_inicio)
+        _contar(self.estatisticas, "superestados_criados", self.total)
+        afd = self._resultado()
+        self._fechar()
+        if self.caminho is not None and not self.manter_checkpoint:
+            os.remove(self.caminho)
+        return afd
+
+    def _resultado(self):
+        k = len(self.simbolos)
+        estados = [f"Q{numero}" for numero in range(self.total)]
+        delta = self.delta
+        # Com Q0 morto, os sucessores mortos já apontam para ele (self.erro == 0).
+        if self.precisa_estado_erro and self.erro < 0:
+            erro = self.total
+            estados.append("Q_ERRO")
+            delta.extend([erro] * k)
+            for posicao, destino in enumerate(delta):
+                if destino < 0:
+                    delta[posicao] = erro
+
+        finais = AutomatoFinitoDeterministicoCompacto._mapa_bits(
+            (numero for numero, final in enumerate(self.finais) if final), len(estados)
+        )
+        return AutomatoFinitoDeterministicoCompacto(estados, self.simbolos, delta, 0, finais)
+
+    def _fechar(self):
+        if self._conexao is not None:
+            self._conexao.close()
+            self._conexao = None
+        if self._temporario is not None:
+            os.remove(self._temporario)
+            self._temporario = None
+
+class SimuladorAFN:
+    # Reconhece cadeias direto no AFN, sem determinizar: o conjunto de estados
+    # ativos é uma máscara de bits, e um passo faz uma consulta por byte não nulo
+    # da máscara. A tabela de cada símbolo guarda, por posição e valor de byte, a
+    # união dos sucessores daqueles até 8 estados, já com fecho ε e sem os estados
+    # que não alcançam F; é preenchida sob demanda até `orcamento_memoria`. O
+    # conjunto vazio rejeita na hora.
+    def __init__(self, afn, classes=None, orcamento_memoria=ORCAMENTO_PADRAO_AFD_PREGUICOSO):
+        self.afn = afn
+        self.orcamento_memoria = orcamento_memoria
+        self.simbolos = sorted(afn.Alfabeto - {afn.simbolo_epsilon})
+        self.indice_simbolo = {simbolo: indice for indice, simbolo in enumerate(self.simbolos)}
+        for simbolo, representante in (classes or {}).items():
+            if representante not in self.indice_simbolo:
+                raise ValueError(f"Representante '{representante}' da classe de '{simbolo}' não pertence ao alfabeto.")
+            self.indice_simbolo[simbolo] = self.indice_simbolo[representante]
+
+        estados, _ = afn._indexar_estados()
+        self._tamanho_bytes = (len(estados) + 7) // 8
+        # Bit 8i ligado em cada byte i: isola o bit que marca "byte i não nulo".
+        self._bits_de_byte = int.from_bytes(b"\x01" * self._tamanho_bytes, "little")
+        sucessores = afn._mascaras_sucessores()
+        self._tabelas = [sucessores[simbolo] for simbolo in self.simbolos]
+        self._com_fecho_epsilon = afn.possui_transicoes_epsilon()
+        self._mascara_vivos = afn._mascara(afn._estados_coacessiveis())
+        self._mascara_finais = afn._mascara(afn.F)
+
+        inicial = afn._mascara(afn.iniciais)
+        if self._com_fecho_epsilon:
+            inicial = afn._fecho_epsilon_mascara(inicial)
+        self.inicial = inicial & self._mascara_vivos
+
+        self._uniao_por_byte = [[None] * self._tamanho_bytes for _ in self.simbolos]
+        self.memoria_usada = 0
+
+    def _uniao_byte(self, coluna, posicao, byte):
+        tabela = self._tabelas[coluna]
+        base = posicao * 8
+        uniao = 0
+        for bit in _indices_bits(byte):
+            uniao |= tabela[base + bit]
+        if self._com_fecho_epsilon:
+            uniao = self.afn._fecho_epsilon_mascara(uniao)
+        return uniao & self._mascara_vivos
+
+    def passo(self, mascara, coluna):
+        uniao_por_byte = self._uniao_por_byte[coluna]
+        dados = mascara.to_bytes(self._tamanho_bytes, "little")
+        ocupados = mascara | (mascara >> 4)
+        ocupados |= ocupados >> 2
+        ocupados |= ocupados >> 1
+
+        proximo = 0
+        for bit in _indices_bits(ocupados & self._bits_de_byte):
+            posicao = bit >> 3
+            byte = dados[posicao]
+            linha = uniao_por_byte[posicao]
+            uniao = linha[byte] if linha is not None else None
+            if uniao is None:
+                uniao = self._uniao_byte(coluna, posicao, byte)
+                if self.memoria_usada < self.orcamento_memoria:
+                    if linha is None:
+                        linha = uniao_por_byte[posicao] = [None] * 256
+                        self.memoria_usada += sys.getsizeof(linha)
+                    linha[byte] = uniao
+                    self.memoria_usada += sys.getsizeof(uniao)
+            proximo |= uniao
+        return proximo
+
+    def e_final(self, mascara):
+        return bool(mascara & self._mascara_finais)
+
+    def processar_cadeia(self, cadeia):
+        estado_atual = self.inicial
+        for simbolo in cadeia:
+            indice = self.indice_simbolo.get(simbolo)
+            if indice is None:
+                registro.debug("Símbolo '%s' não pertence ao alfabeto %s.", simbolo, self.simbolos)
+                return False
+            if not estado_atual:
+                return False
+
+            estado_atual = self.passo(estado_atual, indice)
+
+        return self.e_final(estado_atual)
+
+    def processar_lote(self, cadeias):
+        # As cadeias são percorridas em ordem lexicográfica, e cada uma reaproveita
+        # os conjuntos ativos do prefixo que tem em comum com a anterior.
+        cadeias = list(cadeias)
+        try:
+            ordem = sorted(range(len(cadeias)), key=cadeias.__getitem__)
+        except TypeError:
+            ordem = range(len(cadeias))
+
+        indice_simbolo = self.indice_simbolo
+        aceitas = [False] * len(cadeias)
+        posicoes_invalidas = [-1] * len(cadeias)
+        # pilha[i] é o conjunto ativo depois dos i primeiros símbolos da cadeia anterior.
+        pilha = [self.inicial]
+        anterior = ()
+
+        for indice in ordem:
+            cadeia = cadeias[indice]
+            comum = 0
+            limite = min(len(anterior), len(cadeia), len(pilha) - 1)
+            while comum < limite and anterior[comum] == cadeia[comum]:
+                comum += 1
+            del pilha[comum + 1:]
+
+            estado_atual = pilha[-1]
+            for posicao in range(comum, len(cadeia)):
+                coluna = indice_simbolo.get(cadeia[posicao])
+                if coluna is None:
+                    posicoes_invalidas[indice] = posicao
+                    break
+                if estado_atual:
+                    estado_atual = self.passo(estado_atual, coluna)
+                pilha.append(estado_atual)
+            else:
+                aceitas[indice] = self.e_final(estado_atual)
+            anterior = cadeia
+
+        return ResultadoLote(aceitas, posicoes_invalidas)
+
+
+class _VisaoDeterministica:
+    # Percorre AFD, AFD compacto ou AFN (este via AFD preguiçoso) símbolo a símbolo,
+    # com os símbolos numerados num alfabeto comum; símbolos fora do alfabeto do
+    # autômato levam a um estado morto que não aceita.
+    MORTO = -1
+
+    def __init__(self, automato, simbolos):
+        if isinstance(automato, AutomatoFinitoNaoDeterministico):
+            self._preguicoso = AutomatoFinitoDeterministicoPreguicoso(automato)
+            self.inicial = self._preguicoso.q0
+            self._colunas = [self._preguicoso.indice_simbolo.get(simbolo) for simbolo in simbolos]
+            self.morto = 0
+            return
+
+        if isinstance(automato, AutomatoFinitoDeterministico):
+            automato = automato.compactar()
+        self._preguicoso = None
+        self._compacto = automato
+        self.inicial = automato.q0
+        self._colunas = [automato.indice_simbolo.get(simbolo) for simbolo in simbolos]
+        self.morto = self.MORTO
+
+    def proximo(self, estado, indice_simbolo):
+        coluna = self._colunas[indice_simbolo]
+        if coluna is None or estado == self.morto:
+            return self.morto
+        if self._preguicoso is not None:
+            return self._preguicoso.transicao(estado, coluna)
+        return self._compacto.delta[estado * self._compacto.k + coluna]
+
+    def e_final(self, estado):
+        if self._preguicoso is not None:
+            return self._preguicoso.e_final(estado)
+        return estado != self.morto and self._compacto.e_final(estado)
+
+def equivalentes(automato_a, automato_b):
+    # Hopcroft-Karp: percorre em largura os pares (estado de A, estado de B) e une
+    # as classes de cada par num union-find; um par cujos estados já estão na mesma
+    # classe é implicado pelos anteriores e não precisa ser expandido. Os AFNs são
+    # determinizados sob demanda, sem minimizar nada. Como a busca é em largura, o
+    # primeiro par com aceitação diferente dá um contraexemplo de tamanho mínimo.
+    # Devolve (True, None) ou (False, contraexemplo).
+    simbolos = sorted(_alfabeto_sem_epsilon(automato_a) | _alfabeto_sem_epsilon(automato_b))
+    visao_a = _VisaoDeterministica(automato_a, simbolos)
+    visao_b = _VisaoDeterministica(automato_b, simbolos)
+
+    representante = {}
+
+    def encontrar(chave):
+        raiz = chave
+        while representante.get(raiz, raiz) != raiz:
+            raiz = representante[raiz]
+        while chave != raiz:
+            representante[chave], chave = raiz, representante[chave]
+        return raiz
+
+    # Cada item da fila guarda o índice de quem o gerou e o símbolo lido, para
+    # reconstruir a palavra só quando houver contraexemplo.
+    # No union-find, o estado e de A vira a chave 2e e o de B vira 2e + 1 (o estado
+    # morto -1 vira -2 e -1), evitando uma tupla por consulta.
+    pares = [(visao_a.inicial, visao_b.inicial, -1, None)]
+    for posicao, (estado_a, estado_b, _, _) in enumerate(pares):
+        raiz_a = encontrar(2 * estado_a)
+        raiz_b = encontrar(2 * estado_b + 1)
+        if raiz_a == raiz_b:
+            continue
+
+        if visao_a.e_final(estado_a) != visao_b.e_final(estado_b):
+            palavra = []
+            while posicao > 0:
+                _, _, posicao, indice_simbolo = pares[posicao]
+                palavra.append(simbolos[indice_simbolo])
+            contraexemplo = "".join(reversed(palavra))
+            registro.info("Autômatos não equivalentes; contraexemplo: '%s'.", contraexemplo)
+            return False, contraexemplo
+
+        representante[raiz_a] = raiz_b
+        for indice_simbolo in range(len(simbolos)):
+            pares.append((
+                visao_a.proximo(estado_a, indice_simbolo),
+                visao_b.proximo(estado_b, indice_simbolo),
+                posicao,
+                indice_simbolo,
+            ))
+
+    registro.info("Autômatos equivalentes (%d pares unidos).", len(representante))
+    return True, None
+
+def _alfabeto_sem_epsilon(automato):
+    if isinstance(automato, AutomatoFinitoDeterministicoCompacto):
+        return set(automato.indice_simbolo)
+    if isinstance(automato, AutomatoFinitoNaoDeterministico):
+        return automato.Alfabeto - {automato.simbolo_epsilon}
+    return automato.Alfabeto | set(automato.classes_simbolos)
+
+
+class CacheResultados:
+    # Cache em disco dos resultados de processar_automato_completo, endereçado pelo
+    # hash canônico do autômato de entrada. Cada entrada é um arquivo <chave>.json
+    # com dados simples (listas, dicionários; conjuntos viram listas ordenadas),
+    # escrito num temporário e publicado com os.replace, então vários processos
+    # podem dividir o diretório. JSON, e não pickle, para que quem consegue
+    # escrever no diretório não consiga executar código em quem lê o cache.
+    # O mtime marca o último uso, e as entradas mais antigas saem primeiro quando o
+    # total passa de tamanho_maximo bytes. O total é estimado em memória a partir
+    # das gravações deste processo; o diretório só é varrido quando a estimativa
+    # passa do limite ou a cada GRAVACOES_ENTRE_VARREDURAS gravações.
+    def __init__(self, diretorio, tamanho_maximo=TAMANHO_PADRAO_CACHE):
+        self.diretorio = diretorio
+        self.tamanho_maximo = tamanho_maximo
+        self._total_estimado = None
+        self._gravacoes = 0
+        os.makedirs(diretorio, exist_ok=True)
+
+    def chave(self, automato, *parametros):
+        if isinstance(automato, AutomatoFinitoDeterministicoCompacto):
+            automato = automato.para_afd()
+
+        # Normalização: estados e símbolos viram índices na ordem ordenada dos nomes
+        # e δ vira uma lista ordenada de triplas, então a chave não depende da ordem
+        # de inserção nem da iteração de conjuntos e dicionários.
+        estados = sorted(automato.Q)
+        indice_estado = {estado: indice for indice, estado in enumerate(estados)}
+        simbolos = set(automato.Alfabeto)
+        for transicoes_origem in automato.Transicoes.mapa.values():
+            simbolos.update(transicoes_origem)
+        simbolos = sorted(simbolos)
+        indice_simbolo = {simbolo: indice for indice, simbolo in enumerate(simbolos)}
+
+        triplas = []
+        deterministico = isinstance(automato, AutomatoFinitoDeterministico)
+        for origem, transicoes_origem in automato.Transicoes.mapa.items():
+            i = indice_estado[origem]
+            for simbolo, destinos in transicoes_origem.items():
+                c = indice_simbolo[simbolo]
+                if deterministico:
+                    triplas.append((i, c, indice_estado[destinos]))
+                else:
+                    triplas.extend((i, c, indice_estado[destino]) for destino in destinos)
+        triplas.sort()
+
+        forma_canonica = (
+            VERSAO_CACHE, "AFD" if deterministico else "AFN", parametros,
+            estados, sorted(automato.Alfabeto), simbolos,
+            sorted(indice_estado[estado] for estado in getattr(automato, "iniciais", {automato.q0})),
+            sorted(indice_estado[estado] for estado in automato.F),
+            sorted(getattr(automato, "classes_simbolos", {}).items()),
+        )
+        resumo = hashlib.sha256(repr(forma_canonica).encode("utf-8"))
+        resumo.update(array('i', [valor for tripla in triplas for valor in tripla]).tobytes())
+        return resumo.hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave + ".json")
+
+    @staticmethod
+    def _para_dados(automato):
+        if automato is None:
+            return None
+        if isinstance(automato, AutomatoFinitoDeterministicoCompacto):
+            automato = automato.para_afd()
+        if isinstance(automato, AutomatoFinitoDeterministico):
+            return ["AFD", sorted(automato.Q), sorted(automato.Alfabeto), automato.Transicoes.mapa, automato.q0, sorted(automato.F), automato.classes_simbolos]
+        mapa = {
+            origem: {simbolo: sorted(destinos) for simbolo, destinos in transicoes_origem.items()}
+            for origem, transicoes_origem in automato.Transicoes.mapa.items()
+        }
+        return ["AFN", sorted(automato.Q), sorted(automato.Alfabeto), mapa, automato.q0, sorted(automato.F), sorted(automato.iniciais)]
+
+    @staticmethod
+    def _de_dados(dados):
+        if dados is None:
+            return None
+        # O último campo são as classes de símbolos (AFD) ou os iniciais (AFN).
+        tipo, estados, alfabeto, mapa, q0, finais, extra = dados
+        if tipo == "AFD":
+            transicoes = FuncaoTransicaoDFA()
+            transicoes.mapa = mapa
+            return AutomatoFinitoDeterministico(estados, alfabeto, transicoes, q0, finais, validar=False, classes_simbolos=extra)
+        transicoes = FuncaoTransicaoNFA()
+        transicoes.mapa = {
+            origem: {simbolo: set(destinos) for simbolo, destinos in transicoes_origem.items()}
+            for origem, transicoes_origem in mapa.items()
+        }
+        return AutomatoFinitoNaoDeterministico(estados, alfabeto, transicoes, q0, finais, validar=False, iniciais=extra)
+
+    def obter(self, chave):
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, "r", encoding="utf-8") as arquivo:
+                dados = json.load(arquivo)
+            resultado = {nome: self._de_dados(dados[nome]) for nome in ("afn", "afd", "minimo")}
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError, AttributeError):
+            # Entrada corrompida ou truncada: vira uma falta.
+            self._remover(caminho)
+            return None
+
+        try:
+            os.utime(caminho)
+        except OSError:
+            pass
+
+        return resultado
+
+    def guardar(self, chave, afn, afd, minimo):
+        dados = {
+            "afn": self._para_dados(afn),
+            "afd": self._para_dados(afd),
+            "minimo": self._para_dados(minimo),
+        }
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+        try:
+            with os.fdopen(descritor, "w", encoding="utf-8") as arquivo:
+                json.dump(dados, arquivo, ensure_ascii=False, separators=(",", ":"))
+                arquivo.flush()
+                tamanho = os.fstat(arquivo.fileno()).st_size
+            os.replace(temporario, self._caminho(chave))
+        except BaseException:
+            self._remover(temporario)
+            raise
+
+        self._gravacoes += 1
+        if self._total_estimado is not None:
+            # Regravar uma chave existente conta duas vezes; a estimativa só erra
+            # para cima, o que no máximo antecipa a varredura.
+            self._total_estimado += tamanho
+        if (
+            self._total_estimado is None
+            or self._total_estimado > self.tamanho_maximo
+            or self._gravacoes >= GRAVACOES_ENTRE_VARREDURAS
+        ):
+            self.podar()
+
+    @staticmethod
+    def _remover(caminho):
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+
+    def entradas(self):
+        # Também apaga o que sobrou de gravações interrompidas (temporários órfãos)
+        # e as entradas .pkl de versões anteriores do cache.
+        entradas = []
+        limite_orfaos = time.time() - IDADE_TEMPORARIO_ORFAO
+        for nome in os.listdir(self.diretorio):
+            caminho = os.path.join(self.diretorio, nome)
+            try:
+                informacoes = os.stat(caminho)
+            except FileNotFoundError:
+                continue
+            if nome.endswith(".pkl") or (nome.endswith(".tmp") and informacoes.st_mtime < limite_orfaos):
+                self._remover(caminho)
+            elif nome.endswith(".json"):
+                entradas.append((informacoes.st_mtime, informacoes.st_size, caminho))
+        return entradas
+
+    def podar(self):
+        entradas = sorted(self.entradas())
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        if total > self.tamanho_maximo:
+            alvo = self.tamanho_maximo * FRACAO_APOS_PODA
+            for _, tamanho, caminho in entradas:
+                if total <= alvo:
+                    break
+                self._remover(caminho)
+                total -= tamanho
+        self._total_estimado = total
+        self._gravacoes = 0
+
+    def limpar(self):
+        for _, _, caminho in self.entradas():
+            self._remover(caminho)
+        self._total_estimado = 0
+
+
+class _AnalisadorExpressao:
+    # Descida recursiva sobre a gramática usual (união < concatenação < operadores
+    # posfixos). Cada ocorrência de símbolo vira uma folha ("simbolos", conjunto,
+    # negado); '.' e [^...] são resolvidos depois, contra o alfabeto completo.
+    # Espaços fora de classes são ignorados, já que no formato de texto os
+    # símbolos não podem contê-los.
+    def __init__(self, expressao):
+        self.expressao = expressao
+        self.posicao = 0
+        self.literais = set()
+
+    def _erro(self, mensagem):
+        raise ValueError(f"Expressão regular inválida na posição {self.posicao}: {mensagem}.")
+
+    def _espiar(self):
+        while self.posicao < len(self.expressao) and self.expressao[self.posicao].isspace():
+            self.posicao += 1
+        return self.expressao[self.posicao] if self.posicao < len(self.expressao) else None
+
+    def _literal(self, caractere):
+        if caractere == SIMBOLO_EPSILON:
+            self._erro(f"'{SIMBOLO_EPSILON}' é o símbolo épsilon e não pode ser usado como literal")
+        self.literais.add(caractere)
+        return caractere
+
+    def analisar(self):
+        arvore = self._uniao()
+        if self._espiar() is not None:
+            self._erro("')' sem '(' correspondente")
+        return arvore
+
+    def _uniao(self):
+        alternativas = [self._concatenacao()]
+        while self._espiar() == "|":
+            self.posicao += 1
+            alternativas.append(self._concatenacao())
+        return alternativas[0] if len(alternativas) == 1 else ("uniao", alternativas)
+
+    def _concatenacao(self):
+        fatores = []
+        while self._espiar() not in (None, "|", ")"):
+            fatores.append(self._repeticao())
+        if not fatores:
+            return ("vazia",)
+        return fatores[0] if len(fatores) == 1 else ("concatenacao", fatores)
+
+    def _repeticao(self):
+        no = self._atomo()
+        while True:
+            operador = self._espiar()
+            if operador == "*":
+                no = ("estrela", no)
+            elif operador == "+":
+                no = ("mais", no)
+            elif operador == "?":
+                no = ("opcional", no)
+            elif operador == "{":
+                minimo, maximo = self._limites()
+                no = ("repeticao", no, minimo, maximo)
+                continue
+            else:
+                return no
+            self.posicao += 1
+
+    def _limites(self):
+        # {m}, {m,} ou {m,n}; o cursor está no '{'.
+        fim = self.expressao.find("}", self.posicao)
+        partes = self.expressao[self.posicao + 1:fim].replace(" ", "").split(",") if fim >= 0 else []
+        if not 1 <= len(partes) <= 2 or not partes[0].isdigit() or (len(partes) == 2 and partes[1] and not partes[1].isdigit()):
+            self._erro("repetição deve ter a forma {m}, {m,} ou {m,n}")
+        minimo = int(partes[0])
+        maximo = minimo if len(partes) == 1 else (int(partes[1]) if partes[1] else None)
+        if maximo is not None and maximo < minimo:
+            self._erro(f"repetição {{{minimo},{maximo}}} com máximo menor que o mínimo")
+        self.posicao = fim + 1
+        return minimo, maximo
+
+    def _atomo(self):
+        caractere = self._espiar()
+        self.posicao += 1
+        if caractere == "(":
+            no = self._uniao()
+            if self._espiar() != ")":
+                self._erro("'(' sem ')' correspondente")
+            self.posicao += 1
+            return no
+        if caractere == "[":
+            return self._classe()
+        if caractere == ".":
+            return ("simbolos", frozenset(), True)
+        if caractere == SIMBOLO_EPSILON:
+            return ("vazia",)
+        if caractere in ("*", "+", "?", "{"):
+            self.posicao -= 1
+            self._erro(f"'{caractere}' sem operando")
+        if caractere == "\\":
+            if self.posicao >= len(self.expressao):
+                self._erro("'\\' no fim da expressão")
+            caractere = self.expressao[self.posicao]
+            self.posicao += 1
+        return ("simbolos", frozenset((self._literal(caractere),)), False)
+
+    def _classe(self):
+        # [abc], [a-z0-9], [^...]; dentro da classe só '\\', ']', '-' e '^' são especiais.
+        negado = self.expressao.startswith("^", self.posicao)
+        if negado:
+            self.posicao += 1
+        simbolos = set()
+        inicio_classe = self.posicao
+        while True:
+            if self.posicao >= len(self.expressao):
+                self._erro("'[' sem ']' correspondente")
+            caractere = self.expressao[self.posicao]
+            self.posicao += 1
+            if caractere == "]" and self.posicao - 1 > inicio_classe:
+                break
+            if caractere == "\\":
+                if self.posicao >= len(self.expressao):
+                    self._erro("'\\' no fim da expressão")
+                caractere = self.expressao[self.posicao]
+                self.posicao += 1
+            if self.expressao.startswith("-", self.posicao) and self.posicao + 1 < len(self.expressao) and self.expressao[self.posicao + 1] != "]":
+                ultimo = self.expressao[self.posicao + 1]
+                if ultimo == "\\" and self.posicao + 2 < len(self.expressao):
+                    ultimo = self.expressao[self.posicao + 2]
+                    self.posicao += 1
+                self.posicao += 2
+                if ord(ultimo) < ord(caractere):
+                    self._erro(f"intervalo '{caractere}-{ultimo}' invertido")
+                simbolos.update(self._literal(chr(codigo)) for codigo in range(ord(caractere), ord(ultimo) + 1))
+            else:
+                simbolos.add(self._literal(caractere))
+        return ("simbolos", frozenset(simbolos), negado)
+
+def analisar_expressao_regular(expressao, alfabeto=None):
+    # Devolve (árvore sintática, alfabeto): o alfabeto são os símbolos que aparecem
+    # na expressão mais `alfabeto`, que também é o universo de '.' e de [^...].
+    analisador = _AnalisadorExpressao(expressao)
+    arvore = analisador.analisar()
+    universo = analisador.literais | set(alfabeto or ())
+    if SIMBOLO_EPSILON in universo:
+        raise ValueError(f"'{SIMBOLO_EPSILON}' é o símbolo épsilon e não pode fazer parte do alfabeto.")
+    return arvore, universo
+
+def construir_afn_glushkov(expressao, alfabeto=None, estatisticas=None):
+    # Autômato de posições (Glushkov): um estado por ocorrência de símbolo mais o
+    # inicial, sem nenhuma transição ε, então o pipeline vai direto à determinização.
+    # Entrar na posição p consome o símbolo de p; os conjuntos anulável, primeiros,
+    # últimos e seguintes são máscaras de bits sobre as posições.
+    arvore, universo = analisar_expressao_regular(expressao, alfabeto)
+    simbolos_posicao = [frozenset()]
+    seguintes = [0]
+
+    def concatenar(esquerda, direita):
+        anulavel_esquerda, primeiros_esquerda, ultimos_esquerda = esquerda
+        anulavel_direita, primeiros_direita, ultimos_direita = direita
+        if primeiros_direita:
+            for posicao in _indices_bits(ultimos_esquerda):
+                seguintes[posicao] |= primeiros_direita
+        return (
+            anulavel_esquerda and anulavel_direita,
+            primeiros_esquerda | (primeiros_direita if anulavel_esquerda else 0),
+            ultimos_direita | (ultimos_esquerda if anulavel_direita else 0),
+        )
+
+    def fechar(resultado):
+        anulavel, primeiros, ultimos = resultado
+        for posicao in _indices_bits(ultimos):
+            seguintes[posicao] |= primeiros
+        return resultado
+
+    def visitar(no):
+        tipo = no[0]
+        if tipo == "simbolos":
+            _, simbolos, negado = no
+            posicao = len(simbolos_posicao)
+            simbolos_posicao.append(universo - simbolos if negado else simbolos)
+            seguintes.append(0)
+            return (False, 1 << posicao, 1 << posicao)
+        if tipo == "vazia":
+            return (True, 0, 0)
+        if tipo == "concatenacao":
+            resultado = (True, 0, 0)
+            for filho in no[1]:
+                resultado = concatenar(resultado, visitar(filho))
+            return resultado
+        if tipo == "uniao":
+            anulavel, primeiros, ultimos = False, 0, 0
+            for filho in no[1]:
+                anulavel_filho, primeiros_filho, ultimos_filho = visitar(filho)
+                anulavel = anulavel or anulavel_filho
+                primeiros |= primeiros_filho
+                ultimos |= ultimos_filho
+            return (anulavel, primeiros, ultimos)
+        if tipo == "estrela":
+            _, primeiros, ultimos = fechar(visitar(no[1]))
+            return (True, primeiros, ultimos)
+        if tipo == "mais":
+            return fechar(visitar(no[1]))
+        if tipo == "opcional":
+            _, primeiros, ultimos = visitar(no[1])
+            return (True, primeiros, ultimos)
+
+        # Repetição {m,n}: m cópias seguidas de x(x(x)?)? com n - m cópias, montado de
+        # dentro para fora para não aprofundar a recursão; {m,} termina em x*.
+        _, filho, minimo, maximo = no
+        resultado = (True, 0, 0)
+        for _ in range(minimo):
+            resultado = concatenar(resultado, visitar(filho))
+        if maximo is None:
+            _, primeiros, ultimos = fechar(visitar(filho))
+            return concatenar(resultado, (True, primeiros, ultimos))
+        cauda = (True, 0, 0)
+        for _ in range(maximo - minimo):
+            _, primeiros, ultimos = concatenar(visitar(filho), cauda)
+            cauda = (True, primeiros, ultimos)
+        return concatenar(resultado, cauda)
+
+    anulavel, seguintes[0], ultimos = visitar(arvore)
+
+    estados = [f"q{posicao}" for posicao in range(len(simbolos_posicao))]
+    transicoes = FuncaoTransicaoNFA()
+    for origem, destinos in enumerate(seguintes):
+        transicoes_origem = {}
+        for destino in _indices_bits(destinos):
+            for simbolo in simbolos_posicao[destino]:
+                transicoes_origem.setdefault(simbolo, set()).add(estados[destino])
+        if transicoes_origem:
+            transicoes.mapa[estados[origem]] = transicoes_origem
+
+    finais = {estados[posicao] for posicao in _indices_bits(ultimos)}
+    if anulavel:
+        finais.add(estados[0])
+    _contar(estatisticas, "posicoes_glushkov", len(estados) - 1)
+
+    return AutomatoFinitoNaoDeterministico(
+        Q=estados,
+        Alfabeto=universo,
+        Transicoes=transicoes,
+        q0=estados[0],
+        F=finais,
+        validar=False
+    )
+
+def _e_arquivo_binario(caminho_arquivo):
+    try:
+        with open(caminho_arquivo, 'rb') as f:
+            return f.read(len(MAGICO_BINARIO)) == MAGICO_BINARIO
+    except OSError:
+        return False
+
+def _mapa_dfa_para_nfa(mapa):
+    return {
+        origem: {simbolo: {destino} for simbolo, destino in transicoes.items()}
+        for origem, transicoes in mapa.items()
+    }
+
+def _adicionar_lote_transicoes(lote, mapa, deterministico, nomes, simbolos_usados, destinos_usados):
+    # O lote é inserido direto em δ, no formato de AFD enquanto nenhum par
+    # (origem, símbolo) se repetir; na primeira repetição o mapa passa para o
+    # formato de AFN e o lote é reinserido (conjuntos ignoram repetições).
+    # Cada linha é dividida e validada por si: contando as partes do lote inteiro,
+    # uma linha com partes a menos e outra com partes a mais se compensariam.
+    # As listas de cada linha são descartadas na hora, então a checagem não
+    # pressiona o coletor de lixo; os dados saem da divisão do lote inteiro.
+    if lote and set(map(len, map(str.split, lote))) != {3}:
+        linha = next(linha for linha in lote if len(linha.split()) != 3)
+        raise ValueError(f"Formato de transição inválido: '{linha}'")
+
+    partes = " ".join(lote).split()
+    origens = partes[0::3]
+    simbolos = partes[1::3]
+    destinos = partes[2::3]
+    simbolos_usados.update(simbolos)
+    destinos_usados.update(destinos)
+    internar = nomes.setdefault
+
+    if deterministico:
+        for origem, simbolo, destino in zip(origens, simbolos, destinos):
+            transicoes_origem = mapa.get(origem)
+            if transicoes_origem is None:
+                transicoes_origem = mapa[internar(origem, origem)] = {}
+            elif simbolo in transicoes_origem:
+                mapa = _mapa_dfa_para_nfa(mapa)
+                deterministico = False
+                break
+            transicoes_origem[simbolo] = internar(destino, destino)
+
+    if not deterministico:
+        for origem, simbolo, destino in zip(origens, simbolos, destinos):
+            transicoes_origem = mapa.get(origem)
+            if transicoes_origem is None:
+                transicoes_origem = mapa[internar(origem, origem)] = {}
+            destinos_simbolo = transicoes_origem.get(simbolo)
+            if destinos_simbolo is None:
+                transicoes_origem[simbolo] = {internar(destino, destino)}
+            else:
+                destinos_simbolo.add(internar(destino, destino))
+
+    return mapa, deterministico
+
+def carregar_automato(caminho_arquivo):
+    if _e_arquivo_binario(caminho_arquivo):
+        registro.info("Lendo autômato binário de: %s", caminho_arquivo)
+        return AutomatoFinitoDeterministicoCompacto.carregar_binario(caminho_arquivo)
+
+    estados = set()
+    alfabeto = set()
+    estado_inicial = None
+    estados_finais = set()
+    
+    # Leitura em uma passada: as linhas de transição são acumuladas em lotes e
+    # inseridas direto em δ, e nomes repetidos passam a apontar para um único str.
+    mapa_transicoes = {}
+    e_deterministico = True
+    nomes = {}
+    simbolos_usados = set()
+    destinos_usados = set()
+    expressoes = []
+    lote = []
+
+    modo_atual = None
+    
+    registro.info("Lendo arquivo de autômato de: %s", caminho_arquivo)
+    
+    try:
+        with open(caminho_arquivo, 'r', encoding='utf-8') as f:
+            for linha in f:
+                linha = linha.strip()
+                
+                if not linha or linha[0] == '#':
+                    continue
+                
+                if linha[0] == '[' and linha[-1] == ']':
+                    if lote:
+                        mapa_transicoes, e_deterministico = _adicionar_lote_transicoes(
+                            lote, mapa_transicoes, e_deterministico, nomes, simbolos_usados, destinos_usados
+                        )
+                        lote = []
+                    modo_atual = linha
+                    continue
+                
+                if modo_atual == '[TRANSICOES]':
+                    lote.append(linha)
+                    if len(lote) >= TAMANHO_LOTE_LEITURA:
+                        mapa_transicoes, e_deterministico = _adicionar_lote_transicoes(
+                            lote, mapa_transicoes, e_deterministico, nomes, simbolos_usados, destinos_usados
+                        )
+                        lote = []
+
+                elif modo_atual == '[ESTADOS]':
+                    estados.add(nomes.setdefault(linha, linha))
+                
+                elif modo_atual == '[ALFABETO]':
+                    alfabeto.add(linha)
+
+                elif modo_atual == '[EXPRESSAO]':
+                    expressoes.append(linha)
+                    
+                elif modo_atual == '[INICIAL]':
+                    if estado_inicial:
+                        raise ValueError("Erro: Múltiplos estados iniciais definidos.")
+                    estado_inicial = nomes.setdefault(linha, linha)
+                    
+                elif modo_atual == '[FINAIS]':
+                    estados_finais.add(nomes.setdefault(linha, linha))
+
+            if lote:
+                mapa_transicoes, e_deterministico = _adicionar_lote_transicoes(
+                    lote, mapa_transicoes, e_deterministico, nomes, simbolos_usados, destinos_usados
+                )
+
+    except FileNotFoundError:
+        registro.error("Erro: Arquivo não encontrado em '%s'", caminho_arquivo)
+        return None
+    except Exception as e:
+        registro.error("Erro ao processar o arquivo: %s", e)
+        return None
+
+    if expressoes:
+        # Uma expressão regular no lugar da tabela: cada linha é uma alternativa, e
+        # [ALFABETO] completa o universo de '.' e [^...].
+        if estados or estado_inicial or estados_finais or mapa_transicoes:
+            raise ValueError("Erro: [EXPRESSAO] não pode ser combinada com estados ou transições.")
+        registro.info(">>> Expressão regular detectada. Construindo o autômato de posições (Glushkov).")
+        return construir_afn_glushkov("|".join(f"({expressao})" for expressao in expressoes), alfabeto)
+
+    if not estado_inicial:
+        raise ValueError("Erro: Nenhum estado inicial definido.")
+    estados.update(estados_finais)
+    estados.add(estado_inicial)
+
+    tem_epsilon = SIMBOLO_EPSILON in simbolos_usados
+    alfabeto.update(simbolos_usados - {SIMBOLO_EPSILON})
+
+    # As verificações de _validar são feitas aqui com operações de conjunto, e os
+    # construtores são chamados com validar=False.
+    if tem_epsilon or not e_deterministico:
+        registro.info(">>> Autômato detectado como AFN ou AFNe.")
+
+        if e_deterministico:
+            mapa_transicoes = _mapa_dfa_para_nfa(mapa_transicoes)
+
+        for usados, papel in ((set(mapa_transicoes), "origem"), (destinos_usados, "destino")):
+            fora_de_q = usados - estados
+            if fora_de_q:
+                raise ValueError(f"Estado de {papel} '{min(fora_de_q)}' em Transicoes não pertence a Q.")
+
+        transicoes_nfa = FuncaoTransicaoNFA()
+        transicoes_nfa.mapa = mapa_transicoes
+        return AutomatoFinitoNaoDeterministico(
+            Q=estados,
             Alfabeto=alfabeto,
             Transicoes=transicoes_nfa,
             q0=estado_inicial,
-            F=estados_finais
+            F=estados_finais,
+            validar=False
         )
     
     else:
-        print(">>> Autômato detectado como AFD.")
+        registro.info(">>> Autômato detectado como AFD.")
+
+        # Sem pares (origem, símbolo) repetidos e sem símbolos fora de Σ, ter |Σ|
+        # transições equivale a estar completo.
+        for estado in estados:
+            transicoes_estado = mapa_transicoes.get(estado)
+            if transicoes_estado is None:
+                raise ValueError(f"Função delta incompleta: Estado '{estado}' não possui transições.")
+            if len(transicoes_estado) != len(alfabeto):
+                faltante = min(alfabeto - set(transicoes_estado))
+                raise ValueError(f"Função delta incompleta: Estado '{estado}' não tem transição para o símbolo '{faltante}'.")
+
+        if not destinos_usados <= estados:
+            for estado in estados:
+                for simbolo, destino in mapa_transicoes[estado].items():
+                    if destino not in estados:
+                        raise ValueError(f"Estado de destino '{destino}' (de δ({estado},{simbolo})) não pertence a Q.")
+
         transicoes_dfa = FuncaoTransicaoDFA()
-        for origem, transicoes in transicoes_nfa.mapa.items():
-            for simbolo, destinos in transicoes.items():
-                destino_unico = list(destinos)[0]
-                transicoes_dfa.adicionar(origem, simbolo, destino_unico)
-                
+        transicoes_dfa.mapa = mapa_transicoes
         return AutomatoFinitoDeterministico(
             Q=estados,
             Alfabeto=alfabeto,
             Transicoes=transicoes_dfa,
             q0=estado_inicial,
-            F=estados_finais
+            F=estados_finais,
+            validar=False
         )
 
-def processar_automato_completo(automato_entrada):
-    print("=============================================")
-    print("=== INICIANDO PROCESSAMENTO DO AUTÔMATO ===")
-    print("=============================================\n")
+def processar_automato_completo(automato_entrada, motor_minimizacao=MOTOR_HOPCROFT, modo_determinizacao=MODO_BITSET, conversao_direta=False, cache=None, estatisticas=None, estrategia=ESTRATEGIA_SUBCONJUNTOS, comprimir_alfabeto=True, podar_estados=True, limite_superestados=None, trabalhadores_determinizacao=None, orcamento_superestados=None, checkpoint_determinizacao=None):
+    # As métricas da execução ficam em `estatisticas` (criado aqui se não for
+    # passado) e também no atributo .estatisticas do AFD mínimo devolvido.
+    # `estrategia` escolhe o caminho: subconjuntos + minimização por `motor_minimizacao`,
+    # Brzozowski (reverter, determinizar, reverter, determinizar) ou "auto", que
+    # decide por uma estimativa barata do tamanho dos dois AFDs.
+    # Com `comprimir_alfabeto`, as etapas rodam sobre as classes de símbolos
+    # equivalentes e o AFD mínimo recebe a tabela símbolo -> representante.
+    # Com `podar_estados`, estados inalcançáveis ou sem caminho até F saem do AFN
+    # antes da determinização.
+    # Se a construção de subconjuntos passar de `limite_superestados`, o resultado
+    # é um SimuladorAFN em vez de um AFD mínimo (o cache não guarda esse caso).
+    # `trabalhadores_determinizacao` é o número de processos do modo "paralelo".
+    # Com `orcamento_superestados` ou `checkpoint_determinizacao` (arquivo sqlite),
+    # a etapa AFN -> AFD usa converter_afn_para_afd_em_disco no lugar do modo. Só
+    # a construção de subconjuntos sobre o AFN transborda para disco: o orçamento
+    # não combina com `conversao_direta` nem com Brzozowski, e "auto" fica nos
+    # subconjuntos.
+    if estrategia not in ESTRATEGIAS:
+        raise ValueError(f"Estratégia '{estrategia}' desconhecida. Opções: {ESTRATEGIAS}.")
+    em_disco = orcamento_superestados is not None or checkpoint_determinizacao is not None
+    if em_disco and conversao_direta:
+        raise ValueError("O orçamento de superestados em disco não se aplica à conversão direta de AFNe para AFD.")
+    if em_disco and estrategia == ESTRATEGIA_BRZOZOWSKI:
+        raise ValueError("O orçamento de superestados em disco não se aplica à estratégia de Brzozowski.")
+    if em_disco and estrategia == ESTRATEGIA_AUTOMATICA:
+        estrategia = ESTRATEGIA_SUBCONJUNTOS
+
+    if estatisticas is None:
+        estatisticas = Estatisticas()
+
+    registro.info("=============================================")
+    registro.info("=== INICIANDO PROCESSAMENTO DO AUTÔMATO ===")
+    registro.info("=============================================\n")
 
     afd_para_minimizar = None
+    automato_afn = None
+    automato_minimizado = None
+    chave_cache = None
+
+    tipos_validos = (AutomatoFinitoDeterministico, AutomatoFinitoDeterministicoCompacto, AutomatoFinitoNaoDeterministico)
+    if cache is not None and isinstance(automato_entrada, tipos_validos):
+        with estatisticas.etapa("cache"):
+            chave_cache = cache.chave(automato_entrada, motor_minimizacao, modo_determinizacao, conversao_direta, estrategia, comprimir_alfabeto, podar_estados)
+            resultado_cache = cache.obter(chave_cache)
+        if resultado_cache is not None:
+            estatisticas.contar("acertos_cache")
+            registro.info(">>> Resultado encontrado no cache (%s). Pulando conversão e minimização.", chave_cache[:12])
+            registro.debug("\n--- AFD MÍNIMO FINAL ---\n%s", resultado_cache["minimo"])
+            resultado_cache["minimo"].estatisticas = estatisticas
+            return resultado_cache["minimo"]
+        estatisticas.contar("faltas_cache")
+
+    classes = None
+    if comprimir_alfabeto and isinstance(automato_entrada, tipos_validos):
+        with estatisticas.etapa("compressao_alfabeto"):
+            classes = automato_entrada.classes_de_simbolos()
+            numero_classes = len(set(classes.values()))
+            if numero_classes < len(classes):
+                automato_entrada = automato_entrada.comprimir_alfabeto(classes)
+            else:
+                classes = None
+        estatisticas.contar("classes_simbolos", numero_classes)
+        if classes is not None:
+            registro.info(">>> Alfabeto comprimido: %d símbolos em %d classes.", len(classes), numero_classes)
+
+    if isinstance(automato_entrada, (AutomatoFinitoDeterministico, AutomatoFinitoDeterministicoCompacto)):
+        # Um AFD já é determinístico: Brzozowski só troca o motor de minimização.
+        if estrategia == ESTRATEGIA_BRZOZOWSKI:
+            motor_minimizacao = MOTOR_BRZOZOWSKI
 
     if isinstance(automato_entrada, AutomatoFinitoDeterministico):
-        print(">>> TIPO DETECTADO: AFD (Autômato Finito Determinístico).")
-        print(">>> O autômato já é determinístico. Pulando para minimização.")
+        registro.info(">>> TIPO DETECTADO: AFD (Autômato Finito Determinístico).")
+        registro.info(">>> O autômato já é determinístico. Pulando para minimização.")
+        afd_para_minimizar = automato_entrada
+
+    elif isinstance(automato_entrada, AutomatoFinitoDeterministicoCompacto):
+        registro.info(">>> TIPO DETECTADO: AFD compacto (formato binário).")
+        registro.info(">>> O autômato já é determinístico. Pulando para minimização.")
         afd_para_minimizar = automato_entrada
+        if motor_minimizacao != MOTOR_HOPCROFT:
+            afd_para_minimizar = automato_entrada.para_afd()
 
     elif isinstance(automato_entrada, AutomatoFinitoNaoDeterministico):
+
+        if podar_estados:
+            with estatisticas.etapa("poda"):
+                automato_entrada = automato_entrada.remover_estados_inuteis(estatisticas)
+
+        if estrategia == ESTRATEGIA_AUTOMATICA:
+            with estatisticas.etapa("estimativa"):
+                estrategia = automato_entrada.escolher_estrategia()
+            registro.info(">>> Estratégia escolhida automaticamente: %s.", estrategia)
+        estatisticas.contar(f"estrategia_{estrategia}")
+
+        try:
+            if estrategia == ESTRATEGIA_BRZOZOWSKI:
+                registro.info("\n--- ETAPAS 1 a 3: Minimização de Brzozowski ---")
+                with estatisticas.etapa("brzozowski"):
+                    automato_minimizado = automato_entrada.minimizar_brzozowski(estatisticas, limite_superestados)
         
-        automato_afn = None
-        
-        if automato_entrada.possui_transicoes_epsilon():
-            print(">>> TIPO DETECTADO: AFNe (Contém transições épsilon).")
+            elif automato_entrada.possui_transicoes_epsilon():
+                registro.info(">>> TIPO DETECTADO: AFNe (Contém transições épsilon).")
             
-            print("\n--- ETAPA 1: Convertendo AFNe para AFN (sem épsilon) ---")
-            automato_afn = automato_entrada.converter_para_afn_sem_epsilon()
+                if conversao_direta:
+                    registro.info("\n--- ETAPAS 1 e 2: Convertendo AFNe diretamente para AFD ---")
+                    with estatisticas.etapa("afne_para_afd"):
+                        afd_para_minimizar = automato_entrada.converter_afne_para_afd(estatisticas, limite_superestados)
+                else:
+                    registro.info("\n--- ETAPA 1: Convertendo AFNe para AFN (sem épsilon) ---")
+                    with estatisticas.etapa("afne_para_afn"):
+                        automato_afn = automato_entrada.converter_para_afn_sem_epsilon(estatisticas)
             
-        else:
-            print(">>> TIPO DETECTADO: AFN (Sem transições épsilon).")
-            automato_afn = automato_entrada
+            else:
+                registro.info(">>> TIPO DETECTADO: AFN (Sem transições épsilon).")
+                automato_afn = automato_entrada
         
-        print("\n--- ETAPA 2: Convertendo AFN para AFD ---")
-        afd_para_minimizar = automato_afn.converter_afn_para_afd()
-        print("--- AFD Intermediário Gerado ---")
-        print(afd_para_minimizar)
+            if automato_afn:
+                registro.info("\n--- ETAPA 2: Convertendo AFN para AFD ---")
+                with estatisticas.etapa("afn_para_afd"):
+                    if em_disco:
+                        afd_para_minimizar = automato_afn.converter_afn_para_afd_em_disco(
+                            checkpoint_determinizacao, orcamento_superestados or ORCAMENTO_PADRAO_SUPERESTADOS,
+                            estatisticas, limite_superestados
+                        )
+                        if motor_minimizacao != MOTOR_HOPCROFT:
+                            afd_para_minimizar = afd_para_minimizar.para_afd()
+                    else:
+                        afd_para_minimizar = automato_afn.converter_afn_para_afd(
+                            modo=modo_determinizacao, estatisticas=estatisticas, limite_estados=limite_superestados,
+                            trabalhadores=trabalhadores_determinizacao
+                        )
+        except LimiteEstadosExcedido as erro:
+            # Sem orçamento para determinizar: o AFN (já comprimido, podado e, se
+            # deu tempo, sem ε) é simulado diretamente, com a mesma interface de
+            # reconhecimento.
+            registro.warning(">>> %s Usando a simulação do AFN, sem determinizar.", erro)
+            estatisticas.contar("simulacao_afn")
+            simulador = SimuladorAFN(automato_afn or automato_entrada, classes)
+            simulador.estatisticas = estatisticas
+            return simulador
+        if afd_para_minimizar:
+            registro.debug("--- AFD Intermediário Gerado ---\n%s", afd_para_minimizar)
 
     else:
-        print(f"TIPO DESCONHECIDO: O objeto fornecido não é um autômato válido.")
+        registro.error("TIPO DESCONHECIDO: O objeto fornecido não é um autômato válido.")
         return None
 
-    if afd_para_minimizar:
-        print("\n--- ETAPA 3: Minimizando o AFD ---")
-        automato_minimizado = afd_para_minimizar.minimizar()
-        
-        print("\n=============================================")
-        print("=== PROCESSAMENTO CONCLUÍDO ===")
-        print("=============================================\n")
-        print("--- AFD MÍNIMO FINAL ---")
-        print(automato_minimizado)
-        return automato_minimizado
-    
-    return None
+    if automato_minimizado is None and afd_para_minimizar:
+        registro.info("\n--- ETAPA 3: Minimizando o AFD ---")
+        with estatisticas.etapa("minimizacao"):
+            if isinstance(afd_para_minimizar, AutomatoFinitoDeterministicoCompacto):
+                automato_minimizado = afd_para_minimizar.minimizar(estatisticas).para_afd()
+            else:
+                automato_minimizado = afd_para_minimizar.minimizar(motor=motor_minimizacao, estatisticas=estatisticas)
 
+        if isinstance(afd_para_minimizar, AutomatoFinitoDeterministicoCompacto):
+            estatisticas.contar("estados_afd", afd_para_minimizar.n)
+        else:
+            estatisticas.contar("estados_afd", len(afd_para_minimizar.Q))
 
-try:
-    meu_automato = carregar_automato("entrada.txt") 
+    if automato_minimizado is None:
+        return None
+
+    if classes is not None:
+        automato_minimizado = automato_minimizado.comprimir_alfabeto(classes)
+
+    if chave_cache is not None:
+        with estatisticas.etapa("cache"):
+            cache.guardar(chave_cache, automato_afn, afd_para_minimizar, automato_minimizado)
+
+    estatisticas.contar("estados_minimo", len(automato_minimizado.Q))
+    automato_minimizado.estatisticas = estatisticas
     
-    if meu_automato:
-        afd_minimo_final = processar_automato_completo(meu_automato)
+    registro.info("\n=============================================")
+    registro.info("=== PROCESSAMENTO CONCLUÍDO ===")
+    registro.info("=============================================\n")
+    registro.debug("--- AFD MÍNIMO FINAL ---\n%s", automato_minimizado)
+    return automato_minimizado
+
+
+class _TempoEsgotado(BaseException):
+    # BaseException para não ser engolida pelos `except Exception` do pipeline.
+    pass
+
+def _estourar_tempo(sinal, quadro):
+    raise _TempoEsgotado()
+
+class _ColetorErros(logging.Handler):
+    # carregar_automato registra o erro e devolve None; o trabalhador usa a
+    # mensagem registrada no relatório.
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.mensagens = []
+
+    def emit(self, registro_log):
+        self.mensagens.append(registro_log.getMessage().strip())
+
+def _iniciar_trabalhador(limite_memoria):
+    # O limite vale para o espaço de endereçamento do processo trabalhador inteiro
+    # (interpretador incluído); um arquivo que passa dele termina em MemoryError.
+    registro.propagate = False
+    if limite_memoria and resource is not None:
+        _, maximo = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (limite_memoria, maximo))
+
+def _processar_arquivo(arquivo, caminho_saida, formato, opcoes_pipeline, tempo_limite):
+    resultado = {"arquivo": arquivo, "status": STATUS_OK, "saida": None, "erro": None}
+    coletor = _ColetorErros()
+    registro.addHandler(coletor)
+    # O tempo limite usa SIGALRM, então só existe onde há setitimer (Unix). Um
+    # passo longo dentro de código C só é interrompido quando ele termina.
+    alarme = bool(tempo_limite) and hasattr(signal, "setitimer")
+    if alarme:
+        tratador_anterior = signal.signal(signal.SIGALRM, _estourar_tempo)
+        signal.setitimer(signal.ITIMER_REAL, tempo_limite)
+    inicio = time.perf_counter()
+
+    try:
+        automato = carregar_automato(arquivo)
+        if automato is None:
+            raise ValueError(coletor.mensagens[-1] if coletor.mensagens else "Falha ao carregar o autômato.")
+        resultado["tipo"] = type(automato).__name__
+        if isinstance(automato, AutomatoFinitoDeterministicoCompacto):
+            resultado["estados_entrada"] = automato.n
+        else:
+            resultado["estados_entrada"] = len(automato.Q)
+
+        minimo = processar_automato_completo(automato, **opcoes_pipeline)
+        if minimo is None:
+            raise ValueError("O pipeline não produziu um autômato.")
+        resultado["estatisticas"] = minimo.estatisticas.para_dicionario()
+
+        if isinstance(minimo, SimuladorAFN):
+            # Sem AFD não há o que gravar; o relatório registra a queda para simulação.
+            resultado["status"] = STATUS_SIMULACAO
+        else:
+            resultado["estados_minimo"] = len(minimo.Q)
+            os.makedirs(os.path.dirname(caminho_saida) or ".", exist_ok=True)
+            if formato == FORMATO_BINARIO:
+                minimo.salvar_binario(caminho_saida)
+            else:
+                minimo.salvar_texto(caminho_saida)
+            resultado["saida"] = caminho_saida
+    except _TempoEsgotado:
+        resultado["status"] = STATUS_TEMPO_ESGOTADO
+        resultado["erro"] = f"Tempo limite de {tempo_limite} s excedido."
+    except MemoryError:
+        resultado["status"] = STATUS_MEMORIA_EXCEDIDA
+        resultado["erro"] = "Limite de memória excedido."
+    except Exception as erro:
+        resultado["status"] = STATUS_ERRO
+        resultado["erro"] = str(erro)
+    finally:
+        if alarme:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, tratador_anterior)
+        registro.removeHandler(coletor)
+
+    resultado["tempo_s"] = time.perf_counter() - inicio
+    return resultado
+
+def expandir_entradas(entradas, ignorar=None):
+    # Cada entrada é um arquivo, um diretório (percorrido recursivamente, só com
+    # as extensões de EXTENSOES_ENTRADA) ou um padrão glob. Arquivos repetidos e
+    # os que estão dentro de `ignorar` (o diretório de saída) ficam de fora.
+    arquivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            encontrados = []
+            for raiz, _, nomes in os.walk(entrada):
+                encontrados += [os.path.join(raiz, nome) for nome in nomes if nome.endswith(EXTENSOES_ENTRADA)]
+            arquivos += sorted(encontrados)
+        elif os.path.isfile(entrada):
+            arquivos.append(entrada)
+        else:
+            encontrados = sorted(caminho for caminho in glob.glob(entrada, recursive=True) if os.path.isfile(caminho))
+            if not encontrados:
+                raise ValueError(f"Nenhum arquivo corresponde a '{entrada}'.")
+            arquivos += encontrados
+
+    prefixo_ignorado = os.path.abspath(ignorar) + os.sep if ignorar else None
+    vistos = set()
+    unicos = []
+    for arquivo in arquivos:
+        absoluto = os.path.abspath(arquivo)
+        if absoluto in vistos or (prefixo_ignorado and absoluto.startswith(prefixo_ignorado)):
+            continue
+        vistos.add(absoluto)
+        unicos.append(arquivo)
+    return unicos
+
+def _caminho_saida(arquivo, base, diretorio_saida, formato):
+    # A saída espelha o caminho da entrada a partir do diretório comum a todas.
+    relativo, _ = os.path.splitext(os.path.relpath(os.path.abspath(arquivo), base))
+    return os.path.join(diretorio_saida, relativo + (".min.afdb" if formato == FORMATO_BINARIO else ".min.txt"))
+
+def _caminho_checkpoint(arquivo, base, diretorio_checkpoints):
+    relativo, _ = os.path.splitext(os.path.relpath(os.path.abspath(arquivo), base))
+    return os.path.join(diretorio_checkpoints, relativo + ".checkpoint.sqlite")
+
+def _opcoes_do_arquivo(opcoes_pipeline, arquivo, base, diretorio_checkpoints):
+    if diretorio_checkpoints is None:
+        return opcoes_pipeline
+    return dict(opcoes_pipeline, checkpoint_determinizacao=_caminho_checkpoint(arquivo, base, diretorio_checkpoints))
+
+def processar_em_lote(arquivos, diretorio_saida, trabalhadores=None, tempo_limite=None, limite_memoria=None, formato=FORMATO_TEXTO, diretorio_checkpoints=None, **opcoes_pipeline):
+    # Roda carregar_automato -> processar_automato_completo em cada arquivo num
+    # ProcessPoolExecutor e devolve o relatório: um resultado por arquivo, na ordem
+    # de `arquivos`, e um resumo. `limite_memoria` é em bytes, por trabalhador.
+    # Com `diretorio_checkpoints`, cada arquivo tem o seu checkpoint de
+    # determinização lá; quem estourou o tempo continua dele na próxima execução.
+    if formato not in FORMATOS_SAIDA:
+        raise ValueError(f"Formato de saída '{formato}' desconhecido. Opções: {FORMATOS_SAIDA}.")
+
+    base = os.path.commonpath([os.path.dirname(os.path.abspath(arquivo)) for arquivo in arquivos]) if arquivos else "."
+    resultados = [None] * len(arquivos)
+    inicio = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=trabalhadores, initializer=_iniciar_trabalhador, initargs=(limite_memoria,)) as executor:
+        futuros = {
+            executor.submit(
+                _processar_arquivo, arquivo, _caminho_saida(arquivo, base, diretorio_saida, formato),
+                formato, _opcoes_do_arquivo(opcoes_pipeline, arquivo, base, diretorio_checkpoints), tempo_limite
+            ): indice
+            for indice, arquivo in enumerate(arquivos)
+        }
+        for concluidos, futuro in enumerate(as_completed(futuros), start=1):
+            indice = futuros[futuro]
+            try:
+                resultado = futuro.result()
+            except Exception as erro:
+                # O trabalhador morreu (ex.: morto pelo sistema por falta de memória).
+                resultado = {
+                    "arquivo": arquivos[indice], "status": STATUS_ERRO, "saida": None,
+                    "erro": f"Processo trabalhador falhou: {erro!r}", "tempo_s": None,
+                }
+            resultados[indice] = resultado
+            registro.info(
+                "[%d/%d] %s: %s%s", concluidos, len(arquivos), resultado["arquivo"], resultado["status"],
+                f" ({resultado['erro']})" if resultado["erro"] else ""
+            )
+
+    por_status = {}
+    for resultado in resultados:
+        por_status[resultado["status"]] = por_status.get(resultado["status"], 0) + 1
+
+    resumo = {
+        "arquivos": len(arquivos),
+        "por_status": por_status,
+        "tempo_total_s": time.perf_counter() - inicio,
+        "trabalhadores": trabalhadores or os.cpu_count(),
+        "estados_entrada": sum(resultado.get("estados_entrada", 0) for resultado in resultados),
+        "estados_minimo": sum(resultado.get("estados_minimo", 0) for resultado in resultados),
+    }
+    return {"resumo": resumo, "resultados": resultados}
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Converte e minimiza autômatos finitos (AFNe -> AFN -> AFD -> AFD mínimo).")
+    parser.add_argument(
+        "entradas", nargs="*",
+        help="arquivos, diretórios ou padrões glob; sem nenhum, processa entrada.txt mostrando cada etapa"
+    )
+    parser.add_argument("--saida", default="saida", help="diretório dos AFDs mínimos e do relatório")
+    parser.add_argument("--relatorio", help="arquivo JSON do relatório (padrão: <saida>/relatorio.json)")
+    parser.add_argument("--formato", choices=FORMATOS_SAIDA, default=FORMATO_TEXTO)
+    parser.add_argument("--trabalhadores", type=int, help="processos em paralelo (padrão: número de CPUs)")
+    parser.add_argument("--tempo-limite", type=float, help="segundos por arquivo")
+    parser.add_argument("--memoria-limite", type=float, help="MiB de memória por processo trabalhador")
+    parser.add_argument("--motor", choices=MOTORES_MINIMIZACAO, default=MOTOR_HOPCROFT)
+    parser.add_argument("--modo", choices=MODOS_DETERMINIZACAO, default=MODO_BITSET)
+    parser.add_argument("--trabalhadores-determinizacao", type=int, help="processos do modo paralelo (padrão: número de CPUs)")
+    parser.add_argument("--estrategia", choices=ESTRATEGIAS, default=ESTRATEGIA_SUBCONJUNTOS)
+    parser.add_argument("--conversao-direta", action="store_true", help="AFNe direto para AFD, sem o AFN intermediário")
+    parser.add_argument("--limite-superestados", type=int, help="acima disso, simula o AFN em vez de determinizar")
+    parser.add_argument("--orcamento-superestados", type=int, help="superestados em memória; o excedente vai para disco (sqlite)")
+    parser.add_argument("--checkpoints", help="diretório dos checkpoints retomáveis da determinização")
+    parser.add_argument("--sem-compressao", action="store_true", help="não agrupa símbolos equivalentes")
+    parser.add_argument("--sem-poda", action="store_true", help="não remove estados inúteis do AFN")
+    parser.add_argument("--cache", help="diretório do cache de resultados")
+    opcoes = parser.parse_args(argumentos)
+
+    if opcoes.trabalhadores is not None and opcoes.trabalhadores < 1:
+        parser.error("--trabalhadores deve ser pelo menos 1.")
+    if opcoes.trabalhadores_determinizacao is not None and opcoes.trabalhadores_determinizacao < 1:
+        parser.error("--trabalhadores-determinizacao deve ser pelo menos 1.")
+    if opcoes.orcamento_superestados is not None and opcoes.orcamento_superestados < 1:
+        parser.error("--orcamento-superestados deve ser pelo menos 1.")
+    if opcoes.orcamento_superestados is not None or opcoes.checkpoints:
+        if opcoes.conversao_direta:
+            parser.error("--orcamento-superestados e --checkpoints não se aplicam a --conversao-direta.")
+        if opcoes.estrategia == ESTRATEGIA_BRZOZOWSKI:
+            parser.error("--orcamento-superestados e --checkpoints não se aplicam a --estrategia brzozowski.")
+
+    opcoes_pipeline = {
+        "motor_minimizacao": opcoes.motor,
+        "modo_determinizacao": opcoes.modo,
+        "conversao_direta": opcoes.conversao_direta,
+        "cache": CacheResultados(opcoes.cache) if opcoes.cache else None,
+        "estrategia": opcoes.estrategia,
+        "comprimir_alfabeto": not opcoes.sem_compressao,
+        "podar_estados": not opcoes.sem_poda,
+        "limite_superestados": opcoes.limite_superestados,
+        "trabalhadores_determinizacao": opcoes.trabalhadores_determinizacao,
+        "orcamento_superestados": opcoes.orcamento_superestados,
+    }
+
+    if not opcoes.entradas:
+        logging.basicConfig(level=logging.DEBUG, format="%(message)s", stream=sys.stdout)
+        try:
+            meu_automato = carregar_automato("entrada.txt")
+            if opcoes.checkpoints:
+                opcoes_pipeline["checkpoint_determinizacao"] = _caminho_checkpoint("entrada.txt", ".", opcoes.checkpoints)
+
+            if meu_automato:
+                afd_minimo_final = processar_automato_completo(meu_automato, **opcoes_pipeline)
+                registro.info("\n--- Estatísticas ---\n%s", afd_minimo_final.estatisticas)
+                return 0
+
+        except Exception as e:
+            registro.error("\n--- Ocorreu um erro geral: %s ---", e)
+        return 1
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    try:
+        arquivos = expandir_entradas(opcoes.entradas, ignorar=opcoes.saida)
+    except ValueError as erro:
+        parser.error(str(erro))
+
+    limite_memoria = int(opcoes.memoria_limite * 1024 * 1024) if opcoes.memoria_limite else None
+    relatorio = processar_em_lote(
+        arquivos, opcoes.saida, opcoes.trabalhadores, opcoes.tempo_limite, limite_memoria, opcoes.formato,
+        opcoes.checkpoints, **opcoes_pipeline
+    )
+
+    caminho_relatorio = opcoes.relatorio or os.path.join(opcoes.saida, "relatorio.json")
+    os.makedirs(os.path.dirname(caminho_relatorio) or ".", exist_ok=True)
+    with open(caminho_relatorio, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+
+    resumo = relatorio["resumo"]
+    registro.info(
+        "%d arquivos em %.2f s com %d trabalhadores: %s. Relatório em %s.",
+        resumo["arquivos"], resumo["tempo_total_s"], resumo["trabalhadores"],
+        ", ".join(f"{quantidade} {status}" for status, quantidade in sorted(resumo["por_status"].items())) or "nada a fazer",
+        caminho_relatorio
+    )
+    falhas = resumo["arquivos"] - resumo["por_status"].get(STATUS_OK, 0) - resumo["por_status"].get(STATUS_SIMULACAO, 0)
+    return 1 if falhas else 0
+
 
-except Exception as e:
-    print(f"\n--- Ocorreu um erro geral: {e} ---")
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())